@@ -1,20 +1,17 @@
 import streamlit as st
-from streamlit.runtime.scriptrunner import add_script_run_ctx
 import streamlit.components.v1 as components
 
 import json
 from pathlib import Path
 from datetime import datetime
-import asyncio
 import requests
 from PIL import Image
 from io import BytesIO
-import threading
 import queue
 import time
 
 from streamlit_webrtc import webrtc_streamer, WebRtcMode, RTCConfiguration
-from services.oci_speech_stt_realtime import start_realtime_session, OCIAudioProcessor
+from services.oci_speech_stt_realtime import create_realtime_worker, AudioChannel, OCIAudioProcessor
 
 import components as component
 import services.database as database
@@ -348,25 +345,27 @@ if login:
                             transcription_container = st.empty()
                             status_caption = st.empty()
 
-                            # Path del JSON
+                            # Path del journal (JSONL, append-only)
                             output_dir = Path(f"files/{username}/module-ai-speech-to-realtime")
                             output_dir.mkdir(parents=True, exist_ok=True)
-                            json_path = output_dir / "transcription.json"
+                            json_path = output_dir / "transcription.jsonl"
 
-                            # Cargar historial si no está en session state
+                            # Journal abierto durante la sesión (se reutiliza entre reruns)
+                            if "transcription_journal" not in st.session_state or st.session_state.transcription_journal.path != json_path:
+                                st.session_state.transcription_journal = utils.JournalService(json_path)
+                                st.session_state.pop("transcriptions_list", None)
+                            transcription_journal = st.session_state.transcription_journal
+
+                            # Cargar historial si no está en session state (migra el transcription.json anterior)
                             if "transcriptions_list" not in st.session_state:
-                                if json_path.exists() and json_path.stat().st_size > 0:
-                                    with open(json_path, "r", encoding="utf-8") as f:
-                                        st.session_state.transcriptions_list = json.load(f)
-                                else:
-                                    st.session_state.transcriptions_list = []
+                                st.session_state.transcriptions_list = transcription_journal.load(legacy_path=output_dir / "transcription.json")
                             
                             # Sincronizar variable local para compatibilidad
                             uploaded_transcription = st.session_state.transcriptions_list
 
                             # Inicializar colas
                             if "webrtc_audio_queue" not in st.session_state:
-                                st.session_state.webrtc_audio_queue = queue.Queue()
+                                st.session_state.webrtc_audio_queue = AudioChannel()
                             if "webrtc_result_queue" not in st.session_state:
                                 st.session_state.webrtc_result_queue = queue.Queue()
                             
@@ -374,21 +373,46 @@ if login:
                             if "webrtc_session_id" not in st.session_state:
                                 st.session_state.webrtc_session_id = 0
 
-                            # Función de renderizado
-                            def render_transcriptions(partial_text=None):
-                                transcription_html = ""
-                                for item in st.session_state.transcriptions_list:
-                                    transcription_html += f"""
-                                        <div style="background-color:#21232B; padding:10px; border-radius:5px; margin-bottom:10px;">
-                                            <div style="display:flex; justify-content:space-between;">
-                                                <div style="width:35px; background-color:#E6A538; color:black; border-radius:5px; margin:2px; display:flex; align-items:center; justify-content:center;">
-                                                    {item['id']}</div>
-                                                <div style="width:100%; margin:2px; padding:5px;">{item['transcription']}</div>
-                                            </div>
+                            # Funciones de renderizado (incremental)
+                            def get_transcription_html(item):
+                                return f"""
+                                    <div style="background-color:#21232B; padding:10px; border-radius:5px; margin-bottom:10px;">
+                                        <div style="display:flex; justify-content:space-between;">
+                                            <div style="width:35px; background-color:#E6A538; color:black; border-radius:5px; margin:2px; display:flex; align-items:center; justify-content:center;">
+                                                {item['id']}</div>
+                                            <div style="width:100%; margin:2px; padding:5px;">{item['transcription']}</div>
                                         </div>
-                                    """
+                                    </div>
+                                """
+
+                            def render_transcriptions():
+                                # Render completo: una sola vez por rerun, después solo se añaden elementos
+                                with transcription_container.container(border=True):
+                                    st.markdown(":speech_balloon: :red[Real-Time] ***Customer Voice Transcription***")
+                                    # column-reverse mantiene el scroll abajo mientras se añaden elementos (el primer hijo queda al final)
+                                    st.markdown("""
+                                        <style>
+                                            .st-key-transcription_scroll {
+                                                max-height: 250px;
+                                                overflow-y: auto;
+                                                flex-direction: column-reverse;
+                                            }
+                                        </style>
+                                    """, unsafe_allow_html=True)
+                                    with st.container(border=False, key="transcription_scroll"):
+                                        st.session_state.transcription_partial_area = st.empty()
+                                        st.session_state.transcription_items_area   = st.container()
+                                for item in st.session_state.transcriptions_list:
+                                    append_transcription(item)
+
+                            def append_transcription(item):
+                                # Solo envía el nuevo elemento al navegador
+                                st.session_state.transcription_items_area.markdown(get_transcription_html(item), unsafe_allow_html=True)
+
+                            def render_partial(partial_text=None):
+                                # Solo actualiza la línea parcial
                                 if partial_text:
-                                    transcription_html += f"""
+                                    st.session_state.transcription_partial_area.markdown(f"""
                                         <div style="background-color:#2A2A2A; padding:10px; border-radius:5px; margin-bottom:10px; opacity:0.6;">
                                             <div style="display:flex; justify-content:space-between;">
                                                 <div style="width:35px; background-color:#AAAAAA; color:black; border-radius:5px; margin:2px; display:flex; align-items:center; justify-content:center;">
@@ -396,18 +420,9 @@ if login:
                                                 <div style="width:100%; margin:2px; padding:5px;">{partial_text}</div>
                                             </div>
                                         </div>
-                                    """
-                                with transcription_container.container(border=True):
-                                    st.markdown(":speech_balloon: :red[Real-Time] ***Customer Voice Transcription***")
-                                    components.html(f"""
-                                        <div id="scrollable-transcription" style="height:250px; overflow-y:auto; background-color:#1e1e1e; padding:10px; border-radius:10px; color:white; font-family:monospace;">
-                                            {transcription_html}
-                                        </div>
-                                        <script>
-                                            var div = window.parent.document.querySelectorAll('iframe[srcdoc]')[window.parent.document.querySelectorAll('iframe[srcdoc]').length - 1].contentWindow.document.getElementById('scrollable-transcription');
-                                            if (div) div.scrollTop = div.scrollHeight;
-                                        </script>
-                                    """, height=270)
+                                    """, unsafe_allow_html=True)
+                                else:
+                                    st.session_state.transcription_partial_area.empty()
 
                             # Render inicial
                             render_transcriptions()
@@ -443,9 +458,11 @@ if login:
                                         st.session_state.oci_thread.join(timeout=2.0)
                                     del st.session_state.oci_thread
                                 
+                                # Persistir lo pendiente del journal
+                                transcription_journal.sync()
+
                                 # Limpiar colas
-                                while not st.session_state.webrtc_audio_queue.empty():
-                                    st.session_state.webrtc_audio_queue.get()
+                                st.session_state.webrtc_audio_queue.clear()
                                 while not st.session_state.webrtc_result_queue.empty():
                                     st.session_state.webrtc_result_queue.get()
                                 
@@ -471,57 +488,12 @@ if login:
                                     # Pasamos el valor DIRECTO del selector (ej: "Spanish"), no el mapeado
                                     selected_lang_raw = selected_language_file 
 
-                                    def oci_worker(audio_q, result_q, lang_raw):
-                                        loop = asyncio.new_event_loop()
-                                        asyncio.set_event_loop(loop)
-                                        async_input_queue = asyncio.Queue()
-
-                                        def on_final(text):
-                                            result_q.put(("final", text))
-                                        
-                                        def on_partial(text):
-                                            result_q.put(("partial", text))
-
-                                        async def bridge_audio():
-                                            while True:
-                                                if not audio_q.empty():
-                                                    data = audio_q.get()
-                                                    await async_input_queue.put(data)
-                                                    if data is None:
-                                                        break
-                                                else:
-                                                    await asyncio.sleep(0.01)
-
-                                        bridge_task = loop.create_task(bridge_audio())
-                                        try:
-                                            # Pasamos el idioma crudo ("Spanish") al servicio
-                                            loop.run_until_complete(
-                                                start_realtime_session(on_final, on_partial, lang_raw, async_input_queue)
-                                            )
-                                        except Exception as e:
-                                            print(f"OCI Worker Error: {e}")
-                                            result_q.put(("error", str(e)))
-                                        finally:
-                                            # Esperar a que el puente termine limpiamente si es posible
-                                            if not bridge_task.done():
-                                                bridge_task.cancel()
-                                            # Ejecutar tareas pendientes de limpieza
-                                            try:
-                                                pending = asyncio.all_tasks(loop)
-                                                loop.run_until_complete(asyncio.gather(*pending))
-                                            except:
-                                                pass
-                                            loop.close()
-
-                                    # Pasamos las referencias explícitamente al hilo
-                                    t = threading.Thread(target=oci_worker, args=(audio_queue_ref, result_queue_ref, selected_lang_raw), daemon=True)
-                                    add_script_run_ctx(t)
-                                    t.start()
-                                    st.session_state.oci_thread = t
+                                    # Pasamos el idioma crudo ("Spanish") al servicio
+                                    st.session_state.oci_thread = create_realtime_worker(audio_queue_ref, result_queue_ref, selected_lang_raw)
 
                                 partial_text = ""
                                 while ctx.state.playing:
-                                    updated = False
+                                    partial_updated = False
                                     # ... resto del loop ...
                                     while not st.session_state.webrtc_result_queue.empty():
                                         msg_type, content = st.session_state.webrtc_result_queue.get()
@@ -535,21 +507,22 @@ if login:
                                             st.session_state.transcriptions_list.append(new_record)
                                             uploaded_transcription = st.session_state.transcriptions_list
                                             
-                                            with open(json_path, "w", encoding="utf-8") as f:
-                                                json.dump(st.session_state.transcriptions_list, f, ensure_ascii=False)
+                                            # Append O(1) al journal y al renderizado
+                                            transcription_journal.append(new_record)
+                                            append_transcription(new_record)
                                             
                                             partial_text = ""
-                                            updated = True
+                                            partial_updated = True
                                             
                                         elif msg_type == "partial":
                                             partial_text = content
-                                            updated = True
+                                            partial_updated = True
                                             
                                         elif msg_type == "error":
                                             st.error(f"Error: {content}")
 
-                                    if updated:
-                                        render_transcriptions(partial_text)
+                                    if partial_updated:
+                                        render_partial(partial_text)
                                     
                                     time.sleep(0.1)
 
@@ -565,10 +538,9 @@ if login:
                                 files_to_process = [uploaded_record] if uploaded_record else []  
                                             
                         elif selected_module_id == 6:
-                            # Leer archivo JSON como entrada
-                            if json_path.exists() and json_path.stat().st_size > 0:
-                                with open(json_path, "r", encoding="utf-8") as f:
-                                    files_to_process = [json.load(f)]
+                            # Transcripciones del journal como entrada
+                            if st.session_state.transcriptions_list:
+                                files_to_process = [list(st.session_state.transcriptions_list)]
 
                         else:
                             files_to_process = uploaded_files if uploaded_files else []
@@ -679,6 +651,92 @@ if login:
                                 component.get_processing(True)
                                 utl_function_service.track_time(1)
 
+                                def complete_file(
+                                        file_id,
+                                        file_name,
+                                        file_src_file_name,
+                                        file_src_size,
+                                        file_trg_obj_name,
+                                        file_trg_tot_pages,
+                                        file_trg_tot_characters,
+                                        bucket_file_name,
+                                        msg_module,
+                                        data,
+                                        file_trg_tot_time=None
+                                    ):
+                                    """Updates the file totals, applies PII when enabled and refreshes the file caches."""
+                                    file_trg_language = language_map[selected_language_file]
+
+                                    # Update Extraction (per-file time when known, otherwise time since Save)
+                                    file_trg_tot_time = file_trg_tot_time or utl_function_service.track_time(0)
+                                    db_file_service.update_file(
+                                        file_id,
+                                        file_trg_obj_name,
+                                        file_trg_tot_pages,
+                                        file_trg_tot_characters,
+                                        file_trg_tot_time,
+                                        file_trg_language
+                                    )
+
+                                    # PII
+                                    if selected_pii:
+                                        # Set Variables
+                                        file_trg_obj_name   = f"{file_src_file_name.rsplit('.', 1)[0]}_trg_pii.{trg_type.lower()}"
+                                        file_trg_pii        = (1 if selected_pii else 0)
+
+                                        # Insert File
+                                        msg, file_id, _ = db_file_service.insert_file(
+                                            file_name,
+                                            user_id,
+                                            module_id,
+                                            file_src_file_name,
+                                            file_src_size,
+                                            file_src_strategy,
+                                            file_trg_obj_name,
+                                            file_trg_language,
+                                            file_trg_pii,
+                                            file_description
+                                        )
+                                        component.get_toast(msg, icon=":material/database:")
+
+                                        object_name = bucket_file_name
+                                        msg_module, data = anomaly_engine_service.create(
+                                            object_name,
+                                            language,
+                                            file_id,
+                                            data,
+                                            trg_type
+                                        )
+                                        file_trg_obj_name       = file_trg_obj_name
+                                        file_trg_tot_pages      = 1
+                                        file_trg_tot_characters = len(str(data))
+                                        file_trg_tot_time       = utl_function_service.track_time(0)
+                                        file_trg_language       = language_map[selected_language_file]
+
+                                        # Update Extraction
+                                        file_trg_tot_time = utl_function_service.track_time(0)
+                                        db_file_service.update_file(
+                                            file_id,
+                                            file_trg_obj_name,
+                                            file_trg_tot_pages,
+                                            file_trg_tot_characters,
+                                            file_trg_tot_time,
+                                            file_trg_language
+                                        )
+
+                                    db_module_service.get_modules_files_cache(user_id, force_update=True)
+                                    db_file_service.get_all_files.clear()
+                                    db_file_service.get_all_files(user_id)
+
+                                    if msg_module:
+                                        component.get_success(msg_module)
+
+                                # Module: [3] Documents submitted in the loop and awaited after it
+                                document_jobs = []
+
+                                # Module: [4] Audio files collected in the loop and transcribed after it
+                                speech_jobs = []
+
                                 # ← CAMBIO: iteramos sobre cada archivo/grabación
                                 for uploaded_file in files_to_process:
 
@@ -702,7 +760,7 @@ if login:
                                     if upload_file:
                                         # Set Variables
                                         file_src_file_name = utl_function_service.get_valid_url_path(file_name=bucket_file_name)
-                                        file_src_size      = (json_path.stat().st_size if selected_module_id == 6 and json_path.exists()
+                                        file_src_size      = (len(bucket_file_content) if selected_module_id == 6
                                                             else uploaded_file.size if uploaded_file and hasattr(uploaded_file, "size")
                                                             else uploaded_record.size if uploaded_record else 0)
                                         file_trg_obj_name  = (utl_function_service.get_valid_table_name(schema=f"SEL_AI_USER_ID_{user_id}", file_name=file_name)
@@ -712,7 +770,7 @@ if login:
                                         file_trg_pii      = 0
                                         file_description  = file_description
                                         # Insert File
-                                        msg, file_id = db_file_service.insert_file(
+                                        msg, file_id, _ = db_file_service.insert_file(
                                             file_name,
                                             user_id,
                                             module_id,
@@ -728,6 +786,7 @@ if login:
                                         
                                         # Modules
                                         msg_module = None  # Inicializar msg_module por defecto
+                                        data       = None
                                         match module_id:
                                             case 1:
                                                 #msg = db_file_service.update_extraction(file_id, str(bucket_file_content))
@@ -738,7 +797,8 @@ if login:
                                                     file_src_file_name, 
                                                     file_trg_obj_name,
                                                     comment_data_editor,
-                                                    file_description
+                                                    file_description,
+                                                    bucket_file_content
                                                 )
                                                 file_trg_obj_name       = file_trg_obj_name
                                                 file_trg_tot_pages      = 1
@@ -760,31 +820,41 @@ if login:
                                                 file_trg_language       = language_map[selected_language_file]
                                             case 3:
                                                 object_name = bucket_file_name
-                                                msg_module, data = document_undestanding_service.create(
-                                                    object_name,
-                                                    prefix,
-                                                    language,
-                                                    file_id
-                                                )
-                                                file_trg_obj_name       = file_trg_obj_name
-                                                file_trg_tot_pages      = data[-1].get('page_number', 0) if data else 0
-                                                file_trg_tot_characters = sum(page.get('characters', 0) for page in data) if data else 0
-                                                file_trg_tot_time       = utl_function_service.track_time(0)
-                                                file_trg_language       = language_map[selected_language_file]
+                                                # Submitted now, awaited after the loop so the documents are processed concurrently
+                                                try:
+                                                    document_future = document_undestanding_service.create_job(
+                                                        object_name,
+                                                        prefix,
+                                                        language,
+                                                        file_id
+                                                    )
+                                                except Exception as e:
+                                                    component.get_error(f"[Error] Creating Document Understanding:\n{e}")
+                                                    continue
+                                                document_jobs.append({
+                                                    "future"             : document_future,
+                                                    "file_id"            : file_id,
+                                                    "file_name"          : file_name,
+                                                    "file_src_file_name" : file_src_file_name,
+                                                    "file_src_size"      : file_src_size,
+                                                    "file_trg_obj_name"  : file_trg_obj_name,
+                                                    "bucket_file_name"   : bucket_file_name
+                                                })
+                                                continue
                                             case 4:
                                                 object_name = bucket_file_name
-                                                msg_module, data = speech_service.create_job(
-                                                    object_name,
-                                                    prefix,
-                                                    language,
-                                                    file_id,
-                                                    trg_type
-                                                )
-                                                file_trg_obj_name       = file_trg_obj_name
-                                                file_trg_tot_pages      = 1
-                                                file_trg_tot_characters = len(str(data))
-                                                file_trg_tot_time       = utl_function_service.track_time(0)
-                                                file_trg_language       = language_map[selected_language_file]
+                                                # Submitted after the loop as batch transcription jobs for the whole upload
+                                                speech_jobs.append({
+                                                    "object_name"        : object_name,
+                                                    "size"               : file_src_size,
+                                                    "file_id"            : file_id,
+                                                    "file_name"          : file_name,
+                                                    "file_src_file_name" : file_src_file_name,
+                                                    "file_src_size"      : file_src_size,
+                                                    "file_trg_obj_name"  : file_trg_obj_name,
+                                                    "bucket_file_name"   : bucket_file_name
+                                                })
+                                                continue
                                             case 5:
                                                 object_name = bucket_file_name
                                                 strategy    = "Single"
@@ -821,8 +891,7 @@ if login:
                                                 # Real-Time Transcription
                                                 service.stop_realtime_session()
                                                 uploaded_transcription.clear()
-                                                with open(json_path, "w", encoding="utf-8") as f:
-                                                    json.dump([], f)
+                                                transcription_journal.clear()
                                                 render_transcriptions()
                                                 status_caption.caption("")
                                             case 7:
@@ -882,69 +951,66 @@ if login:
                                             case _:
                                                 msg_module = f"Module {module_id} not implemented or invalid."
 
-                                        # Update Extraction
-                                        file_trg_tot_time = utl_function_service.track_time(0)
-                                        db_file_service.update_file(
+                                        complete_file(
                                             file_id,
+                                            file_name,
+                                            file_src_file_name,
+                                            file_src_size,
                                             file_trg_obj_name,
                                             file_trg_tot_pages,
                                             file_trg_tot_characters,
-                                            file_trg_tot_time,
-                                            file_trg_language
+                                            bucket_file_name,
+                                            msg_module,
+                                            data
                                         )
 
-                                        # PII
-                                        if selected_pii:
-                                            # Set Variables
-                                            file_trg_obj_name   = f"{file_src_file_name.rsplit('.', 1)[0]}_trg_pii.{trg_type.lower()}"
-                                            file_trg_pii        = (1 if selected_pii else 0)
-
-                                            # Insert File
-                                            msg, file_id = db_file_service.insert_file(
-                                                file_name,
-                                                user_id,
-                                                module_id,
-                                                file_src_file_name,
-                                                file_src_size,
-                                                file_src_strategy,
-                                                file_trg_obj_name,
-                                                file_trg_language,
-                                                file_trg_pii,
-                                                file_description
-                                            )
-                                            component.get_toast(msg, icon=":material/database:")
-
-                                            object_name = bucket_file_name
-                                            msg_module, data = anomaly_engine_service.create(
-                                                object_name,
-                                                language,
-                                                file_id,
-                                                data,
-                                                trg_type
-                                            )
-                                            file_trg_obj_name       = file_trg_obj_name
-                                            file_trg_tot_pages      = 1
-                                            file_trg_tot_characters = len(str(data))
-                                            file_trg_tot_time       = utl_function_service.track_time(0)
-                                            file_trg_language       = language_map[selected_language_file]
-
-                                            # Update Extraction
-                                            file_trg_tot_time = utl_function_service.track_time(0)
-                                            db_file_service.update_file(
-                                                file_id,
-                                                file_trg_obj_name,
-                                                file_trg_tot_pages,
-                                                file_trg_tot_characters,
-                                                file_trg_tot_time,
-                                                file_trg_language
-                                            )
-
-                                        db_module_service.get_modules_files_cache(user_id, force_update=True)
-                                        db_file_service.get_all_files.clear()
-                                        db_file_service.get_all_files(user_id)
+                                # Module: [4] Transcribe all files of the upload in batch jobs and fan the results back
+                                # (a batch that cannot be submitted fails only the futures of its own files)
+                                speech_futures = speech_service.submit_batch_job(
+                                    speech_jobs,
+                                    f"{username}/{selected_module_folder}",
+                                    language,
+                                    trg_type
+                                ) if speech_jobs else []
+
+                                # Module: [3] Wait for the documents submitted in the loop
+                                for document_job in document_jobs:
+                                    result = document_undestanding_service.get_job_result(document_job["future"])
+                                    if not result:
+                                        continue
+                                    msg_module, data, file_trg_tot_time = result
+                                    complete_file(
+                                        document_job["file_id"],
+                                        document_job["file_name"],
+                                        document_job["file_src_file_name"],
+                                        document_job["file_src_size"],
+                                        document_job["file_trg_obj_name"],
+                                        data[-1].get('page_number', 0) if data else 0,
+                                        sum(page.get('characters', 0) for page in data) if data else 0,
+                                        document_job["bucket_file_name"],
+                                        msg_module,
+                                        data,
+                                        file_trg_tot_time
+                                    )
 
-                                        if msg_module:
-                                            component.get_success(msg_module)
+                                for speech_job, speech_future in zip(speech_jobs, speech_futures):
+                                    result = speech_service.get_job_result(speech_future)
+                                    if not result:
+                                        continue
+                                    msg_module, data, file_trg_tot_time = result
+                                    complete_file(
+                                        speech_job["file_id"],
+                                        speech_job["file_name"],
+                                        speech_job["file_src_file_name"],
+                                        speech_job["file_src_size"],
+                                        speech_job["file_trg_obj_name"],
+                                        1,
+                                        len(str(data)),
+                                        speech_job["bucket_file_name"],
+                                        msg_module,
+                                        data,
+                                        file_trg_tot_time
+                                    )
 
                                 st.session_state["show_form_app"] = False
                                 st.rerun()
@@ -963,10 +1029,7 @@ if login:
                         if selected_module_id == 6:
                             if btn_col3.button("Clear", type="secondary", width="stretch", key="clear_transcriptions_btn"):
                                 st.session_state.transcriptions_list = []
-                                json_path_clear = Path(f"files/{username}/module-ai-speech-to-realtime") / "transcription.json"
-                                if json_path_clear.exists():
-                                    with open(json_path_clear, "w", encoding="utf-8") as f:
-                                        json.dump([], f)
+                                transcription_journal.clear()
                                 st.rerun()
                         else:
                             # Placeholder vacío para mantener el layout cuando no es módulo 6
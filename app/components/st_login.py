@@ -133,6 +133,7 @@ def get_menu(modules, user):
                 with col1:
                     if st.button(key="clear", help="Clear Chat", label="", icon=":material/delete:", disabled=(not st.session_state["chat-select-ai"]), width="stretch"):
                         st.session_state["chat-select-ai"] = []
+                        st.session_state["select-ai-sql"] = {}
                         st.rerun()
 
                 with col2:
@@ -279,7 +280,7 @@ def get_menu(modules, user):
                             format_func=lambda fid: f"{df_quiz_files.loc[df_quiz_files['FILE_ID'] == fid, 'FILE_DESCRIPTION'].values[0]}",
                             key="quiz_selected_file_id"
                         )
-                        df_all_questions_sidebar = db_quiz_service.get_quiz_questions(selected_file_id)
+                        df_all_questions_sidebar = db_quiz_service.get_quiz_questions_cache(selected_file_id, [])
                         st.caption(f"Total available questions: **{len(df_all_questions_sidebar)}**")
                     
                     # Quiz in progress - show info and Leave button
@@ -32,7 +32,9 @@ if login:
     user_id = st.session_state["user_id"]
     chat_save = st.session_state["chat-select-ai"]
     profile_name = select_ai_service.get_profile(user_id)
+    start_time = time.perf_counter()
     df_tables = db_select_ai_service.get_tables_cache(user_id)
+    print(f"[Select AI] Tables metadata: {len(df_tables)} column(s) in {(time.perf_counter() - start_time) * 1000:.0f} ms")
     
     # Header and description for the application
     st.header(":material/database_search: Select AI")
@@ -87,19 +89,39 @@ if login:
             assistant_message = st.chat_message("ai", avatar="images/llm_meta.svg")
             placeholder = assistant_message.empty()
 
+            # Check if a Select AI response is an error message
+            error_indicators = ["Sorry,", "Lo siento,", "Desculpe,", "Error al generar", "Error while generating", "Erro ao gerar"]
+            get_is_error = lambda text: any(text.startswith(indicator) for indicator in error_indicators)
+
+            # SQL generated per prompt, reused by the follow-up actions of this session
+            # while the profile's cache version (recreated profile, reloaded table) does not change
+            sql_cache = st.session_state.setdefault("select-ai-sql", {})
+            def get_sql(prompt):
+                key = (db_select_ai_service.get_cache_version(profile_name), " ".join(prompt.split()).casefold())
+                if key not in sql_cache:
+                    sql = db_select_ai_service.get_chat(prompt, profile_name, 'showsql', language)
+                    if get_is_error(sql):
+                        return sql
+                    sql_cache[key] = sql
+                return sql_cache[key]
+
             # Build response with consistent formatting
             with placeholder.container():
                 # Step 1: Get Select AI response based on selected action
                 with st.spinner("Wait for Select AI...", show_time=True):
                     start_time = time.time()
                     action = st.session_state.get("select_ai_action", "narrate")
-                    response = db_select_ai_service.get_chat(prompt, profile_name, action, language)
+                    sql_query = None
+                    if st.session_state.get("analytics_agent", False) and action != "chat":
+                        # Combined mode: the SQL is generated once, executed locally and the action is answered from it
+                        sql_query = get_sql(prompt)
+                        response, df = db_select_ai_service.get_chat_from_sql(prompt, sql_query, profile_name, action, language)
+                    else:
+                        response = db_select_ai_service.get_chat(prompt, profile_name, action, language)
                     response_time = f"{(time.time() - start_time) * 1000:.2f} ms"
                     annotated_text(annotation("Select AI", response_time, background="#484c54", color="#ffffff"))
                 
-                # Check if response is an error message
-                error_indicators = ["Sorry,", "Lo siento,", "Desculpe,", "Error al generar", "Error while generating", "Erro ao gerar"]
-                is_error = any(response.startswith(indicator) for indicator in error_indicators)
+                is_error = get_is_error(response)
                 
                 # Process valid response (not an error)
                 if not is_error:
@@ -113,17 +135,16 @@ if login:
                     # Step 2: Analytics Agent (if enabled)
                     if st.session_state.get("analytics_agent", False):
                         with st.spinner("Wait for Analytics Agent...", show_time=True):
-                            time.sleep(2)
                             start_time = time.time()
                             
-                            # Get SQL query from Select AI (only if not already showsql action)
-                            if action != "showsql":
-                                sql_query = db_select_ai_service.get_chat(prompt, profile_name, 'showsql', language)
-                            else:
-                                sql_query = response
-                            
-                            # Execute SQL query and get DataFrame
-                            df = db_select_ai_service.get_data(sql_query)
+                            # SQL and DataFrame from the combined mode (the 'chat' action generates them here)
+                            if sql_query is None:
+                                sql_query = get_sql(prompt)
+                                try:
+                                    df = db_select_ai_service.get_data(sql_query)
+                                except Exception as e:
+                                    component.get_error(f"{db_select_ai_service.get_messages(language)[1]}{e}")
+                                    df = pd.DataFrame()
                             analytics_df = df
                             selected_agent_id = int(st.session_state.get("selected_agent_id"))
                             time.sleep(2)
@@ -132,8 +153,16 @@ if login:
                             df_metadata = {
                                 "columns": list(df.columns),
                                 "shape": {"rows": df.shape[0], "cols": df.shape[1]},
-                                "dtypes": {col: str(df[col].dtype) for col in df.columns}
+                                "dtypes": {col: str(df[col].dtype) for col in df.columns},
+                                "truncated": df.attrs.get("truncated", False),
+                                "elapsed_ms": df.attrs.get("elapsed_ms", 0)
                             }
+                            # All rows when small, otherwise a vectorized profile within the token budget
+                            prompt_data, prompt_data_mode = utils.DataProfileService.get_prompt_data(df)
+                            truncation_note = (
+                                f"The result was truncated to the first {df.attrs.get('row_limit')} rows; do not present totals computed from it as complete."
+                                if df_metadata["truncated"] else "The result is complete."
+                            )
                             
                             enriched_prompt = dedent(f"""
                                 SQL Query:
@@ -143,9 +172,10 @@ if login:
                                 - Columns: {df_metadata['columns']}
                                 - Shape: {df_metadata['shape']['rows']} rows x {df_metadata['shape']['cols']} columns
                                 - Data types: {df_metadata['dtypes']}
+                                - Query time: {df_metadata['elapsed_ms']:.0f} ms. {truncation_note}
 
-                                Sample data (first 3 rows):
-                                {df.head(3).to_string()}
+                                Data ({prompt_data_mode}):
+                                {prompt_data}
 
                                 Generate Python code using Streamlit to visualize this data. Use ONLY the column names that 
                                 exist in the DataFrame. If the result is a single aggregated value, use st.metric() instead of charts.
@@ -7,6 +7,7 @@ from streamlit_float import *
 
 import components as component
 import services.database as database
+from services.database.select_ai_rag import CHUNKS_PAGE_SIZE
 import services as service
 import utils as utils
 
@@ -31,7 +32,11 @@ if login:
     user_id      = st.session_state["user_id"]
     profile_name = select_ai_rag_service.get_profile(user_id)
     index_name   = select_ai_rag_service.get_index_name(user_id)
-    df_files     = db_select_ai_rag_service.get_files(index_name)
+    try:
+        df_files = db_select_ai_rag_service.get_files_cache(index_name, profile_name)
+    except Exception as e:
+        component.get_error(f"[Error] Getting the files of {index_name}:\n{e}")
+        df_files = None
 
     # Header and description for the application
     st.header(":material/plagiarism: Select AI RAG")
@@ -40,20 +45,28 @@ if login:
     
     if df_files is not None and not df_files.empty:
         with st.expander("See Files"):
-            # Configurar los parámetros
-            group_by_columns = ["FILE_NAME"]
-            fields = {
-                "Start Offset"  : "START_OFFSET",
-                "End Offset"    : "END_OFFSET",
-                "Content"       : "CONTENT",
-                "Location"      : "LOCATION_URI",
-                "Last Modified" : "LAST_MODIFIED",
-                "Content"       : "CONTENT"
-            }
-            json_tables = utl_function_service.get_tables_json(df_files, group_by_columns, fields)
-                        
-            st.markdown("**Json Data**")
-            st.json(json_tables, expanded=1)
+            # One row per file, aggregated in the database
+            st.dataframe(
+                df_files,
+                hide_index=True,
+                column_config={
+                    "FILE_NAME"      : "File",
+                    "LOCATION_URI"   : "Location",
+                    "OBJECT_SIZE"    : st.column_config.NumberColumn("Size (bytes)"),
+                    "LAST_MODIFIED"  : "Last Modified",
+                    "CHUNKS"         : st.column_config.NumberColumn("Chunks"),
+                    "CONTENT_LENGTH" : st.column_config.NumberColumn("Content (chars)")
+                }
+            )
+
+            # Chunks are only fetched for the selected file, one page at a time
+            file_name = st.selectbox("Preview chunks", df_files["FILE_NAME"], index=None, placeholder="Select a file")
+            if file_name:
+                chunks = int(df_files.loc[df_files["FILE_NAME"] == file_name, "CHUNKS"].iloc[0])
+                pages  = max(1, -(-chunks // CHUNKS_PAGE_SIZE))
+                page   = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, step=1)
+                df_chunks = db_select_ai_rag_service.get_file_chunks(index_name, file_name, page)
+                st.dataframe(df_chunks, hide_index=True)
 
         # Display chat messages from history on app rerun
         for message in st.session_state["chat-select-ai-rag"]:
@@ -1,11 +1,12 @@
 import time
 import json
-import random
+import numpy as np
 import pandas as pd
 import altair as alt
 from datetime import datetime
 import streamlit as st
 
+import utils as utils
 import components as component
 import services.database as database
 
@@ -58,7 +59,7 @@ if login:
                     st.stop()
                 
                 # Get available questions and modules
-                df_all_questions = db_quiz_service.get_quiz_questions(selected_file_id)
+                df_all_questions = db_quiz_service.get_quiz_questions_cache(selected_file_id, [])
                 df_modules = db_quiz_service.get_quiz_modules(selected_file_id)
                 total_available = len(df_all_questions)
                 
@@ -148,59 +149,14 @@ if login:
                             else:
                                 component.get_processing(True)
                                 
-                                # Get questions and modules
-                                df_modules = db_quiz_service.get_quiz_modules(selected_file_id)
-                                
-                                # Select questions by module distribution
-                                selected_questions = []
-                                for _, module in df_modules.iterrows():
-                                    module_id = module["MODULE_ID"]
-                                    percentage = module["MODULE_PERCENTAGE"]
-                                    num_for_module = max(1, int(num_questions * percentage / 100))
-                                    module_questions = df_all_questions[df_all_questions["MODULE_ID"] == module_id]
-                                    if len(module_questions) >= num_for_module:
-                                        selected = module_questions.sample(n=num_for_module).to_dict("records")
-                                    else:
-                                        selected = module_questions.to_dict("records")
-                                    selected_questions.extend(selected)
-                                
-                                # Adjust to exact number of questions
-                                if len(selected_questions) > num_questions:
-                                    selected_questions = random.sample(selected_questions, num_questions)
-                                elif len(selected_questions) < num_questions:
-                                    remaining = num_questions - len(selected_questions)
-                                    all_ids = {q["QUIZ_ID"] for q in selected_questions}
-                                    available = df_all_questions[~df_all_questions["QUIZ_ID"].isin(all_ids)]
-                                    if len(available) >= remaining:
-                                        extra = available.sample(n=remaining).to_dict("records")
-                                        selected_questions.extend(extra)
-                                
-                                # Shuffle questions
-                                random.shuffle(selected_questions)
-                                
-                                # Shuffle options synchronized across all languages
-                                for question in selected_questions:
-                                    # Parse all language options first
-                                    all_lang_options = {}
-                                    for lang in selected_langs:
-                                        lang_upper = lang.upper()
-                                        options_data = question[f"OPTIONS_{lang_upper}"]
-                                        if isinstance(options_data, str):
-                                            options = json.loads(options_data)
-                                        else:
-                                            options = options_data
-                                        all_lang_options[lang_upper] = options
-                                    
-                                    # Generate a single shuffle order based on first language
-                                    first_lang = selected_langs[0].upper()
-                                    num_options = len(all_lang_options[first_lang])
-                                    shuffle_indices = list(range(num_options))
-                                    random.shuffle(shuffle_indices)
-                                    
-                                    # Apply the same shuffle order to all languages
-                                    for lang_upper, options in all_lang_options.items():
-                                        shuffled_options = [options[i] for i in shuffle_indices]
-                                        question[f"OPTIONS_{lang_upper}"] = shuffled_options
+                                # Stratified draw by module percentage, options shuffled in the same order in every language
+                                quiz_seed = int(np.random.SeedSequence().entropy % 2**63)
+                                selected_questions = utils.QuizSamplerService.sample(
+                                    db_quiz_service.get_quiz_questions_cache(selected_file_id, selected_langs),
+                                    num_questions,
+                                    selected_langs,
+                                    seed=quiz_seed
+                                )
                                 
                                 # Start quiz
                                 st.session_state["quiz_started"] = True
@@ -210,6 +166,7 @@ if login:
                                 st.session_state["quiz_start_time"] = time.time()
                                 st.session_state["quiz_evaluation_name"] = evaluation_name
                                 st.session_state["quiz_file_id"] = selected_file_id
+                                st.session_state["quiz_seed"] = quiz_seed
                                 st.session_state["quiz_languages"] = selected_langs
                                 st.session_state["quiz_finished"] = False
                                 
@@ -327,14 +284,18 @@ if login:
                                         component.get_processing(True)
                                         evaluation_name = st.session_state["quiz_evaluation_name"]
                                         
-                                        for answer_data in st.session_state["quiz_answers"].values():
-                                            db_quiz_service.insert_quiz_answer(
-                                                quiz_id=answer_data["quiz_id"],
-                                                user_id=user_id,
-                                                evaluation_name=evaluation_name,
-                                                selected_option=answer_data["selected_option"],
-                                                is_correct=answer_data["is_correct"]
-                                            )
+                                        # One round trip for the whole evaluation
+                                        db_quiz_service.upsert_quiz_answers([
+                                            {
+                                                "quiz_id": int(answer_data["quiz_id"]),
+                                                "user_id": int(user_id),
+                                                "evaluation_name": evaluation_name,
+                                                "selected_option": int(answer_data["selected_option"]),
+                                                "is_correct": int(answer_data["is_correct"]),
+                                                "answer_time_seconds": 0
+                                            }
+                                            for answer_data in st.session_state["quiz_answers"].values()
+                                        ])
                                         
                                         st.session_state["quiz_finished"] = True
                                         component.get_processing(False)
@@ -1,10 +1,7 @@
 import streamlit as st
 import streamlit.components.v1 as st_components
-from streamlit.runtime.scriptrunner import add_script_run_ctx
 from streamlit_webrtc import webrtc_streamer, WebRtcMode, RTCConfiguration
 
-import asyncio
-import threading
 import queue
 import time
 import json
@@ -15,8 +12,8 @@ from datetime import datetime
 import components as component
 import services.database as database
 import services as service
-from services.oci_speech_stt_realtime import start_realtime_session, OCIAudioProcessor
-from services.oci_speech_tts_realtime import text_to_speech
+from services.oci_speech_stt_realtime import create_realtime_worker, AudioChannel, OCIAudioProcessor
+from services.oci_speech_tts_realtime import text_to_speech_pipeline, text_to_speech_stream, tts_cache
 
 # Language mapping
 LANGUAGE_MAP = {
@@ -46,7 +43,7 @@ def initialize_session_state():
     """Initialize all session state variables for voice chat"""
     defaults = {
         "speech_conversation": [],
-        "speech_audio_queue": queue.Queue(),
+        "speech_audio_queue": AudioChannel(),
         "speech_result_queue": queue.Queue(),
         "speech_session_id": 0,
         "speech_llm_queue": queue.Queue(),
@@ -56,7 +53,8 @@ def initialize_session_state():
         "speech_autoplay_id": None,  # ID of the message that should autoplay
         "speech_playing_audio_id": None,  # ID of audio currently playing
         "speech_playing_audio_time": 0.0,  # Current playback time
-        "speech_prompt_extra": ""  # Additional instructions for Select AI
+        "speech_prompt_extra": "",  # Additional instructions for Select AI
+        "speech_metrics": {}  # Per-stage latency of the voice pipeline (ms)
     }
     for key, value in defaults.items():
         if key not in st.session_state:
@@ -98,25 +96,22 @@ def render_conversation(container, partial_text=None):
             should_autoplay = (msg_id == st.session_state.speech_autoplay_id)
             
             audio_button = ""
-            if item.get('audio'):
-                audio_id = f"audio_{idx}"
+            # Audio arrives as one segment per sentence group; older messages carry a single clip
+            segments = item.get('audio_segments') or ([item['audio']] if item.get('audio') else [])
+            if segments:
+                audio_ids = [f"audio_{idx}_{k}" for k in range(len(segments))]
                 button_id = f"btn_{idx}"
+                segment_key = f"speech_segment_{idx}_{msg_id}"
+                audio_tags = "".join(
+                    f"""<audio id="{audio_id}" style="display:none;">
+                        <source src="data:audio/mp3;base64,{segment}" type="audio/mp3">
+                    </audio>"""
+                    for audio_id, segment in zip(audio_ids, segments)
+                )
                 
                 audio_button = f"""
-                    <audio id="{audio_id}" {'autoplay' if should_autoplay else ''} style="display:none;">
-                        <source src="data:audio/mp3;base64,{item['audio']}" type="audio/mp3">
-                    </audio>
-                    <span id="{button_id}" onclick="
-                        var audio = document.getElementById('{audio_id}');
-                        var btn = document.getElementById('{button_id}');
-                        if (audio.paused) {{
-                            audio.play();
-                            btn.textContent = 'pause';
-                        }} else {{
-                            audio.pause();
-                            btn.textContent = 'play_arrow';
-                        }}
-                    " class="material-symbols-rounded" style="
+                    {audio_tags}
+                    <span id="{button_id}" onclick="window['toggle_{button_id}']()" class="material-symbols-rounded" style="
                         font-size: 20px;
                         color: #E6A538;
                         cursor: pointer;
@@ -126,23 +121,55 @@ def render_conversation(container, partial_text=None):
                     ">{'pause' if should_autoplay else 'play_arrow'}</span>
                     <script>
                         (function() {{
-                            var audio = document.getElementById('{audio_id}');
+                            var ids = {json.dumps(audio_ids)};
+                            var key = '{segment_key}';
                             var btn = document.getElementById('{button_id}');
                             
-                            // When audio ends, reset button
-                            audio.addEventListener('ended', function() {{
-                                btn.textContent = 'play_arrow';
-                            }});
+                            function playFrom(k) {{
+                                var audio = document.getElementById(ids[k]);
+                                if (audio) {{
+                                    sessionStorage.setItem(key, k);
+                                    audio.play().catch(function(e) {{}});
+                                }}
+                            }}
                             
-                            // When audio plays, update button
-                            audio.addEventListener('play', function() {{
-                                btn.textContent = 'pause';
-                            }});
+                            // Pause the segment being played, or resume from the current segment
+                            window['toggle_{button_id}'] = function() {{
+                                for (var k = 0; k < ids.length; k++) {{
+                                    var audio = document.getElementById(ids[k]);
+                                    if (!audio.paused) {{
+                                        audio.pause();
+                                        return;
+                                    }}
+                                }}
+                                var next = parseInt(sessionStorage.getItem(key) || '0');
+                                playFrom(next < ids.length ? next : 0);
+                            }};
                             
-                            // When audio pauses, update button
-                            audio.addEventListener('pause', function() {{
-                                btn.textContent = 'play_arrow';
+                            ids.forEach(function(id, k) {{
+                                var audio = document.getElementById(id);
+                                
+                                // When audio plays, update button
+                                audio.addEventListener('play', function() {{
+                                    btn.textContent = 'pause';
+                                }});
+                                
+                                // When audio pauses, update button
+                                audio.addEventListener('pause', function() {{
+                                    btn.textContent = 'play_arrow';
+                                }});
+                                
+                                // When a segment ends, chain the next one (it may arrive on a later render)
+                                audio.addEventListener('ended', function() {{
+                                    sessionStorage.setItem(key, k + 1);
+                                    playFrom(k + 1);
+                                }});
                             }});
+                            
+                            // Autoplay the next pending segment unless a restored one is about to resume
+                            if ({'true' if should_autoplay else 'false'} && !sessionStorage.getItem('speech_playing_audio_id')) {{
+                                playFrom(parseInt(sessionStorage.getItem(key) || '0'));
+                            }}
                         }})();
                     </script>
                 """
@@ -247,17 +274,20 @@ def render_conversation(container, partial_text=None):
         """, height=420)
 
 
-def process_llm_response(user_id, agent_id, user_message, language):
-    """Process user message through LLM with conversation history and generate TTS audio"""
-    try:
-        # Check if Select AI is enabled
-        use_select_ai = st.session_state.get("speech_use_select_ai", False)
+def get_response_stream(user_id, agent_id, user_message, language):
+    """Build the LLM text stream for a user message (Select AI answers arrive as a single chunk).
+    Session state is read here, on the script thread, because the stream is consumed by the TTS pipeline thread."""
+    # Check if Select AI is enabled
+    use_select_ai = st.session_state.get("speech_use_select_ai", False)
+    
+    if use_select_ai:
+        # Use Select AI service (similar to app_chat_01.py)
+        profile_name = select_ai_service.get_profile(user_id)
+        action = 'narrate'
+        prompt_extra = st.session_state.get("speech_prompt_extra", "")
+        no_information = st.session_state.get("language-message", "I don't have that information.")
         
-        if use_select_ai:
-            # Use Select AI service (similar to app_chat_01.py)
-            profile_name = select_ai_service.get_profile(user_id)
-            action = 'narrate'
-            prompt_extra = st.session_state.get("speech_prompt_extra", "")
+        def select_ai_stream():
             response_text = db_select_ai_service.get_chat(
                 user_message,
                 profile_name,
@@ -267,62 +297,88 @@ def process_llm_response(user_id, agent_id, user_message, language):
             )
             
             # Handle "NNN" response (no information available)
-            if "NNN" in response_text:
-                response_text = st.session_state.get("language-message", "I don't have that information.")
-        else:
-            # Use configured voice agent (original behavior)
-            # Build context from recent conversation history
-            context = ""
-            recent_msgs = st.session_state.speech_conversation[-6:] if len(st.session_state.speech_conversation) > 6 else st.session_state.speech_conversation
-            
-            if recent_msgs:
-                context = "Recent conversation history:\n"
-                for msg in recent_msgs:
-                    role = "User" if msg["role"] == "user" else "Assistant"
-                    context += f"{role}: {msg['content']}\n"
-                context += "\nConsider the previous history to respond coherently.\n\n"
-            
-            # Build full input with context
-            full_input = f"{context}Current question: {user_message}"
-            
-            # Use get_agent method (simpler, more reliable)
-            result = generative_service.get_agent(
-                user_id=user_id,
-                agent_id=agent_id,
-                input=full_input
-            )
-            
-            # Interpret result according to returned type
-            if isinstance(result, dict):
-                response_text = result.get("answer", "Sorry, I couldn't generate a response.")
-                branch = "dict"
-            elif isinstance(result, str):
-                response_text = result
-                branch = "str_passthrough"
-            else:
-                response_text = str(result)
-                branch = f"fallback_{type(result).__name__}"
-    except Exception as e:
-        print(f"Error in LLM processing: {e}")
-        response_text = f"Error processing: {str(e)}"
+            yield no_information if "NNN" in response_text else response_text
+        
+        return select_ai_stream()
+    
+    # Use configured voice agent (original behavior)
+    # Build context from recent conversation history
+    context = ""
+    recent_msgs = st.session_state.speech_conversation[-6:] if len(st.session_state.speech_conversation) > 6 else st.session_state.speech_conversation
+    
+    if recent_msgs:
+        context = "Recent conversation history:\n"
+        for msg in recent_msgs:
+            role = "User" if msg["role"] == "user" else "Assistant"
+            context += f"{role}: {msg['content']}\n"
+        context += "\nConsider the previous history to respond coherently.\n\n"
+    
+    # Build full input with context
+    full_input = f"{context}Current question: {user_message}"
+    
+    # Stream the agent tokens, so speech starts with the first sentence
+    return generative_service.get_agent_stream(
+        user_id=user_id,
+        agent_id=agent_id,
+        input=full_input
+    )
+
+
+def process_llm_response(user_id, agent_id, user_message, language, container=None):
+    """Process user message through a pipelined LLM -> TTS responder.
+    LLM tokens are cut into sentence segments that are synthesized while the LLM keeps generating;
+    when a container is given, the conversation is re-rendered as each segment becomes playable."""
+    started = time.perf_counter()
+    timings = {}
+    chunks = []
     
-    # Generate TTS audio
-    audio_base64 = None
-    audio_bytes = text_to_speech(response_text)
-    if audio_bytes:
-        audio_base64 = base64.b64encode(audio_bytes).decode()
+    def timed(text_stream):
+        # Runs on the pipeline thread: records the LLM stage latencies
+        for chunk in text_stream:
+            if not chunks:
+                timings["llm_first_token_ms"] = (time.perf_counter() - started) * 1000
+            chunks.append(chunk)
+            yield chunk
+        timings["llm_ms"] = (time.perf_counter() - started) * 1000
     
-    # Add assistant response to conversation
+    # Assistant response, text and audio segments are attached as they are ready
     timestamp = datetime.now().strftime("%H:%M:%S")
-    st.session_state.speech_conversation.append({
+    message = {
         "role": "assistant",
-        "content": response_text,
+        "content": "",
         "timestamp": timestamp,
-        "audio": audio_base64
-    })
+        "audio_segments": []
+    }
     
     # Set the timestamp as the ID to autoplay (unique identifier)
     st.session_state.speech_autoplay_id = timestamp
+    
+    try:
+        # Built before the response joins the conversation, so it is not part of its own context
+        text_stream = get_response_stream(user_id, agent_id, user_message, language)
+        st.session_state.speech_conversation.append(message)
+        for segment, audio_bytes in text_to_speech_pipeline(timed(text_stream)):
+            message["content"] = f"{message['content']} {segment}".strip()
+            if audio_bytes:
+                message["audio_segments"].append(base64.b64encode(audio_bytes).decode())
+                if "first_audio_ms" not in timings:
+                    timings["first_audio_ms"] = (time.perf_counter() - started) * 1000
+            if container is not None:
+                render_conversation(container, st.session_state.speech_current_partial)
+        
+        # Keep the original formatting of the answer once it is complete
+        message["content"] = "".join(chunks).strip() or message["content"]
+    except Exception as e:
+        print(f"Error in LLM processing: {e}")
+        if not any(item is message for item in st.session_state.speech_conversation):
+            st.session_state.speech_conversation.append(message)
+        error_text = f"Error processing: {str(e)}"
+        message["content"] = f"{message['content']} {error_text}".strip()
+        for audio_bytes in text_to_speech_stream(error_text):
+            message["audio_segments"].append(base64.b64encode(audio_bytes).decode())
+    
+    timings["total_ms"] = (time.perf_counter() - started) * 1000
+    st.session_state.speech_metrics.update(timings)
 
 
 def process_transcription_results():
@@ -350,12 +406,37 @@ def process_transcription_results():
             st.session_state.speech_current_partial = content
             updated = True
         
+        elif msg_type == "metric":
+            name, value = content
+            st.session_state.speech_metrics[name] = value
+        
         elif msg_type == "error":
             st.error(f"Error: {content}")
     
     return updated
 
 
+def get_listening_status():
+    """Build the 'Listening...' status with the voice pipeline latency and TTS cache metrics"""
+    labels = {
+        "connect_ms": "Connect",
+        "first_partial_ms": "First partial",
+        "llm_first_token_ms": "First token",
+        "llm_ms": "LLM",
+        "first_audio_ms": "First audio",
+        "total_ms": "Total"
+    }
+    metrics = [
+        f"{labels[name]}: {value:.0f} ms"
+        for name, value in st.session_state.speech_metrics.items()
+        if name in labels
+    ]
+    cache_stats = tts_cache.get_stats()
+    if cache_stats["hits"] + cache_stats["misses"]:
+        metrics.append(f"TTS cache: {cache_stats['hit_rate']:.0%}")
+    return " · ".join(["Listening..."] + metrics)
+
+
 def cleanup_session():
     """Cleanup OCI thread and queues when WebRTC stops"""
     if "speech_oci_thread" in st.session_state:
@@ -365,63 +446,11 @@ def cleanup_session():
         del st.session_state.speech_oci_thread
     
     # Clear queues
-    while not st.session_state.speech_audio_queue.empty():
-        st.session_state.speech_audio_queue.get()
+    st.session_state.speech_audio_queue.clear()
     while not st.session_state.speech_result_queue.empty():
         st.session_state.speech_result_queue.get()
 
 
-def create_oci_worker(audio_queue, result_queue, language):
-    """Create OCI worker thread for real-time speech recognition"""
-    def oci_worker(audio_q, result_q, lang):
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        async_input_queue = asyncio.Queue()
-        
-        def on_final(text):
-            result_q.put(("final", text))
-        
-        def on_partial(text):
-            result_q.put(("partial", text))
-        
-        async def bridge_audio():
-            while True:
-                if not audio_q.empty():
-                    data = audio_q.get()
-                    await async_input_queue.put(data)
-                    if data is None:
-                        break
-                else:
-                    await asyncio.sleep(0.01)
-        
-        bridge_task = loop.create_task(bridge_audio())
-        try:
-            loop.run_until_complete(
-                start_realtime_session(on_final, on_partial, lang, async_input_queue)
-            )
-        except Exception as e:
-            print(f"OCI Worker Error: {e}")
-            result_q.put(("error", str(e)))
-        finally:
-            if not bridge_task.done():
-                bridge_task.cancel()
-            try:
-                pending = asyncio.all_tasks(loop)
-                loop.run_until_complete(asyncio.gather(*pending))
-            except:
-                pass
-            loop.close()
-    
-    thread = threading.Thread(
-        target=oci_worker,
-        args=(audio_queue, result_queue, language),
-        daemon=True
-    )
-    add_script_run_ctx(thread)
-    thread.start()
-    return thread
-
-
 if login:
     st.set_page_config(
         page_title="Oracle AI Accelerator - Voice Chat",
@@ -481,9 +510,8 @@ if login:
         try:
             user_message = st.session_state.speech_llm_queue.get()
             # Pass language to process_llm_response
-            process_llm_response(user_id, selected_agent_id, user_message, selected_language)
-            # Update conversation display after processing
-            render_conversation(conversation_container, st.session_state.speech_current_partial)
+            # The conversation display is updated as each audio segment is synthesized
+            process_llm_response(user_id, selected_agent_id, user_message, selected_language, conversation_container)
         except Exception as e:
             st.error(f"Error processing message: {e}")
         finally:
@@ -515,7 +543,7 @@ if login:
     
     # Process while active
     if ctx.state.playing:
-        status_caption.info("Listening...")
+        status_caption.info(get_listening_status())
         
         # Ensure audio processor has queue
         if ctx.audio_processor and not ctx.audio_processor.audio_queue:
@@ -523,7 +551,7 @@ if login:
         
         # Start OCI thread if not exists
         if "speech_oci_thread" not in st.session_state or not st.session_state.speech_oci_thread.is_alive():
-            st.session_state.speech_oci_thread = create_oci_worker(
+            st.session_state.speech_oci_thread = create_realtime_worker(
                 st.session_state.speech_audio_queue,
                 st.session_state.speech_result_queue,
                 selected_language
@@ -557,6 +585,11 @@ if login:
                     st.session_state.speech_current_partial = content
                     # Update only the partial text display without regenerating entire conversation
                 
+                elif msg_type == "metric":
+                    name, value = content
+                    st.session_state.speech_metrics[name] = value
+                    status_caption.info(get_listening_status())
+                
                 elif msg_type == "error":
                     st.error(f"Error: {content}")
             
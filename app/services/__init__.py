@@ -1,6 +1,7 @@
 import platform
 
 from .client import ClientService
+from .oci_job_tracker import JobTrackerService, JobFailedError
 from .oci_bucket import BucketService
 from .oci_select_ai import SelectAIService
 from .oci_select_ai_rag import SelectAIRAGService
@@ -10,11 +11,14 @@ from .oci_document_multimodal import DocumentMultimodalService
 from .oci_generative_ai_chat import GenerativeAIService
 from .open_anonymizer_engine import AnalyzerEngineService
 from .oci_speech_stt_realtime import start_realtime_session, stop_realtime_session
-from .oci_speech_tts_realtime import text_to_speech
+from .oci_speech_tts_cache import TTSCacheService
+from .oci_speech_tts_realtime import text_to_speech, text_to_speech_stream, text_to_speech_pipeline
 from .oci_ai_agent import DBMSAIAgentService
 
 __all__ = [
     "ClientService",
+    "JobTrackerService",
+    "JobFailedError",
     "BucketService",
     "SelectAIService",
     "SelectAIRAGService",
@@ -26,5 +30,8 @@ __all__ = [
     "DBMSAIAgentService",
     "start_realtime_session",
     "stop_realtime_session",
+    "TTSCacheService",
     "text_to_speech",
+    "text_to_speech_stream",
+    "text_to_speech_pipeline",
 ]
@@ -5,6 +5,8 @@ from .files import FileService
 from .docs import DocService
 from .select_ai import SelectAIService
 from .select_ai_rag import SelectAIRAGService
+from .select_ai_cache import SelectAICacheService
+from .select_ai_loader import CSVLoaderService
 from .dbms_ai_agent import DBMSAIAgentService
 from .quiz import QuizService
 
@@ -16,6 +18,8 @@ __all__ = [
     "DocService",
     "SelectAIService",
     "SelectAIRAGService",
+    "SelectAICacheService",
+    "CSVLoaderService",
     "DBMSAIAgentService",
     "QuizService"
 ]
@@ -1,6 +1,7 @@
 import os
 import ads
 import oracledb
+import threading
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -11,7 +12,9 @@ class Connection:
 
     Ensures only one instance of the connection is created and reused throughout the application.
     """
-    _instance = None
+    _instance  = None
+    _pool      = None
+    _pool_lock = threading.Lock()
 
     def __new__(cls):
         if cls._instance is None:
@@ -72,6 +75,37 @@ class Connection:
         self._ensure_connection()
         return self.conn
 
+    def get_pool(self, max_size=4, wait_timeout_ms=30000):
+        """
+        Returns a connection pool with the same configuration, created on first use.
+
+        Statements that need their own session settings (e.g. `call_timeout`) run on
+        a pooled connection, so the shared connection of every session is not changed.
+
+        Args:
+            max_size (int)        : Maximum connections of the pool.
+            wait_timeout_ms (int) : Maximum wait for a free connection.
+
+        Returns:
+            oracledb.ConnectionPool: The pool.
+        """
+        with Connection._pool_lock:
+            if Connection._pool is None:
+                Connection._pool = oracledb.create_pool(
+                    user=self._db_config["user"],
+                    password=self._db_config["password"],
+                    dsn=self._db_config["dsn"],
+                    config_dir=self._db_config["config_dir"],
+                    wallet_location=self._db_config["wallet_location"],
+                    wallet_password=self._db_config["wallet_password"],
+                    min=0,
+                    max=max_size,
+                    increment=1,
+                    getmode=oracledb.POOL_GETMODE_TIMEDWAIT,
+                    wait_timeout=wait_timeout_ms
+                )
+            return Connection._pool
+
     def close_connection(self):
         """
         Closes the Oracle database connection if it is open.
@@ -119,104 +119,109 @@ class FileService:
             file_description
         ):
         """
-        Inserts or updates a file record and its user association.
-        """
+        Inserts or updates a file record and its user association in one PL/SQL call
+        (bind variables, one round trip and one commit).
 
-        # Verificar si el FILE ya existe (por file name, module y pii)
-        check_query = f"""
-            SELECT FILE_ID, FILE_VERSION
-            FROM FILES
-            WHERE FILE_SRC_FILE_NAME = '{file_src_file_name}'
-            AND MODULE_ID = {module_id}
-            AND FILE_TRG_PII = {file_trg_pii}
-        """
-        df = pd.read_sql(check_query, con=self.conn)
-
-        if not df.empty:
-            file_id = df['FILE_ID'].iloc[0]
-            file_version = df['FILE_VERSION'].iloc[0]
-
-            # Verificar si ya existe la relación con el usuario
-            user_file_query = f"""
-                SELECT 1 FROM FILE_USER
-                WHERE FILE_ID = {file_id} AND USER_ID = {user_id}
-            """
-            df_user_file = pd.read_sql(user_file_query, con=self.conn)
-
-            if not df_user_file.empty:
-                # El archivo existe y ya está asociado al usuario → actualizar versión
-                with self.conn.cursor() as cur:
-                    cur.execute(f"""
-                        UPDATE FILES SET
-                            FILE_SRC_SIZE      = {file_src_size},
-                            FILE_SRC_STRATEGY  = '{file_src_strategy}',
-                            FILE_TRG_LANGUAGE  = '{file_trg_language}',
-                            FILE_VERSION       = {file_version} + 1,
-                            FILE_DESCRIPTION   = '{file_description}',
-                            FILE_STATE         = 1,
-                            FILE_DATE          = SYSDATE
-                        WHERE FILE_ID = {file_id}
-                    """)
-                self.conn.commit()
-
-                # Borrar documentos asociados anteriores
-                with self.conn.cursor() as cur:
-                    cur.execute(f"DELETE FROM DOCS WHERE FILE_ID = {file_id}")
-                self.conn.commit()
-
-                return f"File '{file_name}' already existed and added new version.", int(file_id)
-
-            else:
-                # El archivo existe pero no está asociado al usuario → asociar en FILE_USER
-                with self.conn.cursor() as cur:
-                    cur.execute(f"""
-                        INSERT INTO FILE_USER (FILE_ID, USER_ID)
-                        VALUES ({file_id}, {user_id})
-                    """)
-                self.conn.commit()
-
-                return f"File '{file_name}' existed but was linked to user.", file_id
+        A file is identified by source file name, module and PII flag:
+            - not found                       : the file is created and linked to the user.
+            - found, not linked to the user   : the file is linked to the user.
+            - found and linked to the user    : a new version (FILE_VERSION + 1, DOCS deleted).
 
-        else:
-            # El archivo no existe → crear nuevo FILE y FILE_USER
-            with self.conn.cursor() as cur:
-                file_id_var = cur.var(int)
-                cur.execute(f"""
-                    INSERT INTO FILES (
-                        MODULE_ID,
-                        FILE_SRC_FILE_NAME,
-                        FILE_SRC_SIZE,
-                        FILE_SRC_STRATEGY,
-                        FILE_TRG_OBJ_NAME,
-                        FILE_TRG_LANGUAGE,
-                        FILE_TRG_PII,
-                        FILE_DESCRIPTION
-                    ) VALUES (
-                        {module_id},
-                        '{file_src_file_name}',
-                        {file_src_size},
-                        '{file_src_strategy}',
-                        '{file_trg_obj_name}',
-                        '{file_trg_language}',
-                        {file_trg_pii},
-                        '{file_description}'
-                    ) RETURNING FILE_ID INTO :file_id
-                """, {"file_id": file_id_var})
-            self.conn.commit()
-
-            file_id_new = file_id_var.getvalue()[0]
+        Returns:
+            tuple: (message, file_id, is_new_version)
+        """
+        with self.conn.cursor() as cur:
+            file_id_var     = cur.var(int)
+            file_status_var = cur.var(int)
+            cur.execute("""
+                DECLARE
+                    l_file_id      files.file_id%TYPE;
+                    l_linked       NUMBER;
+                BEGIN
+                    BEGIN
+                        SELECT f.file_id,
+                               (SELECT COUNT(*) FROM file_user fu WHERE fu.file_id = f.file_id AND fu.user_id = :user_id)
+                          INTO l_file_id, l_linked
+                          FROM files f
+                         WHERE f.file_src_file_name = :file_src_file_name
+                           AND f.module_id = :module_id
+                           AND f.file_trg_pii = :file_trg_pii
+                         FETCH FIRST 1 ROWS ONLY;
+                    EXCEPTION
+                        WHEN NO_DATA_FOUND THEN
+                            l_file_id := NULL;
+                    END;
+
+                    IF l_file_id IS NULL THEN
+                        INSERT INTO files (
+                            module_id,
+                            file_src_file_name,
+                            file_src_size,
+                            file_src_strategy,
+                            file_trg_obj_name,
+                            file_trg_language,
+                            file_trg_pii,
+                            file_description
+                        ) VALUES (
+                            :module_id,
+                            :file_src_file_name,
+                            :file_src_size,
+                            :file_src_strategy,
+                            :file_trg_obj_name,
+                            :file_trg_language,
+                            :file_trg_pii,
+                            :file_description
+                        ) RETURNING file_id INTO l_file_id;
+
+                        INSERT INTO file_user (file_id, user_id) VALUES (l_file_id, :user_id);
+                        :file_status := 0;
+
+                    ELSIF l_linked = 0 THEN
+                        INSERT INTO file_user (file_id, user_id) VALUES (l_file_id, :user_id);
+                        :file_status := 1;
+
+                    ELSE
+                        UPDATE files SET
+                            file_src_size     = :file_src_size,
+                            file_src_strategy = :file_src_strategy,
+                            file_trg_language = :file_trg_language,
+                            file_version      = file_version + 1,
+                            file_description  = :file_description,
+                            file_state        = 1,
+                            file_date         = SYSDATE
+                        WHERE file_id = l_file_id;
+
+                        DELETE FROM docs WHERE file_id = l_file_id;
+                        :file_status := 2;
+                    END IF;
+
+                    :file_id := l_file_id;
+                    COMMIT;
+                END;
+            """, {
+                "user_id"            : user_id,
+                "module_id"          : module_id,
+                "file_src_file_name" : file_src_file_name,
+                "file_src_size"      : file_src_size,
+                "file_src_strategy"  : file_src_strategy,
+                "file_trg_obj_name"  : file_trg_obj_name,
+                "file_trg_language"  : file_trg_language,
+                "file_trg_pii"       : file_trg_pii,
+                "file_description"   : file_description,
+                "file_id"            : file_id_var,
+                "file_status"        : file_status_var
+            })
 
-            # Asociar el nuevo FILE con el USER
-            with self.conn.cursor() as cur:
-                cur.execute(f"""
-                    INSERT INTO FILE_USER (FILE_ID, USER_ID)
-                    VALUES ({file_id_new}, {user_id})
-                """)
-            self.conn.commit()
+        file_id     = file_id_var.getvalue()
+        file_status = file_status_var.getvalue()
 
-            return f"File '{file_name}' has been created successfully.", file_id_new
+        if file_status == 2:
+            return f"File '{file_name}' already existed and added new version.", file_id, True
+        elif file_status == 1:
+            return f"File '{file_name}' existed but was linked to user.", file_id, False
+        else:
+            return f"File '{file_name}' has been created successfully.", file_id, False
 
-    
     def update_extraction(
             self,
             file_id,
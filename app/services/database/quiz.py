@@ -1,8 +1,26 @@
+import os
+import io
+import json
+import time
+import codecs
+import oracledb
 import streamlit as st
 import pandas as pd
-import json
 from datetime import datetime
+from dotenv import load_dotenv
 from services.database.connection import Connection
+import utils as utils
+
+load_dotenv()
+
+# --- Quiz load Configuration ---
+QUIZ_BATCH_SIZE        = int(os.getenv('CON_QUIZ_BATCH_SIZE', '500'))
+QUIZ_STREAM_CHUNK_SIZE = 64 * 1024
+# -------------------------------
+
+# --- Quiz question store Configuration ---
+QUIZ_STORE_MAX_FILES = int(os.getenv('CON_QUIZ_STORE_MAX_FILES', '16'))
+# -----------------------------------------
 
 class QuizService:
     """
@@ -74,6 +92,10 @@ class QuizService:
                     """)
                     deleted_answers = cur.rowcount
 
+                    cur.execute("""
+                        DELETE FROM quiz_stats WHERE file_id = :file_id
+                    """, {"file_id": file_id})
+
                     # Then delete quiz questions
                     cur.execute("""
                         DELETE FROM quiz WHERE file_id = :file_id
@@ -89,37 +111,119 @@ class QuizService:
             self.conn.rollback()
             return (False, f"Error deleting quiz data: {str(e)}")
 
-    def insert_quiz_questions(self, file_id, questions_data, reload=False):
+    @staticmethod
+    def get_quiz_stream(stream, chunk_size=QUIZ_STREAM_CHUNK_SIZE):
         """
-        Inserts quiz questions from JSON data into the database.
+        Parses a quiz JSON document incrementally, so large question banks are
+        never loaded whole: top-level entries are yielded as (key, value), except
+        "questions", whose items are yielded one by one as ("question", item).
+
+        Args:
+            stream (file-like) : The JSON document (binary or text).
+            chunk_size (int)   : Characters read per chunk.
+
+        Yields:
+            tuple: (key, value) pairs in document order.
+        """
+        decoder = json.JSONDecoder()
+        utf8    = codecs.getincrementaldecoder("utf-8")()
+        state   = {"buffer": "", "pos": 0, "eof": False}
+
+        def read():
+            chunk = stream.read(chunk_size)
+            state["eof"] = not chunk
+            if isinstance(chunk, bytes):
+                chunk = utf8.decode(chunk, final=state["eof"])
+            state["buffer"] = state["buffer"][state["pos"]:] + chunk
+            state["pos"]    = 0
+
+        def skip(separators=" \t\r\n"):
+            # Returns the next significant character, reading more input if needed
+            while True:
+                while state["pos"] < len(state["buffer"]) and state["buffer"][state["pos"]] in separators:
+                    state["pos"] += 1
+                if state["pos"] < len(state["buffer"]):
+                    return state["buffer"][state["pos"]]
+                if state["eof"]:
+                    raise ValueError("Unexpected end of the quiz JSON document.")
+                read()
+
+        def value():
+            # A value is only complete when something follows it (a number could continue in the next chunk)
+            skip()
+            while True:
+                try:
+                    item, end = decoder.raw_decode(state["buffer"], state["pos"])
+                    if end < len(state["buffer"]) or state["eof"]:
+                        state["pos"] = end
+                        return item
+                except json.JSONDecodeError:
+                    if state["eof"]:
+                        raise
+                read()
+
+        def expect(char):
+            if skip() != char:
+                raise ValueError(f"Invalid quiz JSON document: expected '{char}'.")
+            state["pos"] += 1
+
+        read()
+        expect("{")
+        while skip(" \t\r\n,") != "}":
+            key = value()
+            expect(":")
+            if key == "questions":
+                expect("[")
+                while skip(" \t\r\n,") != "]":
+                    yield "question", value()
+                state["pos"] += 1
+            else:
+                yield key, value()
+
+    def insert_quiz_questions(self, file_id, questions_data, reload=False, batch_size=QUIZ_BATCH_SIZE):
+        """
+        Inserts quiz questions from JSON data into the database with array DML
+        (executemany), `batch_size` questions per round trip and commit.
         If reload=True, deletes existing questions first.
 
         Args:
             file_id (int): The ID of the uploaded file.
-            questions_data (dict): The parsed JSON data containing questions.
+            questions_data (dict | file-like): The parsed JSON data containing questions, or the
+                JSON document itself, which is then parsed incrementally (see get_quiz_stream).
             reload (bool): If True, deletes existing questions before inserting.
+            batch_size (int): Questions per executemany batch.
 
         Returns:
             str: A message indicating the result of the operation.
         """
         try:
+            start_time = time.perf_counter()
+
             # If reload, delete existing data first
             if reload:
                 success, msg = self.delete_quiz_by_file(file_id)
                 if not success:
                     return msg
 
-            questions = questions_data.get('questions', [])
-            modules_info = {m['module']: m['percentage'] for m in questions_data.get('modules', [])}
+            if isinstance(questions_data, dict):
+                entries = [("modules", questions_data.get('modules', []))]
+                entries += [("question", question) for question in questions_data.get('questions', [])]
+            else:
+                entries = QuizService.get_quiz_stream(questions_data)
+
+            modules_info   = {}
+            late_modules   = False
             inserted_count = 0
+            batch          = []
 
             with self.conn.cursor() as cur:
-                for question in questions:
-                    # Obtener porcentaje del módulo
-                    module_percentage = modules_info.get(question['module'], 0)
-                    
-                    # Insert question
-                    cur.execute("""
+                def flush():
+                    cur.setinputsizes(
+                        options_en=oracledb.DB_TYPE_CLOB,
+                        options_es=oracledb.DB_TYPE_CLOB,
+                        options_pt=oracledb.DB_TYPE_CLOB
+                    )
+                    cur.executemany("""
                         INSERT INTO quiz (
                             file_id,
                             question_id,
@@ -151,25 +255,50 @@ class QuizService:
                             :explanation_es,
                             :explanation_pt
                         )
-                    """, {
-                        "file_id": file_id,
-                        "question_id": question['id'],
-                        "module_id": question['module'],
-                        "module_name": question['module_name'],
-                        "module_percentage": module_percentage,
-                        "question_en": question['question_en'],
-                        "question_es": question['question_es'],
-                        "question_pt": question['question_pt'],
-                        "options_en": json.dumps(question['options_en']),
-                        "options_es": json.dumps(question['options_es']),
-                        "options_pt": json.dumps(question['options_pt']),
-                        "explanation_en": question['explanation_en'],
-                        "explanation_es": question['explanation_es'],
-                        "explanation_pt": question['explanation_pt']
-                    })
-                    inserted_count += 1
+                    """, batch)
+                    batch.clear()
+
+                for key, entry in entries:
+                    if key == "modules":
+                        modules_info = {m['module']: m['percentage'] for m in entry}
+                        late_modules = inserted_count > 0 or bool(batch)
+                    elif key == "question":
+                        batch.append({
+                            "file_id": file_id,
+                            "question_id": entry['id'],
+                            "module_id": entry['module'],
+                            "module_name": entry['module_name'],
+                            "module_percentage": modules_info.get(entry['module'], 0),
+                            "question_en": entry['question_en'],
+                            "question_es": entry['question_es'],
+                            "question_pt": entry['question_pt'],
+                            "options_en": json.dumps(entry['options_en']),
+                            "options_es": json.dumps(entry['options_es']),
+                            "options_pt": json.dumps(entry['options_pt']),
+                            "explanation_en": entry['explanation_en'],
+                            "explanation_es": entry['explanation_es'],
+                            "explanation_pt": entry['explanation_pt']
+                        })
+                        inserted_count += 1
+                        if len(batch) >= batch_size:
+                            flush()
+                if batch:
+                    flush()
+
+                # "modules" came after some questions in the document: set their percentages now
+                if late_modules and modules_info:
+                    cur.executemany("""
+                        UPDATE quiz SET module_percentage = :module_percentage
+                        WHERE file_id = :file_id AND module_id = :module_id
+                    """, [
+                        {"module_percentage": percentage, "file_id": file_id, "module_id": module_id}
+                        for module_id, percentage in modules_info.items()
+                    ])
 
             self.conn.commit()
+
+            elapsed = time.perf_counter() - start_time
+            print(f"[Quiz] {inserted_count} questions in {elapsed:.2f}s ({inserted_count / elapsed:.0f} rows/s, batch {batch_size})")
             
             if reload:
                 return f"{inserted_count} questions reloaded successfully."
@@ -216,6 +345,82 @@ class QuizService:
         """
         return pd.read_sql(query, con=_self.conn)
     
+    def get_quiz_version(self, file_id):
+        """
+        Returns the version of the active questions of a file (count, last quiz_id and
+        sum of percentages), which changes when the file is loaded, reloaded or deleted.
+
+        Args:
+            file_id (int): The ID of the file.
+
+        Returns:
+            tuple: The version, only used as cache key.
+        """
+        with self.conn.cursor() as cur:
+            cur.execute("""
+                SELECT COUNT(*), MAX(quiz_id), SUM(module_percentage)
+                FROM quiz
+                WHERE file_id = :file_id
+                  AND quiz_state <> 0
+            """, {"file_id": file_id})
+            return tuple(cur.fetchone())
+
+    @st.cache_resource(show_spinner=False, max_entries=QUIZ_STORE_MAX_FILES)
+    def get_quiz_store(_self, file_id, quiz_version=None):
+        """
+        Retrieves the questions of a file as a columnar store (see utils.QuizStoreService),
+        built once per file and process and shared by every session. Read-only.
+
+        Args:
+            file_id (int): The ID of the file.
+            quiz_version (tuple, optional): Version of the questions, only used as cache key.
+
+        Returns:
+            pd.DataFrame: The store.
+        """
+        start_time = time.perf_counter()
+        df = pd.read_sql("""
+            SELECT
+                quiz_id,
+                question_id,
+                module_id,
+                module_name,
+                module_percentage,
+                question_en,
+                question_es,
+                question_pt,
+                options_en,
+                options_es,
+                options_pt,
+                explanation_en,
+                explanation_es,
+                explanation_pt,
+                quiz_state,
+                quiz_date
+            FROM quiz
+            WHERE file_id = :file_id
+              AND quiz_state <> 0
+        """, con=_self.conn, params={"file_id": file_id})
+        store = utils.QuizStoreService.get_store(df)
+        print(f"[Quiz] Question store of file {file_id}: {len(store)} questions in {time.perf_counter() - start_time:.2f}s")
+        return store
+
+    def get_quiz_questions_cache(self, file_id, languages=None):
+        """
+        Returns the questions of a file for some languages, from the shared question store
+        (no text is copied per session; OPTIONS_xx come as parsed lists).
+
+        Args:
+            file_id (int): The ID of the file.
+            languages (list, optional): Language codes (e.g. ["es", "en"]); None keeps all of them,
+                an empty list only the common columns (e.g. to count questions).
+
+        Returns:
+            pd.DataFrame: The columns of get_quiz_questions for the languages.
+        """
+        store = self.get_quiz_store(file_id, self.get_quiz_version(file_id))
+        return utils.QuizStoreService.get_projection(store, languages if languages is not None else ["EN", "ES", "PT"])
+
     @st.cache_data(show_spinner=False)
     def get_quiz_modules(_self, file_id):
         """
@@ -281,6 +486,7 @@ class QuizService:
                     "is_correct": is_correct,
                     "answer_time_seconds": answer_time_seconds
                 })
+                cur.callproc("SP_QUIZ_STATS_REFRESH", [user_id, evaluation_name])
             self.conn.commit()
             return "Answer recorded successfully."
         
@@ -288,6 +494,71 @@ class QuizService:
             self.conn.rollback()
             return f"Error recording answer: {str(e)}"
 
+    def upsert_quiz_answers(self, answers):
+        """
+        Writes user answers with array DML (one round trip and one commit). An answer
+        already stored for the same user, evaluation and question is updated, so
+        saving a finished evaluation again never duplicates rows.
+
+        Args:
+            answers (list): Dicts with quiz_id, user_id, evaluation_name, selected_option,
+                            is_correct and answer_time_seconds.
+
+        Raises:
+            oracledb.Error: If the answers cannot be written (nothing is committed).
+        """
+        try:
+            with self.conn.cursor() as cur:
+                cur.executemany("""
+                    MERGE INTO quiz_answers qa
+                    USING (
+                        SELECT
+                            :quiz_id             AS quiz_id,
+                            :user_id             AS user_id,
+                            :evaluation_name     AS evaluation_name,
+                            :selected_option     AS selected_option,
+                            :is_correct          AS is_correct,
+                            :answer_time_seconds AS answer_time_seconds
+                        FROM DUAL
+                    ) s
+                    ON (
+                        qa.user_id = s.user_id
+                        AND qa.evaluation_name = s.evaluation_name
+                        AND qa.quiz_id = s.quiz_id
+                        AND qa.quiz_answer_state <> 0
+                    )
+                    WHEN MATCHED THEN UPDATE SET
+                        qa.selected_option     = s.selected_option,
+                        qa.is_correct          = s.is_correct,
+                        qa.answer_time_seconds = s.answer_time_seconds
+                    WHEN NOT MATCHED THEN INSERT (
+                        quiz_id,
+                        user_id,
+                        evaluation_name,
+                        selected_option,
+                        is_correct,
+                        answer_time_seconds
+                    ) VALUES (
+                        s.quiz_id,
+                        s.user_id,
+                        s.evaluation_name,
+                        s.selected_option,
+                        s.is_correct,
+                        s.answer_time_seconds
+                    )
+                """, answers)
+
+                # Keep the report summary (QUIZ_STATS) of the evaluations in the batch up to date
+                evaluations = {(answer["user_id"], answer["evaluation_name"]) for answer in answers}
+                cur.executemany(
+                    "BEGIN SP_QUIZ_STATS_REFRESH(:user_id, :evaluation_name); END;",
+                    [{"user_id": user_id, "evaluation_name": evaluation_name} for user_id, evaluation_name in evaluations]
+                )
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+
     @st.cache_data
     def get_user_evaluations(_self, user_id):
         """
@@ -417,6 +688,7 @@ class QuizService:
                     "user_id": user_id,
                     "evaluation_name": evaluation_name
                 })
+                cur.callproc("SP_QUIZ_STATS_REFRESH", [user_id, evaluation_name])
             self.conn.commit()
             return f"Evaluation '{evaluation_name}' has been deleted successfully."
         
@@ -448,43 +720,54 @@ class QuizService:
         })
         return df['COUNT'].iloc[0] > 0 if not df.empty else False
     
-    def get_global_module_stats(self, start_date=None, end_date=None, file_id=None):
+    @staticmethod
+    def get_stats_filter(start_date=None, end_date=None, file_id=None):
         """
-        Get global statistics by module for all quiz answers.
-        
+        Builds the filter of the report queries over QUIZ_STATS (one row per evaluation, module and day).
+
         Args:
             start_date (str): Start date filter (YYYY-MM-DD)
             end_date (str): End date filter (YYYY-MM-DD)
             file_id (int): File ID filter for specific quiz
-            
+
         Returns:
-            pd.DataFrame: DataFrame with module statistics
+            tuple: (SQL condition starting with AND, or empty; bind parameters)
         """
-        query = """
-            SELECT 
-                q.MODULE_NAME,
-                COUNT(DISTINCT qa.EVALUATION_NAME) as TOTAL_EVALUATIONS,
-                COUNT(*) as TOTAL_QUESTIONS,
-                SUM(qa.IS_CORRECT) as CORRECT_ANSWERS,
-                ROUND(SUM(qa.IS_CORRECT) * 100.0 / COUNT(*), 2) as SCORE_PERCENTAGE
-            FROM QUIZ_ANSWERS qa
-            JOIN QUIZ q ON qa.QUIZ_ID = q.QUIZ_ID
-            WHERE qa.QUIZ_ANSWER_STATE <> 0
-        """
-        
-        params = {}
+        condition, params = "", {}
         if file_id:
-            query += " AND q.FILE_ID = :file_id"
+            condition += " AND qs.FILE_ID = :file_id"
             params["file_id"] = file_id
         if start_date:
-            query += " AND qa.QUIZ_ANSWER_DATE >= TO_DATE(:start_date, 'YYYY-MM-DD')"
+            condition += " AND qs.ANSWER_DAY >= TO_DATE(:start_date, 'YYYY-MM-DD')"
             params["start_date"] = start_date
         if end_date:
-            query += " AND qa.QUIZ_ANSWER_DATE < TO_DATE(:end_date, 'YYYY-MM-DD') + 1"
+            condition += " AND qs.ANSWER_DAY <= TO_DATE(:end_date, 'YYYY-MM-DD')"
             params["end_date"] = end_date
+        return condition, params
+
+    def get_global_module_stats(self, start_date=None, end_date=None, file_id=None):
+        """
+        Get global statistics by module for all quiz answers (from the QUIZ_STATS summary).
         
-        query += """
-            GROUP BY q.MODULE_NAME
+        Args:
+            start_date (str): Start date filter (YYYY-MM-DD)
+            end_date (str): End date filter (YYYY-MM-DD)
+            file_id (int): File ID filter for specific quiz
+            
+        Returns:
+            pd.DataFrame: DataFrame with module statistics
+        """
+        condition, params = QuizService.get_stats_filter(start_date, end_date, file_id)
+        query = f"""
+            SELECT 
+                qs.MODULE_NAME,
+                COUNT(DISTINCT qs.EVALUATION_NAME) as TOTAL_EVALUATIONS,
+                SUM(qs.TOTAL_ANSWERS) as TOTAL_QUESTIONS,
+                SUM(qs.CORRECT_ANSWERS) as CORRECT_ANSWERS,
+                ROUND(SUM(qs.CORRECT_ANSWERS) * 100.0 / SUM(qs.TOTAL_ANSWERS), 2) as SCORE_PERCENTAGE
+            FROM QUIZ_STATS qs
+            WHERE 1 = 1 {condition}
+            GROUP BY qs.MODULE_NAME
             ORDER BY SCORE_PERCENTAGE DESC
         """
         
@@ -492,7 +775,8 @@ class QuizService:
     
     def get_top_evaluations_ranking(self, limit=5, start_date=None, end_date=None, file_id=None):
         """
-        Get top evaluations ranking by score (individual evaluations, not grouped by user).
+        Get top evaluations ranking by score (individual evaluations, not grouped by user),
+        from the QUIZ_STATS summary.
         
         Args:
             limit (int): Number of top evaluations to return
@@ -503,34 +787,21 @@ class QuizService:
         Returns:
             pd.DataFrame: DataFrame with top evaluations
         """
-        query = """
+        condition, params = QuizService.get_stats_filter(start_date, end_date, file_id)
+        params["limit"] = limit
+        query = f"""
             SELECT 
-                qa.EVALUATION_NAME,
+                qs.EVALUATION_NAME,
                 u.USER_USERNAME,
                 u.USER_NAME || ', ' || u.USER_LAST_NAME as FULL_NAME,
-                COUNT(*) as TOTAL_QUESTIONS,
-                SUM(qa.IS_CORRECT) as CORRECT_ANSWERS,
-                ROUND(SUM(qa.IS_CORRECT) * 100.0 / COUNT(*), 2) as SCORE,
-                MIN(qa.QUIZ_ANSWER_DATE) as EVALUATION_DATE
-            FROM QUIZ_ANSWERS qa
-            JOIN USERS u ON qa.USER_ID = u.USER_ID
-            JOIN QUIZ q ON qa.QUIZ_ID = q.QUIZ_ID
-            WHERE qa.QUIZ_ANSWER_STATE <> 0
-        """
-        
-        params = {"limit": limit}
-        if file_id:
-            query += " AND q.FILE_ID = :file_id"
-            params["file_id"] = file_id
-        if start_date:
-            query += " AND qa.QUIZ_ANSWER_DATE >= TO_DATE(:start_date, 'YYYY-MM-DD')"
-            params["start_date"] = start_date
-        if end_date:
-            query += " AND qa.QUIZ_ANSWER_DATE < TO_DATE(:end_date, 'YYYY-MM-DD') + 1"
-            params["end_date"] = end_date
-        
-        query += """
-            GROUP BY qa.EVALUATION_NAME, u.USER_USERNAME, u.USER_NAME, u.USER_LAST_NAME
+                SUM(qs.TOTAL_ANSWERS) as TOTAL_QUESTIONS,
+                SUM(qs.CORRECT_ANSWERS) as CORRECT_ANSWERS,
+                ROUND(SUM(qs.CORRECT_ANSWERS) * 100.0 / SUM(qs.TOTAL_ANSWERS), 2) as SCORE,
+                MIN(qs.FIRST_ANSWER_DATE) as EVALUATION_DATE
+            FROM QUIZ_STATS qs
+            JOIN USERS u ON qs.USER_ID = u.USER_ID
+            WHERE 1 = 1 {condition}
+            GROUP BY qs.EVALUATION_NAME, u.USER_USERNAME, u.USER_NAME, u.USER_LAST_NAME
             ORDER BY SCORE DESC, TOTAL_QUESTIONS DESC
             FETCH FIRST :limit ROWS ONLY
         """
@@ -539,7 +810,8 @@ class QuizService:
     
     def get_quiz_summary_stats(self, start_date=None, end_date=None, file_id=None):
         """
-        Get summary statistics for all quizzes.
+        Get summary statistics for all quizzes (from the QUIZ_STATS summary).
+        The global average weights each evaluation score by its answers.
         
         Args:
             start_date (str): Start date filter (YYYY-MM-DD)
@@ -549,52 +821,47 @@ class QuizService:
         Returns:
             dict: Dictionary with summary statistics
         """
-        query = """
+        condition, params = QuizService.get_stats_filter(start_date, end_date, file_id)
+        query = f"""
             WITH evaluation_scores AS (
                 SELECT 
-                    qa.EVALUATION_NAME,
-                    COUNT(*) as QUESTIONS_IN_EVAL,
-                    SUM(qa.IS_CORRECT) as CORRECT_IN_EVAL,
-                    ROUND(SUM(qa.IS_CORRECT) * 100.0 / COUNT(*), 2) as EVAL_SCORE
-                FROM QUIZ_ANSWERS qa
-                JOIN QUIZ q ON qa.QUIZ_ID = q.QUIZ_ID
-                WHERE qa.QUIZ_ANSWER_STATE <> 0
-        """
-        
-        params = {}
-        if file_id:
-            query += " AND q.FILE_ID = :file_id"
-            params["file_id"] = file_id
-        if start_date:
-            query += " AND qa.QUIZ_ANSWER_DATE >= TO_DATE(:start_date, 'YYYY-MM-DD')"
-            params["start_date"] = start_date
-        if end_date:
-            query += " AND qa.QUIZ_ANSWER_DATE < TO_DATE(:end_date, 'YYYY-MM-DD') + 1"
-            params["end_date"] = end_date
-        
-        query += """
-                GROUP BY qa.EVALUATION_NAME
+                    qs.USER_ID,
+                    qs.EVALUATION_NAME,
+                    SUM(qs.TOTAL_ANSWERS) as QUESTIONS_IN_EVAL,
+                    SUM(qs.CORRECT_ANSWERS) as CORRECT_IN_EVAL,
+                    ROUND(SUM(qs.CORRECT_ANSWERS) * 100.0 / SUM(qs.TOTAL_ANSWERS), 2) as EVAL_SCORE
+                FROM QUIZ_STATS qs
+                WHERE 1 = 1 {condition}
+                GROUP BY qs.USER_ID, qs.EVALUATION_NAME
             )
             SELECT 
-                COUNT(DISTINCT qa.USER_ID) as TOTAL_USERS,
-                COUNT(DISTINCT qa.EVALUATION_NAME) as TOTAL_EVALUATIONS,
-                COUNT(*) as TOTAL_QUESTIONS_ANSWERED,
-                SUM(qa.IS_CORRECT) as TOTAL_CORRECT,
-                ROUND(AVG(es.EVAL_SCORE), 2) as GLOBAL_AVG_SCORE
-            FROM QUIZ_ANSWERS qa
-            JOIN QUIZ q ON qa.QUIZ_ID = q.QUIZ_ID
-            JOIN evaluation_scores es ON qa.EVALUATION_NAME = es.EVALUATION_NAME
-            WHERE qa.QUIZ_ANSWER_STATE <> 0
+                COUNT(DISTINCT es.USER_ID) as TOTAL_USERS,
+                COUNT(DISTINCT es.EVALUATION_NAME) as TOTAL_EVALUATIONS,
+                SUM(es.QUESTIONS_IN_EVAL) as TOTAL_QUESTIONS_ANSWERED,
+                SUM(es.CORRECT_IN_EVAL) as TOTAL_CORRECT,
+                ROUND(SUM(es.EVAL_SCORE * es.QUESTIONS_IN_EVAL) / NULLIF(SUM(es.QUESTIONS_IN_EVAL), 0), 2) as GLOBAL_AVG_SCORE
+            FROM evaluation_scores es
         """
         
-        if file_id:
-            query += " AND q.FILE_ID = :file_id"
-        if start_date:
-            query += " AND qa.QUIZ_ANSWER_DATE >= TO_DATE(:start_date, 'YYYY-MM-DD')"
-        if end_date:
-            query += " AND qa.QUIZ_ANSWER_DATE < TO_DATE(:end_date, 'YYYY-MM-DD') + 1"
-        
         df = pd.read_sql(query, con=self.conn, params=params if params else None)
         if not df.empty:
             return df.iloc[0].to_dict()
         return {}
+
+    def reconcile_quiz_stats(self):
+        """
+        Checks the QUIZ_STATS summary against QUIZ_ANSWERS (answer and correct counts
+        per evaluation) and recomputes the evaluations that do not match. It aggregates
+        all of QUIZ_ANSWERS: JOB_QUIZ_STATS_RECONCILE runs it hourly, call it only as an admin action.
+
+        Returns:
+            int: The number of evaluations that were out of date.
+        """
+        with self.conn.cursor() as cur:
+            refreshed = cur.var(oracledb.NUMBER)
+            cur.callproc("SP_QUIZ_STATS_RECONCILE", [refreshed])
+        self.conn.commit()
+        refreshed = int(refreshed.getvalue() or 0)
+        if refreshed:
+            print(f"[Quiz] Reconciliation: {refreshed} evaluation(s) recomputed in QUIZ_STATS")
+        return refreshed
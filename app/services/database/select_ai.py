@@ -1,7 +1,22 @@
+import os
+import re
+import time
 import streamlit as st
 import pandas as pd
 import oracledb
+from dotenv import load_dotenv
 from services.database.connection import Connection
+from services.database.select_ai_cache import SelectAICacheService
+import utils as utils
+
+load_dotenv()
+
+# --- Generated SQL execution limits ---
+SQL_MAX_ROWS        = int(os.getenv('CON_SELECT_AI_SQL_MAX_ROWS', '10000'))
+SQL_CALL_TIMEOUT_MS = int(os.getenv('CON_SELECT_AI_SQL_CALL_TIMEOUT_MS', '30000'))
+SQL_ARRAYSIZE       = int(os.getenv('CON_SELECT_AI_SQL_ARRAYSIZE', '1000'))
+SQL_POOL_MAX        = int(os.getenv('CON_SELECT_AI_SQL_POOL_MAX', '4'))
+# --------------------------------------
 
 class SelectAIService:
     """
@@ -13,6 +28,7 @@ class SelectAIService:
         Initializes the SelectAIService with a shared database connection.
         """
         self.conn_instance = Connection()
+        self.cache_service = SelectAICacheService()
 
     @property
     def conn(self):
@@ -199,6 +215,121 @@ class SelectAIService:
                 ADD CONSTRAINT {constraint_name} PRIMARY KEY ({columns_str})
             """)
         self.conn.commit()
+
+    @staticmethod
+    def get_data_dictionary_ddl(
+            table_name,
+            comment_data_editor=None,
+            file_description=None
+        ):
+        """
+        Builds the DDL of a table's data dictionary: column comments, column
+        annotations (UI_Display, Classification; one statement per column),
+        the table annotation and the primary key.
+
+        Args:
+            table_name (str): The name of the table.
+            comment_data_editor (pd.DataFrame, optional): Rows with "Column Name", "Comment",
+                "UI_Display", "Classification" and "Primary Key".
+            file_description (str, optional): Value of the table UI_Display annotation.
+
+        Returns:
+            dict: statements (list of str) and the number of comments, annotations and primary key columns.
+        """
+        quote      = lambda value: "'" + str(value).replace("'", "''") + "'"
+        statements = []
+        comments, annotations, pk_columns = 0, 0, []
+
+        rows = comment_data_editor.to_dict("records") if comment_data_editor is not None and not comment_data_editor.empty else []
+        for row in rows:
+            column_name = row["Column Name"]
+
+            comment = str(row.get("Comment") or "").strip()
+            if comment:
+                statements.append(f"COMMENT ON COLUMN {table_name}.{column_name} IS {quote(row['Comment'])}")
+                comments += 1
+
+            clauses = [
+                f"ADD {name} {quote(row[name])}"
+                for name in ("UI_Display", "Classification")
+                if str(row.get(name) or "").strip()
+            ]
+            if clauses:
+                statements.append(f"ALTER TABLE {table_name} MODIFY ({column_name} ANNOTATIONS ({', '.join(clauses)}))")
+                annotations += len(clauses)
+
+            if row.get("Primary Key", False):
+                pk_columns.append(column_name)
+
+        if file_description and file_description.strip():
+            statements.append(f"ALTER TABLE {table_name} ANNOTATIONS (ADD UI_Display {quote(file_description)})")
+
+        if pk_columns:
+            constraint_name = f"PK_{table_name.split('.')[-1]}"
+            statements.append(f"ALTER TABLE {table_name} ADD CONSTRAINT {constraint_name} PRIMARY KEY ({', '.join(pk_columns)})")
+
+        return {
+            "statements"  : statements,
+            "comments"    : comments,
+            "annotations" : annotations,
+            "pk_columns"  : pk_columns
+        }
+
+    def apply_data_dictionary(
+            self,
+            table_name,
+            statements
+        ):
+        """
+        Runs DDL statements in a single PL/SQL block (one round trip) and refreshes
+        the catalog snapshot of the table (SEL_AI_CATALOG) in the same block.
+        Each statement is bound, so values never need to be inlined in the block.
+
+        Args:
+            table_name (str): The name of the table, with schema.
+            statements (list): The DDL statements, in order.
+
+        Returns:
+            dict: statements (count) and elapsed_ms.
+        """
+        start_time = time.perf_counter()
+        steps = "\n".join(
+            f"l_step := {position}; EXECUTE IMMEDIATE :s{position};"
+            for position in range(1, len(statements) + 1)
+        )
+        with self.conn.cursor() as cur:
+            cur.execute(
+                f"""
+                DECLARE
+                    l_step PLS_INTEGER := 0;
+                BEGIN
+                    {steps}
+                    l_step := 0;
+                    SP_SEL_AI_CATALOG(:table_name);
+                EXCEPTION
+                    WHEN OTHERS THEN
+                        RAISE_APPLICATION_ERROR(-20001, 'Data dictionary statement ' || l_step || ': ' || SQLERRM);
+                END;
+                """,
+                {"table_name": table_name, **{f"s{position}": statement for position, statement in enumerate(statements, start=1)}}
+            )
+        self.conn.commit()
+
+        return {
+            "statements" : len(statements),
+            "elapsed_ms" : (time.perf_counter() - start_time) * 1000
+        }
+
+    def refresh_catalog(self, table_name):
+        """
+        Refreshes the catalog snapshot (SEL_AI_CATALOG) of a single table.
+
+        Args:
+            table_name (str): The name of the table, with schema.
+        """
+        with self.conn.cursor() as cur:
+            cur.callproc("SP_SEL_AI_CATALOG", [table_name])
+        self.conn.commit()
     
     def create_table_from_csv(
             self,
@@ -242,6 +373,40 @@ class SelectAIService:
             cur.execute(query)
         self.conn.commit()
     
+    @staticmethod
+    def get_messages(language):
+        """
+        Returns the messages of a language (simple and direct).
+
+        Args:
+            language (str): The response language (Spanish, Portuguese or English).
+
+        Returns:
+            tuple: (message when no valid SQL could be generated, prefix of error messages,
+                message when the SQL returned no rows)
+        """
+        language_messages = {
+            "Spanish": (
+                "Lo siento, no se pudo generar una sentencia SQL válida para tu solicitud. "
+                "Revisa la consulta e inténtalo de nuevo.",
+                "Error al generar la respuesta: ",
+                "Lo siento, la consulta no devolvió filas para tu solicitud."
+            ),
+            "Portuguese": (
+                "Desculpe, não foi possível gerar uma instrução SQL válida para sua solicitação. "
+                "Revise a consulta e tente novamente.",
+                "Erro ao gerar a resposta: ",
+                "Desculpe, a consulta não retornou linhas para sua solicitação."
+            ),
+            "English": (
+                "Sorry, a valid SQL statement could not be generated for your request. "
+                "Please review your query and try again.",
+                "Error while generating the response: ",
+                "Sorry, the query returned no rows for your request."
+            )
+        }
+        return language_messages.get(language, language_messages["English"])
+
     def get_chat(
             self,
             prompt,
@@ -279,61 +444,25 @@ class SelectAIService:
                 f"{prompt} /** {base_instructions} **/"
             )
 
-        # Messages by language (simple and direct)
-        language_messages = {
-            "Spanish": (
-                "Lo siento, no se pudo generar una sentencia SQL válida para tu solicitud. "
-                "Revisa la consulta e inténtalo de nuevo.",
-                "Error al generar la respuesta: "
-            ),
-            "Portuguese": (
-                "Desculpe, não foi possível gerar uma instrução SQL válida para sua solicitação. "
-                "Revise a consulta e tente novamente.",
-                "Erro ao gerar a resposta: "
-            ),
-            "English": (
-                "Sorry, a valid SQL statement could not be generated for your request. "
-                "Please review your query and try again.",
-                "Error while generating the response: "
-            )
-        }
-        fallback_sorry, error_prefix = language_messages.get(
+        fallback_sorry, error_prefix, _ = SelectAIService.get_messages(language)
+
+        # Cached response, or a PL/SQL block that captures exceptions and returns the CLOB as is
+        cache_key = SelectAICacheService.get_key(
+            SelectAICacheService.SCOPE_SELECT_AI,
+            profile_name,
+            action,
             language,
-            language_messages["English"]
+            prompt,
+            prompt_extra
+        )
+        response = self.cache_service.generate(
+            cache_key,
+            SelectAICacheService.SCOPE_SELECT_AI,
+            prompt_with_instructions,
+            profile_name,
+            action,
+            error_prefix=error_prefix
         )
-
-        # Execute a PL/SQL block that captures exceptions and returns the CLOB as is
-        with self.conn.cursor() as cur:
-            response_var = cur.var(oracledb.CLOB)
-            cur.execute(
-                """
-                DECLARE
-                    l_sql CLOB;
-                BEGIN
-                    BEGIN
-                        l_sql := DBMS_CLOUD_AI.GENERATE(
-                            prompt       => :prompt_text,
-                            profile_name => :profile_name,
-                            action       => :action
-                        );
-                        :out_response := l_sql;
-                    EXCEPTION
-                        WHEN OTHERS THEN
-                            :out_response := :error_prefix || SQLERRM;
-                    END;
-                END;
-                """,
-                prompt_text=prompt_with_instructions,
-                profile_name=profile_name,
-                action=action,
-                error_prefix=error_prefix,
-                out_response=response_var
-            )
-
-            response = response_var.getvalue()
-            if isinstance(response, oracledb.LOB):
-                response = response.read()
-            response = response or ""
 
         # If Select AI returned the 'Sorry...' message, replace it with the localized message
         generic_sorry = "Sorry, unfortunately a valid SELECT statement could not be generated"
@@ -342,6 +471,72 @@ class SelectAIService:
 
         return response
     
+    def get_cache_version(self, profile_name):
+        """
+        Returns the SELECT_AI cache version of a profile; it changes when the
+        profile is recreated or one of its tables is reloaded, so SQL generated
+        for the profile can be keyed by it.
+        """
+        return self.cache_service.get_version(SelectAICacheService.SCOPE_SELECT_AI, profile_name)
+
+    def get_chat_from_sql(
+            self,
+            prompt,
+            sql,
+            profile_name,
+            action,
+            language
+        ):
+        """
+        Answers an action from an already generated SQL statement, so the SQL is
+        not generated again by Select AI. The statement is executed here (get_data);
+        a Select AI error instead of SQL, a failed query or an empty result is
+        returned as a localized error message, never narrated.
+
+        Args:
+            prompt (str): The user's message.
+            sql (str): The SQL generated for the prompt (action 'showsql'), or the Select AI error message.
+            profile_name (str): The Select AI profile name.
+            action (str): The action to answer (narrate, showsql, explainsql, runsql).
+            language (str): The response language.
+
+        Returns:
+            tuple: (response, pd.DataFrame with the result of the SQL, empty when it did not run)
+        """
+        fallback_sorry, error_prefix, empty_result = SelectAIService.get_messages(language)
+        if sql.startswith(("Sorry,", fallback_sorry, error_prefix)):
+            return sql, pd.DataFrame()
+
+        try:
+            df = self.get_data(sql)
+        except Exception as e:
+            return f"{error_prefix}{e}", pd.DataFrame()
+
+        if action == "showsql":
+            return sql, df
+
+        if action == "runsql":
+            return df.to_json(orient="records", force_ascii=False), df
+
+        if action == "explainsql":
+            explain_prompt = (
+                f"Explain step by step what the following SQL statement does to answer the question "
+                f"\"{prompt}\". SQL: {sql}"
+            )
+            return self.get_chat(explain_prompt, profile_name, "chat", language), df
+
+        if df.empty:
+            return empty_result, df
+
+        # narrate: answer the question from the rows returned by the statement
+        total_rows        = f"more than {len(df)}" if df.attrs.get("truncated") else len(df)
+        prompt_data, mode = utils.DataProfileService.get_prompt_data(df)
+        narrate_prompt    = (
+            f"Answer the question \"{prompt}\" in natural language using only this query result "
+            f"({total_rows} rows, given as {'CSV' if mode == 'rows' else 'a profile'}):\n{prompt_data}"
+        )
+        return self.get_chat(narrate_prompt, profile_name, "chat", language), df
+    
     def get_tables_cache(self, user_id, force_update=False):
         if force_update:
             # Clear function cache
@@ -353,10 +548,43 @@ class SelectAIService:
         """
         Retrieves metadata for tables associated with the Select AI module.
 
+        Reads the catalog snapshot (SEL_AI_CATALOG) instead of the dictionary views.
+        Tables missing from the snapshot, or changed since it was taken
+        (LAST_DDL_TIME), are refreshed first, one table at a time.
+
         Returns:
             pd.DataFrame: A DataFrame containing table metadata, including columns, comments, and annotations.
         """
-        query = f"""
+        with _self.conn.cursor() as cur:
+            cur.execute("""
+                BEGIN
+                    FOR t IN (
+                        SELECT F.FILE_TRG_OBJ_NAME
+                        FROM FILES F
+                        JOIN FILE_USER FU ON F.FILE_ID = FU.FILE_ID
+                        JOIN all_objects o
+                            ON o.owner = UPPER(SUBSTR(F.FILE_TRG_OBJ_NAME, 1, INSTR(F.FILE_TRG_OBJ_NAME, '.') - 1))
+                            AND o.object_name = UPPER(SUBSTR(F.FILE_TRG_OBJ_NAME, INSTR(F.FILE_TRG_OBJ_NAME, '.') + 1))
+                            AND o.object_type = 'TABLE'
+                        WHERE 
+                            F.MODULE_ID = 1 
+                            AND F.FILE_STATE = 1 
+                            AND FU.USER_ID = :user_id
+                            AND NOT EXISTS (
+                                SELECT 1
+                                FROM sel_ai_catalog c
+                                WHERE c.owner = o.owner
+                                  AND c.table_name = o.object_name
+                                  AND c.last_ddl_time >= o.last_ddl_time
+                            )
+                    ) LOOP
+                        SP_SEL_AI_CATALOG(t.FILE_TRG_OBJ_NAME);
+                    END LOOP;
+                END;
+            """, user_id=user_id)
+        _self.conn.commit()
+
+        query = """
             WITH user_tables AS (
                 SELECT 
                     UPPER(SUBSTR(F.FILE_TRG_OBJ_NAME, 1, INSTR(F.FILE_TRG_OBJ_NAME, '.') - 1)) AS owner,
@@ -366,54 +594,72 @@ class SelectAIService:
                 WHERE 
                     F.MODULE_ID = 1 
                     AND F.FILE_STATE = 1 
-                    AND FU.USER_ID = {user_id}
-            ),
-            annotations_pivot AS (
-                SELECT 
-                    object_name,
-                    column_name,
-                    annotation_owner,
-                    MAX(CASE WHEN annotation_name = 'UI_DISPLAY' THEN annotation_value END) AS ui_display,
-                    MAX(CASE WHEN annotation_name = 'CLASSIFICATION' THEN annotation_value END) AS classification
-                FROM all_annotations_usage
-                WHERE object_type = 'TABLE'
-                AND column_name IS NOT NULL
-                GROUP BY object_name, column_name, annotation_owner
+                    AND FU.USER_ID = :user_id
             )
             SELECT 
-                t.owner,
-                t.table_name,
+                c.owner,
+                c.table_name,
                 c.column_name,
                 c.data_type,
-                cc.comments,
-                ap.ui_display,
-                ap.classification
+                c.comments,
+                c.ui_display,
+                c.classification
             FROM 
-                all_tables t
+                sel_ai_catalog c
             JOIN 
-                all_tab_columns c
-                ON t.table_name = c.table_name AND t.owner = c.owner
-            LEFT JOIN 
-                all_col_comments cc
-                ON c.table_name = cc.table_name 
-                AND c.owner = cc.owner 
-                AND c.column_name = cc.column_name
-            LEFT JOIN 
-                annotations_pivot ap
-                ON c.owner = ap.annotation_owner
-                AND c.column_name = ap.column_name
-            WHERE 
-                (UPPER(t.owner), UPPER(t.table_name)) IN (SELECT owner, table_name FROM user_tables)
+                user_tables t
+                ON c.owner = t.owner AND c.table_name = t.table_name
             ORDER BY 
-                t.owner, t.table_name, c.column_id
+                c.owner, c.table_name, c.column_id
         """
-        return pd.read_sql(query, con=_self.conn)
+        return pd.read_sql(query, con=_self.conn, params={"user_id": user_id})
 
-    def get_data(self, sql):
+    def get_data(self, sql, max_rows=None):
         """
-        Executes the received SQL and returns the complete DataFrame without modifications.
+        Executes the received (LLM-generated) SQL with guards: only queries are
+        accepted, at most `max_rows` rows are fetched and the call is bounded by
+        a timeout, so one careless statement cannot pin a connection or load
+        a whole table into memory. The statement runs on a pooled connection
+        (CON_SELECT_AI_SQL_POOL_MAX), whose timeout does not affect the shared one.
+
+        Args:
+            sql (str): The query to execute.
+            max_rows (int, optional): Row limit. Defaults to CON_SELECT_AI_SQL_MAX_ROWS.
+
+        Returns:
+            pd.DataFrame: The result; `df.attrs` holds `truncated`, `row_limit` and `elapsed_ms`.
+
+        Raises:
+            ValueError: If the statement is not a query.
+            oracledb.Error: If the query fails or exceeds CON_SELECT_AI_SQL_CALL_TIMEOUT_MS.
         """
-        try:
-            return pd.read_sql(sql, con=self.conn)
-        except Exception:
-            return pd.DataFrame()
\ No newline at end of file
+        max_rows = max_rows or SQL_MAX_ROWS
+        sql      = (sql or "").strip().rstrip(";").strip()
+        if not re.match(r"^(SELECT|WITH)\b", sql, re.IGNORECASE):
+            raise ValueError("Only queries (SELECT or WITH) can be executed.")
+
+        def output_type_handler(cursor, metadata):
+            # Fetch LOBs as strings, like pd.read_sql would show them
+            if metadata.type_code is oracledb.DB_TYPE_CLOB:
+                return cursor.var(oracledb.DB_TYPE_LONG, arraysize=cursor.arraysize)
+            if metadata.type_code is oracledb.DB_TYPE_BLOB:
+                return cursor.var(oracledb.DB_TYPE_LONG_RAW, arraysize=cursor.arraysize)
+
+        start_time = time.perf_counter()
+        pool       = self.conn_instance.get_pool(SQL_POOL_MAX, SQL_CALL_TIMEOUT_MS)
+        with pool.acquire() as conn:
+            conn.call_timeout = SQL_CALL_TIMEOUT_MS
+            with conn.cursor() as cur:
+                cur.arraysize         = SQL_ARRAYSIZE
+                cur.prefetchrows      = SQL_ARRAYSIZE + 1
+                cur.outputtypehandler = output_type_handler
+                cur.execute(sql)
+                columns = [column[0] for column in cur.description]
+                # One extra row tells whether the result was truncated
+                rows    = cur.fetchmany(max_rows + 1)
+
+        df = pd.DataFrame.from_records(rows[:max_rows], columns=columns, coerce_float=True)
+        df.attrs["truncated"]  = len(rows) > max_rows
+        df.attrs["row_limit"]  = max_rows
+        df.attrs["elapsed_ms"] = (time.perf_counter() - start_time) * 1000
+        return df
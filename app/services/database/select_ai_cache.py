@@ -0,0 +1,264 @@
+import os
+import re
+import json
+import hashlib
+import threading
+import oracledb
+import pandas as pd
+from dotenv import load_dotenv
+from services.database.connection import Connection
+
+load_dotenv()
+
+# --- Cache Configuration ---
+CACHE_TTL_SECONDS     = int(os.getenv('CON_SELECT_AI_CACHE_TTL_SECONDS', '3600'))
+CACHE_RAG_TTL_SECONDS = int(os.getenv('CON_SELECT_AI_RAG_CACHE_TTL_SECONDS', '60'))
+
+# Generic Select AI failure text, never cached
+CACHE_SKIP_PREFIX = "Sorry, unfortunately"
+# ---------------------------
+
+class SelectAICacheService:
+    """
+    Service class for the Select AI response cache (table SEL_AI_CACHE).
+
+    Responses of DBMS_CLOUD_AI.GENERATE are stored in the database, so every
+    worker shares them. Entries are keyed by profile, action, language and the
+    normalized prompt, and are only valid for the current version of their
+    scope and profile (SEL_AI_CACHE_VERSION). SP_SEL_AI_CACHE_INVALIDATE bumps
+    it when a profile is recreated, and SP_SEL_AI_CACHE_INVALIDATE_TABLE bumps
+    the profiles that include a reloaded table, so other users keep their entries.
+    """
+    SCOPE_SELECT_AI     = "SELECT_AI"
+    SCOPE_SELECT_AI_RAG = "SELECT_AI_RAG"
+
+    _stats_lock = threading.Lock()
+    _stats      = {"hits": 0, "misses": 0}
+
+    def __init__(self):
+        """
+        Initializes the SelectAICacheService with a shared database connection.
+        """
+        self.conn_instance = Connection()
+
+    @property
+    def conn(self):
+        """
+        Property that always returns a valid database connection.
+        Ensures reconnection if the connection was dropped.
+        """
+        return self.conn_instance.get_connection()
+
+    @staticmethod
+    def get_key(scope, profile_name, action, language, prompt, prompt_extra=None):
+        """
+        Builds the cache key of a request.
+
+        Args:
+            scope (str)                  : The cache scope (SELECT_AI or SELECT_AI_RAG).
+            profile_name (str)           : The Select AI profile name.
+            action (str)                 : The Select AI action.
+            language (str)               : The response language.
+            prompt (str)                 : The user's message, normalized before hashing.
+            prompt_extra (str, optional) : Additional instructions for the model.
+
+        Returns:
+            str: A hex digest identifying the response.
+        """
+        normalize = lambda text: re.sub(r"\s+", " ", (text or "")).strip().casefold()
+        payload   = json.dumps(
+            [scope, profile_name.upper(), action.lower(), language, normalize(prompt), normalize(prompt_extra)],
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get_version(self, scope, profile_name):
+        """
+        Returns the current cache version of a scope and profile (1 until it is first invalidated).
+
+        Args:
+            scope (str)        : The cache scope (SELECT_AI or SELECT_AI_RAG).
+            profile_name (str) : The Select AI profile name.
+
+        Returns:
+            int: The version entries of the profile must match.
+        """
+        with self.conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT NVL(MAX(cache_version), 1)
+                  FROM sel_ai_cache_version
+                 WHERE cache_scope  = :cache_scope
+                   AND profile_name = UPPER(:profile_name)
+                """,
+                cache_scope=scope,
+                profile_name=profile_name
+            )
+            row = cur.fetchone()
+        return int(row[0])
+
+    def generate(
+            self,
+            cache_key,
+            scope,
+            prompt_text,
+            profile_name,
+            action,
+            error_prefix=None,
+            ttl_seconds=CACHE_TTL_SECONDS,
+            no_cache_marker=None
+        ):
+        """
+        Returns the cached response of a request, or runs DBMS_CLOUD_AI.GENERATE
+        and caches its response. Lookup, generation and store happen in a single round trip.
+        Empty responses and the generic "Sorry, unfortunately..." failure are never cached.
+
+        Args:
+            cache_key (str)                 : The key built with get_key.
+            scope (str)                     : The cache scope (SELECT_AI or SELECT_AI_RAG).
+            prompt_text (str)               : The full prompt sent to Select AI.
+            profile_name (str)              : The Select AI profile name.
+            action (str)                    : The Select AI action.
+            error_prefix (str, optional)    : When given, errors are returned as `error_prefix || SQLERRM`
+                                              (and not cached) instead of being raised.
+            ttl_seconds (int, optional)     : Seconds a stored response stays valid.
+            no_cache_marker (str, optional) : Responses containing it (e.g. a no-answer reply) are not cached.
+
+        Returns:
+            str: The response.
+        """
+        with self.conn.cursor() as cur:
+            response_var = cur.var(oracledb.CLOB)
+            hit_var      = cur.var(oracledb.NUMBER)
+            cur.execute(
+                """
+                DECLARE
+                    l_version  NUMBER;
+                    l_response CLOB;
+                BEGIN
+                    SELECT NVL(MAX(cache_version), 1) INTO l_version
+                      FROM sel_ai_cache_version
+                     WHERE cache_scope  = :cache_scope
+                       AND profile_name = UPPER(:profile_name);
+
+                    BEGIN
+                        SELECT response INTO l_response
+                          FROM sel_ai_cache
+                         WHERE cache_key     = :cache_key
+                           AND cache_version = l_version
+                           AND cache_expires > SYSTIMESTAMP;
+
+                        UPDATE sel_ai_cache SET cache_hits = cache_hits + 1 WHERE cache_key = :cache_key;
+                        :out_hit := 1;
+                    EXCEPTION
+                        WHEN NO_DATA_FOUND THEN
+                            :out_hit := 0;
+                            BEGIN
+                                l_response := DBMS_CLOUD_AI.GENERATE(
+                                    prompt       => :prompt_text,
+                                    profile_name => :profile_name,
+                                    action       => :action
+                                );
+                            EXCEPTION
+                                WHEN OTHERS THEN
+                                    IF :error_prefix IS NULL THEN
+                                        RAISE;
+                                    END IF;
+                                    :out_response := :error_prefix || SQLERRM;
+                                    RETURN;
+                            END;
+
+                            /* Failures and no-answer replies are returned but not stored */
+                            IF l_response IS NULL
+                               OR DBMS_LOB.SUBSTR(l_response, LENGTH(:skip_prefix), 1) = :skip_prefix
+                               OR (:no_cache_marker IS NOT NULL AND DBMS_LOB.INSTR(l_response, :no_cache_marker) > 0) THEN
+                                :out_response := l_response;
+                                RETURN;
+                            END IF;
+
+                            BEGIN
+                                MERGE INTO sel_ai_cache c
+                                USING (SELECT :cache_key AS cache_key FROM DUAL) s
+                                   ON (c.cache_key = s.cache_key)
+                                WHEN MATCHED THEN UPDATE SET
+                                    c.cache_version = l_version,
+                                    c.response      = l_response,
+                                    c.cache_hits    = 0,
+                                    c.cache_expires = SYSTIMESTAMP + NUMTODSINTERVAL(:ttl_seconds, 'SECOND'),
+                                    c.cache_date    = SYSDATE
+                                WHEN NOT MATCHED THEN INSERT
+                                    (cache_key, cache_scope, cache_version, profile_name, action, response, cache_expires)
+                                VALUES
+                                    (s.cache_key, :cache_scope, l_version, :profile_name, :action, l_response,
+                                     SYSTIMESTAMP + NUMTODSINTERVAL(:ttl_seconds, 'SECOND'));
+
+                                DELETE FROM sel_ai_cache WHERE cache_expires < SYSTIMESTAMP;
+                            EXCEPTION
+                                /* Stored concurrently by another worker */
+                                WHEN DUP_VAL_ON_INDEX THEN
+                                    NULL;
+                            END;
+                    END;
+
+                    :out_response := l_response;
+                END;
+                """,
+                cache_key=cache_key,
+                cache_scope=scope,
+                prompt_text=prompt_text,
+                profile_name=profile_name,
+                action=action,
+                error_prefix=error_prefix,
+                ttl_seconds=ttl_seconds,
+                skip_prefix=CACHE_SKIP_PREFIX,
+                no_cache_marker=no_cache_marker,
+                out_hit=hit_var,
+                out_response=response_var
+            )
+
+            response = response_var.getvalue()
+            if isinstance(response, oracledb.LOB):
+                response = response.read()
+            hit = hit_var.getvalue()
+
+        with SelectAICacheService._stats_lock:
+            SelectAICacheService._stats["hits" if hit else "misses"] += 1
+
+        return response or ""
+
+    @staticmethod
+    def get_stats():
+        """
+        Returns the hit-rate metrics of this process.
+
+        Returns:
+            dict: hits, misses and hit_rate (0-1).
+        """
+        with SelectAICacheService._stats_lock:
+            hits, misses = SelectAICacheService._stats["hits"], SelectAICacheService._stats["misses"]
+        lookups = hits + misses
+        return {
+            "hits"     : hits,
+            "misses"   : misses,
+            "hit_rate" : hits / lookups if lookups else 0.0
+        }
+
+    def get_table_stats(self):
+        """
+        Returns the cache usage of all workers, per scope and action.
+
+        Returns:
+            pd.DataFrame: Entries, stored hits and live entries per scope and action.
+        """
+        query = """
+            SELECT
+                cache_scope,
+                action,
+                COUNT(*)                                                  AS entries,
+                SUM(cache_hits)                                           AS hits,
+                SUM(CASE WHEN cache_expires > SYSTIMESTAMP THEN 1 END)    AS live_entries
+            FROM sel_ai_cache
+            GROUP BY cache_scope, action
+            ORDER BY cache_scope, action
+        """
+        return pd.read_sql(query, con=self.conn)
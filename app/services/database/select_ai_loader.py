@@ -0,0 +1,188 @@
+import io
+import os
+import re
+import time
+import oracledb
+import pandas as pd
+from dotenv import load_dotenv
+from services.database.connection import Connection
+
+load_dotenv()
+
+# --- CSV Loader Configuration ---
+# "procedure": SP_SEL_AI_TBL_CSV (apex_data_parser in the database), "client": CSVLoaderService
+CSV_LOADER     = os.getenv('CON_SELECT_AI_CSV_LOADER', 'procedure')
+CSV_BATCH_ROWS = int(os.getenv('CON_SELECT_AI_CSV_BATCH_ROWS', '20000'))
+# --------------------------------
+
+class CSVLoaderService:
+    """
+    Client-side bulk loader for Select AI CSV tables.
+
+    Alternative to SP_SEL_AI_TBL_CSV: the uploaded CSV is read in chunks,
+    column types are inferred locally (NUMBER, or VARCHAR2 sized to the
+    longest value, CLOB beyond 4000 bytes) and rows are inserted with
+    `executemany` array DML in large batches, instead of downloading and
+    parsing the object twice inside the database.
+    """
+
+    def __init__(self):
+        """
+        Initializes the CSVLoaderService with a shared database connection.
+        """
+        self.conn_instance = Connection()
+
+    @property
+    def conn(self):
+        """
+        Property that always returns a valid database connection.
+        Ensures reconnection if the connection was dropped.
+        """
+        return self.conn_instance.get_connection()
+
+    @staticmethod
+    def get_column_name(name):
+        """
+        Normalizes a CSV header like apex_data_parser does (upper case, invalid characters as '_').
+        """
+        return re.sub(r"[^A-Z0-9_$#]", "_", str(name).strip().upper())[:128] or "COLUMN"
+
+    @staticmethod
+    def get_numbers(series):
+        """
+        Parses a text column as numbers (thousand separators removed, as SP_SEL_AI_TBL_CSV does).
+        Values that are not numbers become NaN.
+        """
+        return pd.to_numeric(series.str.replace(",", "", regex=False).str.strip().replace("", None), errors="coerce")
+
+    @staticmethod
+    def get_columns(csv_content, chunk_rows=CSV_BATCH_ROWS):
+        """
+        Infers the columns of a CSV with one vectorized pass over its chunks.
+
+        Args:
+            csv_content (bytes) : The CSV file.
+            chunk_rows (int)    : Rows read per chunk.
+
+        Returns:
+            list: Dicts with `source` (header), `name`, `type` (NUMBER, VARCHAR2 or CLOB), `size` and `integer`.
+        """
+        columns = None
+        for chunk in pd.read_csv(io.BytesIO(csv_content), dtype=str, keep_default_na=False, chunksize=chunk_rows):
+            if columns is None:
+                columns = [
+                    {"source": source, "name": CSVLoaderService.get_column_name(source), "numeric": True, "integer": True, "size": 1}
+                    for source in chunk.columns
+                ]
+            for column in columns:
+                values  = chunk[column["source"]]
+                present = values.str.strip() != ""
+                column["size"] = max(column["size"], int(values.str.encode("utf-8").str.len().max() or 1))
+                if column["numeric"] and present.any():
+                    numbers = CSVLoaderService.get_numbers(values[present])
+                    column["numeric"] = bool(numbers.notna().all())
+                    column["integer"] = column["integer"] and column["numeric"] and bool((numbers % 1 == 0).all()) and bool((numbers.abs() < 2**53).all())
+
+        # Duplicated names after normalization get a positional suffix
+        seen = {}
+        for position, column in enumerate(columns or [], start=1):
+            if column["name"] in seen:
+                column["name"] = f"{column['name'][:120]}_{position}"
+            seen[column["name"]] = True
+            column["type"] = "NUMBER" if column["numeric"] else "VARCHAR2" if column["size"] <= 4000 else "CLOB"
+        return columns or []
+
+    def create_table(
+            self,
+            table_name,
+            csv_content,
+            batch_rows=CSV_BATCH_ROWS
+        ):
+        """
+        Creates (or recreates) a table from a CSV and loads its rows in batches.
+
+        Args:
+            table_name (str)    : Table name with schema (e.g., SEL_AI_USER_ID_1.EMPLOYEES).
+            csv_content (bytes) : The CSV file.
+            batch_rows (int)    : Rows per executemany batch.
+
+        Returns:
+            dict: rows, columns, elapsed_seconds and rows_per_second.
+        """
+        start_time = time.perf_counter()
+        columns    = CSVLoaderService.get_columns(csv_content, batch_rows)
+
+        definitions = ", ".join(
+            f'"{column["name"]}" ' + (
+                "NUMBER" if column["type"] == "NUMBER"
+                else f'VARCHAR2({column["size"]} BYTE)' if column["type"] == "VARCHAR2"
+                else "CLOB"
+            )
+            for column in columns
+        )
+        names        = ", ".join(f'"{column["name"]}"' for column in columns)
+        placeholders = ", ".join(f":{position}" for position in range(1, len(columns) + 1))
+        input_sizes  = [
+            oracledb.DB_TYPE_NUMBER if column["type"] == "NUMBER"
+            else column["size"] if column["type"] == "VARCHAR2"
+            else oracledb.DB_TYPE_CLOB
+            for column in columns
+        ]
+
+        total_rows = 0
+        with self.conn.cursor() as cur:
+            try:
+                cur.execute(f"DROP TABLE {table_name}")
+            except oracledb.DatabaseError as e:
+                # ORA-00942 => the table does not exist; ignore
+                if "ORA-00942" not in str(e):
+                    raise
+            cur.execute(f"CREATE TABLE {table_name} ({definitions})")
+
+            insert = f"INSERT INTO {table_name} ({names}) VALUES ({placeholders})"
+            for chunk in pd.read_csv(io.BytesIO(csv_content), dtype=str, keep_default_na=False, chunksize=batch_rows):
+                data = {}
+                for column in columns:
+                    values = chunk[column["source"]]
+                    if column["type"] == "NUMBER":
+                        numbers = CSVLoaderService.get_numbers(values)
+                        values  = numbers.astype("Int64") if column["integer"] else numbers
+                    else:
+                        values = values.replace("", None)
+                    data[column["name"]] = values.astype(object).where(values.notna(), None)
+
+                rows = list(zip(*(data[column["name"]].tolist() for column in columns)))
+                cur.setinputsizes(*input_sizes)
+                cur.executemany(insert, rows)
+                total_rows += len(rows)
+
+            # Invalidate the cached Select AI responses of the profiles that include the table, as SP_SEL_AI_TBL_CSV does
+            cur.callproc("SP_SEL_AI_CACHE_INVALIDATE_TABLE", [table_name])
+        self.conn.commit()
+
+        elapsed = time.perf_counter() - start_time
+        return {
+            "rows"            : total_rows,
+            "columns"         : len(columns),
+            "elapsed_seconds" : elapsed,
+            "rows_per_second" : total_rows / elapsed if elapsed else 0
+        }
+
+
+if __name__ == "__main__":
+    # Benchmark (requires the database .env): rows/s of this loader vs. SP_SEL_AI_TBL_CSV
+    # python -m services.database.select_ai_loader <file.csv> <schema.table> <object_uri>
+    import sys
+    from services.database.select_ai import SelectAIService
+
+    csv_path, table_name, object_uri = sys.argv[1:4]
+    with open(csv_path, "rb") as file:
+        csv_content = file.read()
+
+    result = CSVLoaderService().create_table(table_name, csv_content)
+    print(f"client loader : {result['rows']} rows in {result['elapsed_seconds']:.2f}s ({result['rows_per_second']:.0f} rows/s)")
+
+    start_time = time.perf_counter()
+    SelectAIService().create_table_from_csv(object_uri, table_name)
+    elapsed = time.perf_counter() - start_time
+    print(f"procedure     : {result['rows']} rows in {elapsed:.2f}s ({result['rows'] / elapsed:.0f} rows/s)")
@@ -1,6 +1,17 @@
 
+import os
+import streamlit as st
 import pandas as pd
+from dotenv import load_dotenv
 from services.database.connection import Connection
+from services.database.select_ai_cache import SelectAICacheService, CACHE_RAG_TTL_SECONDS
+
+load_dotenv()
+
+# --- Index browser Configuration ---
+FILES_CACHE_TTL_SECONDS = int(os.getenv('CON_SELECT_AI_RAG_FILES_CACHE_TTL_SECONDS', '60'))
+CHUNKS_PAGE_SIZE        = int(os.getenv('CON_SELECT_AI_RAG_CHUNKS_PAGE_SIZE', '10'))
+# -----------------------------------
 
 class SelectAIRAGService:
     """
@@ -12,6 +23,7 @@ class SelectAIRAGService:
         Initializes the SelectAIRAGService with a shared database connection.
         """
         self.conn_instance = Connection()
+        self.cache_service = SelectAICacheService()
 
     @property
     def conn(self):
@@ -62,44 +74,129 @@ class SelectAIRAGService:
         Returns:
             str: The generated chat response.
         """
-        # Escape single quotes in prompt for SQL
-        prompt_escaped = prompt.replace("'", "''")
-        
-        query = f"""
-            SELECT
-                DBMS_CLOUD_AI.GENERATE(
-                prompt       => '{prompt_escaped} /** Format the response in markdown. Do not underline titles. Just focus on the information in the documents. Answer in {language}. If you do not know the answer, answer imperatively and exactly: ''NNN.'' **/',
-                profile_name => '{profile_name}',
-                action       => '{action}') AS CHAT
-            FROM DUAL
-        """
-        return pd.read_sql(query, con=self.conn)["CHAT"].iloc[0].read()
+        prompt_text = (
+            f"{prompt} /** Format the response in markdown. Do not underline titles. Just focus on the information in the documents. "
+            f"Answer in {language}. If you do not know the answer, answer imperatively and exactly: 'NNN.' **/"
+        )
+
+        # Cached response (shared by all workers), generated on a miss. The vector store keeps
+        # loading chunks after the profile is created, so answers live briefly and 'NNN.' is never stored
+        cache_key = SelectAICacheService.get_key(
+            SelectAICacheService.SCOPE_SELECT_AI_RAG,
+            profile_name,
+            action,
+            language,
+            prompt
+        )
+        return self.cache_service.generate(
+            cache_key,
+            SelectAICacheService.SCOPE_SELECT_AI_RAG,
+            prompt_text,
+            profile_name,
+            action,
+            ttl_seconds=CACHE_RAG_TTL_SECONDS,
+            no_cache_marker="NNN"
+        )
     
-    def get_files( self, index_name):
+    def get_files_cache(self, index_name, profile_name):
+        """
+        Returns the per-file summary of an index, cached until the profile's vector
+        store changes (SELECT_AI_RAG cache version of the profile) or for at most
+        FILES_CACHE_TTL_SECONDS, since the vector store pipeline keeps loading
+        chunks after it is created.
+
+        Args:
+            index_name (str): The name of the index to query.
+            profile_name (str): The Select AI RAG profile of the index.
+
+        Returns:
+            pd.DataFrame or None: See get_files.
         """
-        Retrieves file details and content from the specified index.
+        cache_version = self.cache_service.get_version(SelectAICacheService.SCOPE_SELECT_AI_RAG, profile_name)
+        return self.get_files(index_name, cache_version)
+
+    @st.cache_data(show_spinner=False, ttl=FILES_CACHE_TTL_SECONDS)
+    def get_files(_self, index_name, cache_version=None):
+        """
+        Retrieves one row per file of the specified index, aggregated in the database.
 
         Args:
             index_name (str): The name of the index to query.
+            cache_version (int, optional): Version of the vector store, only used as cache key.
 
         Returns:
-            pd.DataFrame or None: A DataFrame containing file details and content, or None if the index does not exist.
+            pd.DataFrame or None: FILE_NAME, LOCATION_URI, OBJECT_SIZE, LAST_MODIFIED, CHUNKS and
+                                  CONTENT_LENGTH per file, or None if the index does not exist.
+
+        Raises:
+            oracledb.Error: Any other database error (not cached).
         """
         try:
             query = f"""
                 SELECT 
-                    JSON_VALUE(ATTRIBUTES, '$.object_name')   AS FILE_NAME,
-                    JSON_VALUE(ATTRIBUTES, '$.object_size')   AS OBJECT_SIZE,
-                    JSON_VALUE(ATTRIBUTES, '$.last_modified') AS LAST_MODIFIED,
-                    JSON_VALUE(ATTRIBUTES, '$.location_uri')  AS LOCATION_URI,
-                    JSON_VALUE(ATTRIBUTES, '$.start_offset')  AS START_OFFSET,
-                    JSON_VALUE(ATTRIBUTES, '$.end_offset')    AS END_OFFSET,
-                    DBMS_LOB.SUBSTR(CONTENT, 4000, 1)         AS CONTENT
-                FROM 
-                    {index_name}$VECTAB
+                    FILE_NAME,
+                    MAX(LOCATION_URI)         AS LOCATION_URI,
+                    MAX(OBJECT_SIZE)          AS OBJECT_SIZE,
+                    MAX(LAST_MODIFIED)        AS LAST_MODIFIED,
+                    COUNT(*)                  AS CHUNKS,
+                    SUM(CONTENT_LENGTH)       AS CONTENT_LENGTH
+                FROM (
+                    SELECT 
+                        JSON_VALUE(ATTRIBUTES, '$.object_name')                     AS FILE_NAME,
+                        JSON_VALUE(ATTRIBUTES, '$.location_uri')                    AS LOCATION_URI,
+                        JSON_VALUE(ATTRIBUTES, '$.object_size' RETURNING NUMBER)    AS OBJECT_SIZE,
+                        JSON_VALUE(ATTRIBUTES, '$.last_modified')                   AS LAST_MODIFIED,
+                        DBMS_LOB.GETLENGTH(CONTENT)                                 AS CONTENT_LENGTH
+                    FROM 
+                        {index_name}$VECTAB
+                )
+                GROUP BY FILE_NAME
+                ORDER BY FILE_NAME
             """
-            return pd.read_sql(query, con=self.conn)
+            return pd.read_sql(query, con=_self.conn)
         except Exception as e:
             # Table or view '{index_name}$VECTAB' does not exist.
             if 'ORA-00942' in str(e):
-                return None
\ No newline at end of file
+                return None
+            # Anything else is raised, so it is not cached as a missing index
+            raise
+
+    def get_file_chunks(
+            self,
+            index_name,
+            file_name,
+            page=1,
+            page_size=CHUNKS_PAGE_SIZE,
+            preview_chars=1000
+        ):
+        """
+        Retrieves one page of the chunks of a file, ordered by offset, with a content preview.
+
+        Args:
+            index_name (str)    : The name of the index to query.
+            file_name (str)     : The file (object name) whose chunks are returned.
+            page (int)          : The page number, starting at 1.
+            page_size (int)     : Chunks per page.
+            preview_chars (int) : Characters of content returned per chunk.
+
+        Returns:
+            pd.DataFrame: START_OFFSET, END_OFFSET and CONTENT of the chunks of the page.
+        """
+        query = f"""
+            SELECT 
+                JSON_VALUE(ATTRIBUTES, '$.start_offset' RETURNING NUMBER) AS START_OFFSET,
+                JSON_VALUE(ATTRIBUTES, '$.end_offset' RETURNING NUMBER)   AS END_OFFSET,
+                DBMS_LOB.SUBSTR(CONTENT, :preview_chars, 1)               AS CONTENT
+            FROM 
+                {index_name}$VECTAB
+            WHERE 
+                JSON_VALUE(ATTRIBUTES, '$.object_name') = :file_name
+            ORDER BY START_OFFSET
+            OFFSET :row_offset ROWS FETCH NEXT :page_size ROWS ONLY
+        """
+        return pd.read_sql(query, con=self.conn, params={
+            "preview_chars" : preview_chars,
+            "file_name"     : file_name,
+            "row_offset"    : (max(page, 1) - 1) * page_size,
+            "page_size"     : page_size
+        })
@@ -1,6 +1,7 @@
 import os
 import oci
 import uuid
+import time
 import fitz
 
 from dotenv import load_dotenv
@@ -12,6 +13,7 @@ import utils as utils
 # Initialize services
 config               = oci.config.from_file(profile_name=os.getenv('CON_OCI_PROFILE_NAME', 'DEFAULT'))
 bucket_service       = service.BucketService()
+job_tracker_service  = service.JobTrackerService()
 file_service         = database.FileService()
 doc_service          = database.DocService()
 utl_function_service = utils.FunctionService()
@@ -26,14 +28,18 @@ load_dotenv()
 class DocumentUnderstandingService:
 
     @staticmethod
-    def create(
+    def create_job(
             object_name,
             prefix,
             language,
             file_id
         ):
         """
-        Sends a document to the OCI Document Understanding service for processing.
+        Submits a document to the OCI Document Understanding service without waiting for it.
+
+        The processor job is registered in the shared job tracker, which polls it with
+        exponential backoff and runs the post-processing (move results, extract text,
+        vector store) as a continuation once the job succeeds.
 
         Args:
             object_name (str) : The name of the object in the OCI bucket.
@@ -42,103 +48,194 @@ class DocumentUnderstandingService:
             file_id (str)     : The ID of the file to associate with the vector store.
 
         Returns:
-            tuple: A success message and extracted data, or an error message.
+            concurrent.futures.Future: Resolves with a tuple (data, messages, elapsed seconds) or raises JobFailedError.
         """
-        try:
-            # Map language to code
-            language = language_map.get(language)
-            
-            # Configure input and output locations
-            object_location = oci.ai_document.models.ObjectLocation(
-                namespace_name = os.getenv('CON_ADB_BUK_NAMESPACENAME'),
-                bucket_name    = os.getenv('CON_ADB_BUK_NAME'),
-                object_name    = object_name
-            )
-            output_location = oci.ai_document.models.OutputLocation(
-                namespace_name = os.getenv('CON_ADB_BUK_NAMESPACENAME'),
-                bucket_name    = os.getenv('CON_ADB_BUK_NAME'),
-                prefix         = prefix
-            )
+        submitted_at = time.time()
 
-            # Configure processor job details
-            processor_job_details = oci.ai_document.models.CreateProcessorJobDetails(
-                display_name     = str(uuid.uuid4()),
-                compartment_id   = os.getenv('CON_COMPARTMENT_ID'),
-                input_location   = oci.ai_document.models.ObjectStorageLocations(object_locations=[object_location]),
-                output_location  = output_location,
-                processor_config = oci.ai_document.models.GeneralProcessorConfig(
-                    features =[
-                        oci.ai_document.models.DocumentTextExtractionFeature(generate_searchable_pdf=True),
-                        #oci.ai_document.models.DocumentTableExtractionFeature(),
-                        #oci.ai_document.models.DocumentKeyValueExtractionFeature(),
-                        #oci.ai_document.models.DocumentLanguageClassificationFeature(),
-                    ],
-                    language = language
-                )
-            )
+        # Map language to code
+        language = language_map.get(language)
+        
+        # Configure input and output locations
+        object_location = oci.ai_document.models.ObjectLocation(
+            namespace_name = os.getenv('CON_ADB_BUK_NAMESPACENAME'),
+            bucket_name    = os.getenv('CON_ADB_BUK_NAME'),
+            object_name    = object_name
+        )
+        output_location = oci.ai_document.models.OutputLocation(
+            namespace_name = os.getenv('CON_ADB_BUK_NAMESPACENAME'),
+            bucket_name    = os.getenv('CON_ADB_BUK_NAME'),
+            prefix         = prefix
+        )
 
-            # Create the processor job and wait for completion
-            aiservicedocument_client = oci.ai_document.AIServiceDocumentClientCompositeOperations(
-                oci.ai_document.AIServiceDocumentClient(config)
+        # Configure processor job details
+        processor_job_details = oci.ai_document.models.CreateProcessorJobDetails(
+            display_name     = str(uuid.uuid4()),
+            compartment_id   = os.getenv('CON_COMPARTMENT_ID'),
+            input_location   = oci.ai_document.models.ObjectStorageLocations(object_locations=[object_location]),
+            output_location  = output_location,
+            processor_config = oci.ai_document.models.GeneralProcessorConfig(
+                features =[
+                    oci.ai_document.models.DocumentTextExtractionFeature(generate_searchable_pdf=True),
+                    #oci.ai_document.models.DocumentTableExtractionFeature(),
+                    #oci.ai_document.models.DocumentKeyValueExtractionFeature(),
+                    #oci.ai_document.models.DocumentLanguageClassificationFeature(),
+                ],
+                language = language
             )
-            response = aiservicedocument_client.create_processor_job_and_wait_for_state(
-                create_processor_job_details=processor_job_details,
-                wait_for_states=[oci.ai_document.models.ProcessorJob.LIFECYCLE_STATE_SUCCEEDED]
+        )
+
+        # Create the processor job (returns as soon as the job is accepted)
+        aiservicedocument_client = oci.ai_document.AIServiceDocumentClient(config)
+        processor_job = aiservicedocument_client.create_processor_job(
+            create_processor_job_details=processor_job_details
+        ).data
+
+        # Poll the job in the background and post-process it when it finishes
+        return job_tracker_service.submit(
+            job_id     = processor_job.id,
+            get_state  = lambda: aiservicedocument_client.get_processor_job(processor_job.id).data.lifecycle_state,
+            on_success = lambda job_id: DocumentUnderstandingService.process_job(
+                job_id,
+                object_name,
+                output_location,
+                file_id,
+                submitted_at
             )
-            processor_job = response.data
+        )
+
+    @staticmethod
+    def process_job(
+            processor_job_id,
+            object_name,
+            output_location,
+            file_id,
+            submitted_at
+        ):
+        """
+        Continuation of a succeeded processor job: moves the results next to the source
+        object, extracts the text and updates the vector store.
+
+        Runs on a job tracker worker thread, so it returns its messages instead of
+        displaying them and raises its failures, which reject the job's future.
+
+        Args:
+            processor_job_id (str)   : The OCID of the succeeded processor job.
+            object_name (str)        : The name of the source object in the OCI bucket.
+            output_location (object) : The output location used by the processor job.
+            file_id (str)            : The ID of the file to associate with the vector store.
+            submitted_at (float)     : Epoch time when the job was submitted.
+
+        Returns:
+            tuple: The extracted data, the list of messages produced and the elapsed seconds.
+        """
+        messages = []
+
+        # Construct paths for processed objects
+        processed_object_base = f"{output_location.prefix}/{processor_job_id}"
+        processed_object_pdf  = f"{processed_object_base}/{output_location.namespace_name}_{output_location.bucket_name}/searchablePdf/{object_name}.pdf"
+        processed_object_json = f"{processed_object_base}/{output_location.namespace_name}_{output_location.bucket_name}/results/{object_name}.json"
+
+        # Extract base path and filename without extension
+        base_path, file_name = object_name.rsplit("/", 1)
+        file_name = file_name.rsplit(".", 1)[0]
+
+        # Move PDF file
+        object_name_pdf = f"{base_path}/{file_name}_trg.pdf"                
+        if not bucket_service.move_object(processed_object_pdf, object_name_pdf):
+            raise RuntimeError(f"The result '{processed_object_pdf}' could not be moved.")
+
+        # Move JSON file
+        object_name_json = f"{base_path}/{file_name}_trg.json"
+        if not bucket_service.move_object(processed_object_json, object_name_json):
+            raise RuntimeError(f"The result '{processed_object_json}' could not be moved.")
+
+        # List and delete all objects in the processed folder
+        list_objects = bucket_service.list_objects(processed_object_base)
+        for obj_name in list_objects:
+            bucket_service.delete_object(obj_name)
+
+        # Build the new name for the processed file
+        object_name_trg = f"{object_name.rsplit('.', 1)[0]}_trg.pdf"
         
-            if processor_job:
-
-                # Construct paths for processed objects
-                processed_object_base = f"{prefix}/{processor_job.id}"
-                processed_object_pdf  = f"{processed_object_base}/{output_location.namespace_name}_{output_location.bucket_name}/searchablePdf/{object_name}.pdf"
-                processed_object_json = f"{processed_object_base}/{output_location.namespace_name}_{output_location.bucket_name}/results/{object_name}.json"
-
-                # Extract base path and filename without extension
-                base_path, file_name = object_name.rsplit("/", 1)
-                file_name = file_name.rsplit(".", 1)[0]
-
-                # Move PDF file
-                object_name_pdf = f"{base_path}/{file_name}_trg.pdf"                
-                bucket_service.move_object(processed_object_pdf, object_name_pdf)
-
-                # Move JSON file
-                object_name_json = f"{base_path}/{file_name}_trg.json"
-                bucket_service.move_object(processed_object_json, object_name_json)
-
-                # List and delete all objects in the processed folder
-                list_objects = bucket_service.list_objects(processed_object_base)
-                for obj_name in list_objects:
-                    bucket_service.delete_object(obj_name)
-
-                # Build the new name for the processed file
-                object_name_trg = f"{object_name.rsplit('.', 1)[0]}_trg.pdf"
-                
-                # Process the PDF and extract data
-                data = DocumentUnderstandingService.process_pdf(object_name_trg)
-                
-                # Process file extraction
-                file_trg_extraction = "\n".join([str(page["content"]) for page in data if "content" in page]) if data else ""
-                msg = file_service.update_extraction(file_id, file_trg_extraction)
-                component.get_toast(msg, ":material/database:")
-                
-                # Process Vector Store
-                msg = doc_service.vector_store(file_id)
+        # Process the PDF and extract data
+        data = DocumentUnderstandingService.process_pdf(object_name_trg, raise_errors=True)
+        
+        # Process file extraction
+        file_trg_extraction = "\n".join([str(page["content"]) for page in data if "content" in page]) if data else ""
+        messages.append(file_service.update_extraction(file_id, file_trg_extraction))
+        
+        # Process Vector Store
+        messages.append(doc_service.vector_store(file_id))
+
+        return data, messages, time.time() - submitted_at
+
+    @staticmethod
+    def get_job_result(future):
+        """
+        Waits for a document submitted with `create_job` and displays its messages.
+        Submit every document first and then wait on their futures, so the jobs run concurrently.
+
+        Args:
+            future (concurrent.futures.Future): The future of the document.
+
+        Returns:
+            tuple: A success message, extracted data and the elapsed time ('HH:MM:SS'), or None on error.
+        """
+        try:
+            data, messages, elapsed = future.result()
+
+            for msg in messages:
                 component.get_toast(msg, ":material/database:")
-                
-                mg = f"[AI Document Understanding] Module executed successfully."
+
+            mg = f"[AI Document Understanding] Module executed successfully."
+            return mg, data, utl_function_service.get_time_format(elapsed)
+
+        except Exception as e:
+            component.get_error(f"[Error] Creating Document Understanding:\n{e}")
+
+    @staticmethod
+    def create(
+            object_name,
+            prefix,
+            language,
+            file_id
+        ):
+        """
+        Sends a document to the OCI Document Understanding service for processing
+        and waits for the job and its post-processing to finish.
+
+        Args:
+            object_name (str) : The name of the object in the OCI bucket.
+            prefix (str)      : The output prefix for processed files.
+            language (str)    : The language of the document (e.g., 'English', 'Spanish').
+            file_id (str)     : The ID of the file to associate with the vector store.
+
+        Returns:
+            tuple: A success message and extracted data, or an error message.
+        """
+        try:
+            future = DocumentUnderstandingService.create_job(
+                object_name,
+                prefix,
+                language,
+                file_id
+            )
+            result = DocumentUnderstandingService.get_job_result(future)
+            if result:
+                mg, data, _ = result
                 return mg, data
 
         except Exception as e:
             component.get_error(f"[Error] Creating Document Understanding:\n{e}")
         
     @staticmethod
-    def process_pdf(object_name, msg: bool = False):
+    def process_pdf(object_name, msg: bool = False, raise_errors: bool = False):
         """
         Processes a PDF file from the OCI bucket and extracts text from each page.
 
         Args:
             object_name (str): Name of the PDF object in the bucket.
+            raise_errors (bool): If True, failures are raised instead of displayed (no Streamlit session, e.g. job continuations).
 
         Returns:
             list: A list of dictionaries, where each dictionary contains:
@@ -152,6 +249,8 @@ class DocumentUnderstandingService:
 
             # Retrieve the PDF stream from the bucket
             object = bucket_service.get_object(object_name)
+            if object is None and raise_errors:
+                raise RuntimeError(f"The object '{object_name}' could not be retrieved.")
             if object:
                 # Open the PDF document from the binary stream
                 pdf_document = fitz.open(stream=object, filetype='pdf')
@@ -175,5 +274,7 @@ class DocumentUnderstandingService:
             return data
 
         except Exception as e:
+            if raise_errors:
+                raise
             component.get_error(f"[Error] Processing PDF:\n{e}")
             return []
\ No newline at end of file
@@ -164,4 +164,24 @@ class GenerativeAIService:
         chain = system_prompt | llm
         
         response = chain.invoke({"system_text": system_text, "query": input})
-        return response.content
\ No newline at end of file
+        return response.content
+
+    @staticmethod
+    def get_agent_stream(user_id, agent_id, input):
+        """
+        Igual que get_agent, pero devuelve un generador con los fragmentos de texto
+        a medida que el LLM los produce. La configuración se resuelve al llamar,
+        el generador puede consumirse desde otro hilo.
+        """
+        # Configuración del agente
+        df_agents = db_agent_service.get_all_agents_cache(user_id)[lambda df: df["AGENT_ID"] == agent_id]
+
+        # LLM configurado para el agente
+        llm = GenerativeAIService.get_llm(user_id, agent_id)
+
+        system_text = str(df_agents["AGENT_PROMPT_SYSTEM"].values[0])
+        system_prompt = PromptTemplate(input_variables=["system_text", "query"], template="{system_text}\n{query}")
+        chain = system_prompt | llm
+
+        stream = chain.stream({"system_text": system_text, "query": input})
+        return (chunk.content for chunk in stream if chunk.content)
@@ -0,0 +1,177 @@
+import os
+import time
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# --- Polling Configuration ---
+POLL_INITIAL_SECONDS = float(os.getenv('CON_JOB_POLL_INITIAL_SECONDS', '1'))
+POLL_MAX_SECONDS     = float(os.getenv('CON_JOB_POLL_MAX_SECONDS', '30'))
+POLL_BACKOFF         = float(os.getenv('CON_JOB_POLL_BACKOFF', '2'))
+JOB_TIMEOUT_SECONDS  = float(os.getenv('CON_JOB_TIMEOUT_SECONDS', '3600'))
+CONTINUATION_WORKERS = int(os.getenv('CON_JOB_CONTINUATION_WORKERS', '4'))
+# -----------------------------
+
+logger = logging.getLogger(__name__)
+
+STATE_SUCCEEDED = "SUCCEEDED"
+STATES_FAILED   = ("FAILED", "CANCELED")
+
+
+class JobFailedError(Exception):
+    """
+    Raised when a tracked job ends in a failure state or exceeds its deadline.
+    """
+
+
+class JobTrackerService:
+    """
+    Singleton that tracks long-running OCI jobs (Document Understanding, Speech)
+    from a single background thread.
+
+    Each job is polled with exponential backoff until it reaches a terminal state
+    or its deadline. When a job succeeds its continuation (post-processing) runs
+    on a small worker pool, so slow continuations never delay polling of the
+    other outstanding jobs.
+    """
+    _instance = None
+    _lock     = threading.Lock()
+
+    def __new__(cls):
+        with cls._lock:
+            if cls._instance is None:
+                instance = super(JobTrackerService, cls).__new__(cls)
+                instance._jobs     = {}
+                instance._cond     = threading.Condition()
+                instance._executor = ThreadPoolExecutor(
+                    max_workers        = CONTINUATION_WORKERS,
+                    thread_name_prefix = "oci-job-continuation"
+                )
+                instance._thread   = threading.Thread(target=instance._run, name="oci-job-tracker", daemon=True)
+                instance._thread.start()
+                cls._instance = instance
+        return cls._instance
+
+    def submit(
+            self,
+            job_id,
+            get_state,
+            on_success=None,
+            on_failure=None,
+            timeout=JOB_TIMEOUT_SECONDS
+        ):
+        """
+        Registers a job to be polled until it reaches a terminal state.
+
+        Args:
+            job_id (str)          : The OCID of the job.
+            get_state (callable)  : Returns the current lifecycle state of the job.
+            on_success (callable) : Continuation executed with the job id once the job succeeds.
+            on_failure (callable) : Optional callback executed with the job id and the error.
+            timeout (float)       : Seconds before the job is considered failed.
+
+        Returns:
+            concurrent.futures.Future: Resolves with the continuation result, or raises JobFailedError.
+        """
+        future = Future()
+        now    = time.monotonic()
+        with self._cond:
+            self._jobs[job_id] = {
+                "get_state"  : get_state,
+                "on_success" : on_success,
+                "on_failure" : on_failure,
+                "future"     : future,
+                "interval"   : POLL_INITIAL_SECONDS,
+                "next_poll"  : now + POLL_INITIAL_SECONDS,
+                "deadline"   : now + timeout,
+                "submitted"  : now,
+                "last_error" : None
+            }
+            self._cond.notify()
+        return future
+
+    def pending(self):
+        """
+        Returns the number of jobs that have not reached a terminal state yet.
+        """
+        with self._cond:
+            return len(self._jobs)
+
+    def _run(self):
+        """
+        Polling loop: sleeps until the nearest scheduled poll, then polls every due job.
+        """
+        while True:
+            with self._cond:
+                while not self._jobs:
+                    self._cond.wait()
+
+                now       = time.monotonic()
+                next_poll = min(job["next_poll"] for job in self._jobs.values())
+                if next_poll > now:
+                    # Wake up early if a new job is submitted in the meantime
+                    self._cond.wait(next_poll - now)
+                    continue
+
+                due = [(job_id, job) for job_id, job in self._jobs.items() if job["next_poll"] <= now]
+
+            for job_id, job in due:
+                self._poll(job_id, job)
+
+    def _poll(self, job_id, job):
+        """
+        Polls a single job and schedules its next poll or resolves it.
+        """
+        state = None
+        try:
+            state = job["get_state"]()
+        except Exception as e:
+            # Transient errors (throttling, network) are retried until the deadline
+            job["last_error"] = e
+
+        now = time.monotonic()
+
+        if state == STATE_SUCCEEDED:
+            self._remove(job_id)
+            self._executor.submit(self._complete, job_id, job)
+        elif state in STATES_FAILED:
+            self._remove(job_id)
+            self._fail(job_id, job, JobFailedError(f"Job '{job_id}' ended in state {state}."))
+        elif now >= job["deadline"]:
+            self._remove(job_id)
+            detail = f" Last error: {job['last_error']}" if job["last_error"] else ""
+            self._fail(job_id, job, JobFailedError(f"Job '{job_id}' did not finish in {int(now - job['submitted'])}s.{detail}"))
+        else:
+            with self._cond:
+                job["interval"]  = min(job["interval"] * POLL_BACKOFF, POLL_MAX_SECONDS)
+                job["next_poll"] = min(now + job["interval"], job["deadline"])
+
+    def _remove(self, job_id):
+        with self._cond:
+            self._jobs.pop(job_id, None)
+
+    def _complete(self, job_id, job):
+        """
+        Runs the continuation of a succeeded job and resolves its future.
+        """
+        try:
+            result = job["on_success"](job_id) if job["on_success"] else None
+            job["future"].set_result(result)
+        except Exception as e:
+            job["future"].set_exception(e)
+
+    def _fail(self, job_id, job, error):
+        """
+        Runs the failure callback of a job and resolves its future with the error.
+        """
+        try:
+            if job["on_failure"]:
+                job["on_failure"](job_id, error)
+        except Exception as e:
+            # Never let a callback stop the polling thread (no Streamlit session here to show it)
+            logger.exception(f"[Error] Job '{job_id}' failure callback: {e}")
+        job["future"].set_exception(error)
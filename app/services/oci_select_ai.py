@@ -4,9 +4,11 @@ import time
 from dotenv import load_dotenv
 import components as component
 import services.database as database
+from services.database.select_ai_loader import CSV_LOADER
 
 # Initialize the service
 db_select_ai_service = database.SelectAIService()
+db_csv_loader_service = database.CSVLoaderService()
 
 load_dotenv()
 
@@ -52,7 +54,8 @@ class SelectAIService:
             file_src_file_name, 
             file_trg_obj_name,
             comment_data_editor,
-            file_description=None
+            file_description=None,
+            csv_content=None
         ):
         """
         Creates a table from a CSV file and updates it with comments and annotations, then creates a profile.
@@ -63,6 +66,7 @@ class SelectAIService:
             file_trg_obj_name (str): The target table name.
             comment_data_editor (pd.DataFrame): DataFrame containing comments and annotations to update.
             file_description (str, optional): Description to add as table annotation. Defaults to None.
+            csv_content (bytes, optional): The uploaded CSV, loaded client-side when CON_SELECT_AI_CSV_LOADER=client. Defaults to None.
 
         Returns:
             str: A success message if the operation is completed successfully.
@@ -73,83 +77,37 @@ class SelectAIService:
             table_name   = file_trg_obj_name
             
             # Create table
-            db_select_ai_service.create_table_from_csv(
-                object_uri,
-                table_name
-            ) 
+            if CSV_LOADER == "client" and csv_content:
+                result = db_csv_loader_service.create_table(table_name, csv_content)
+                print(f"[Select AI] Client loader: {result['rows']} rows in {result['elapsed_seconds']:.2f}s ({result['rows_per_second']:.0f} rows/s)")
+            else:
+                db_select_ai_service.create_table_from_csv(
+                    object_uri,
+                    table_name
+                ) 
             component.get_toast(f"Table '{table_name}' has been created successfully.", ":material/database:")
 
-            # Process comments
-            comments_added = 0
-            if comment_data_editor is not None and not comment_data_editor.empty:
-                for _, row in comment_data_editor.iterrows():
-                    # Only update if the comment is not empty
-                    if row["Comment"].strip():
-                        db_select_ai_service.update_comment(
-                            table_name  = file_trg_obj_name,
-                            column_name = row["Column Name"],
-                            comment     = row["Comment"]
-                        )
-                        comments_added += 1
-                
-                # Show a message if at least one comment was added
-                if comments_added > 0:
-                    component.get_toast(f"Comment(s) have been added successfully.", ":material/notes:")
-            
-            # Process column annotations (UI_Display, Classification)
-            annotations_added = 0
-            if comment_data_editor is not None and not comment_data_editor.empty:
-                for _, row in comment_data_editor.iterrows():
-                    column_name = row["Column Name"]
-                    
-                    # Add UI_Display annotation if provided
-                    if "UI_Display" in row and row["UI_Display"].strip():
-                        db_select_ai_service.update_column_annotation(
-                            table_name      = file_trg_obj_name,
-                            column_name     = column_name,
-                            annotation_name = "UI_Display",
-                            annotation_value = row["UI_Display"]
-                        )
-                        annotations_added += 1
-                    
-                    # Add Classification annotation if provided
-                    if "Classification" in row and row["Classification"].strip():
-                        db_select_ai_service.update_column_annotation(
-                            table_name      = file_trg_obj_name,
-                            column_name     = column_name,
-                            annotation_name = "Classification",
-                            annotation_value = row["Classification"]
-                        )
-                        annotations_added += 1
-                
-                # Show a message if at least one annotation was added
-                if annotations_added > 0:
-                    component.get_toast(f"Annotation(s) have been added successfully.", ":material/label:")
-            
-            # Add table-level annotation from file description
+            # Apply comments, annotations (columns and table) and primary key, and refresh the catalog snapshot, in one round trip
+            data_dictionary = db_select_ai_service.get_data_dictionary_ddl(
+                table_name,
+                comment_data_editor,
+                file_description
+            )
+            result = db_select_ai_service.apply_data_dictionary(
+                table_name,
+                data_dictionary["statements"]
+            )
+            print(f"[Select AI] Data dictionary: {result['statements']} statement(s) in {result['elapsed_ms']:.0f} ms")
+
+            if data_dictionary["comments"] > 0:
+                component.get_toast(f"Comment(s) have been added successfully.", ":material/notes:")
+            if data_dictionary["annotations"] > 0:
+                component.get_toast(f"Annotation(s) have been added successfully.", ":material/label:")
             if file_description and file_description.strip():
-                db_select_ai_service.update_table_annotation(
-                    table_name      = file_trg_obj_name,
-                    annotation_name = "UI_Display",
-                    annotation_value = file_description
-                )
                 component.get_toast(f"Table annotation added successfully.", ":material/description:")
-            
-            # Process PRIMARY KEY constraints
-            if comment_data_editor is not None and not comment_data_editor.empty:
-                pk_columns = []
-                if "Primary Key" in comment_data_editor.columns:
-                    for _, row in comment_data_editor.iterrows():
-                        if row.get("Primary Key", False):
-                            pk_columns.append(row["Column Name"])
-                    
-                    if pk_columns:
-                        db_select_ai_service.add_primary_key(
-                            table_name   = file_trg_obj_name,
-                            column_names = pk_columns
-                        )
-                        pk_cols_str = ", ".join(pk_columns)
-                        component.get_toast(f"Primary key constraint added on ({pk_cols_str}).", ":material/key:")
+            if data_dictionary["pk_columns"]:
+                pk_cols_str = ", ".join(data_dictionary["pk_columns"])
+                component.get_toast(f"Primary key constraint added on ({pk_cols_str}).", ":material/key:")
             
             # Create Profile
             db_select_ai_service.create_profile(
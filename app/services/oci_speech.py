@@ -3,6 +3,7 @@ import oci
 import uuid
 import json
 import time
+from concurrent.futures import Future
 
 from dotenv import load_dotenv
 import components as component
@@ -13,6 +14,7 @@ import utils as utils
 # Initialize services
 config               = oci.config.from_file(profile_name=os.getenv('CON_OCI_PROFILE_NAME', 'DEFAULT'))
 bucket_service       = service.BucketService()
+job_tracker_service  = service.JobTrackerService()
 db_file_service      = database.FileService()
 db_doc_service       = database.DocService()
 utl_function_service = utils.FunctionService()
@@ -24,10 +26,180 @@ language_map         = {
 
 load_dotenv()
 
+# --- Batch Configuration ---
+BATCH_MAX_FILES = int(os.getenv('CON_SPEECH_BATCH_MAX_FILES', '20'))
+BATCH_MAX_BYTES = int(os.getenv('CON_SPEECH_BATCH_MAX_MB', '500')) * 1024 * 1024
+# ---------------------------
+
 class SpeechService:
 
     @staticmethod
-    def create_job(
+    def get_batches(files):
+        """
+        Groups uploaded audio files into transcription batches capped by file count and total size.
+
+        Args:
+            files (list): Dicts with the 'object_name', 'file_id' and 'size' (bytes) of each file.
+
+        Returns:
+            list: A list of batches, each one a list of file dicts.
+        """
+        batches, batch, batch_size = [], [], 0
+        for file in files:
+            if batch and (len(batch) >= BATCH_MAX_FILES or batch_size + file["size"] > BATCH_MAX_BYTES):
+                batches.append(batch)
+                batch, batch_size = [], 0
+            batch.append(file)
+            batch_size += file["size"]
+        if batch:
+            batches.append(batch)
+        return batches
+
+    @staticmethod
+    def submit_batch_job(
+            files,
+            prefix,
+            language,
+            trg_type
+        ):
+        """
+        Submits audio files to the OCI Speech service as one transcription job per batch,
+        without waiting for them.
+
+        Each job lists all the objects of its batch in a single `ObjectListInlineInputLocation`
+        and is registered in the shared job tracker. When a job succeeds its outputs are
+        fanned back to the `FILE_ID` of every file, which resolves each file's future.
+
+        Args:
+            files (list)   : Dicts with the 'object_name', 'file_id' and 'size' (bytes) of each file.
+            prefix (str)   : The output prefix for processed files.
+            language (str) : The language of the audio (e.g., 'English', 'Spanish').
+            trg_type (str) : The type of target processing (e.g., 'SRT', 'TXT').
+
+        Returns:
+            list: One concurrent.futures.Future per file, in the same order, resolving with
+                  a tuple (data, messages, elapsed seconds) or raising JobFailedError. The files
+                  of a batch whose job could not be created get futures that raise its error,
+                  so the batches already submitted are still awaited.
+        """
+        # Map language to code
+        language = language_map.get(language)
+
+        futures = []
+        for batch in SpeechService.get_batches(files):
+            try:
+                futures.extend(SpeechService.submit_transcription_job(batch, prefix, language, trg_type))
+            except Exception as e:
+                for _ in batch:
+                    future = Future()
+                    future.set_exception(e)
+                    futures.append(future)
+        return futures
+
+    @staticmethod
+    def submit_transcription_job(
+            batch,
+            prefix,
+            language_code,
+            trg_type
+        ):
+        """
+        Creates one transcription job for a batch of files and registers it in the job tracker.
+
+        Args:
+            batch (list)        : Dicts with the 'object_name' and 'file_id' of each file.
+            prefix (str)        : The output prefix for processed files.
+            language_code (str) : The language code of the audio (e.g., 'es').
+            trg_type (str)      : The type of target processing (e.g., 'SRT', 'TXT').
+
+        Returns:
+            list: One concurrent.futures.Future per file of the batch.
+        """
+        submitted_at = time.time()
+
+        # Configure input and output locations
+        object_location = oci.ai_speech.models.ObjectLocation(
+            namespace_name = os.getenv('CON_ADB_BUK_NAMESPACENAME'),
+            bucket_name    = os.getenv('CON_ADB_BUK_NAME'),
+            object_names   = [file["object_name"] for file in batch]
+        )
+        input_location = oci.ai_speech.models.ObjectListInlineInputLocation(
+            location_type    = "OBJECT_LIST_INLINE_INPUT_LOCATION",
+            object_locations = [object_location],
+        )
+        output_location = oci.ai_speech.models.OutputLocation(
+            namespace_name = os.getenv('CON_ADB_BUK_NAMESPACENAME'),
+            bucket_name    = os.getenv('CON_ADB_BUK_NAME'),
+            prefix         = prefix
+        )
+        normalization = oci.ai_speech.models.TranscriptionNormalization(
+            is_punctuation_enabled = True
+        )
+        diarization = oci.ai_speech.models.Diarization(
+            is_diarization_enabled = True,
+            number_of_speakers     = 2,
+        )
+        transcription_settings = oci.ai_speech.models.TranscriptionSettings(
+            diarization = diarization
+        )
+        model_details = oci.ai_speech.models.TranscriptionModelDetails(
+            language_code = language_code,
+            model_type    = "WHISPER_MEDIUM",
+            transcription_settings = transcription_settings,
+        )
+        
+        # Configure processor job details
+        transcription_job_details = oci.ai_speech.models.CreateTranscriptionJobDetails(
+            display_name    = str(uuid.uuid4()),
+            compartment_id  = os.getenv('CON_COMPARTMENT_ID'),
+            description     = "App",
+            model_details   = model_details,
+            input_location  = input_location,
+            additional_transcription_formats=["SRT"],
+            normalization   = normalization,
+            output_location = output_location
+        )
+
+        # Create the transcription job (returns as soon as the job is accepted)
+        aiservicespeech_client = oci.ai_speech.AIServiceSpeechClient(config)
+        transcription_job = aiservicespeech_client.create_transcription_job(
+            create_transcription_job_details=transcription_job_details
+        ).data
+
+        file_futures = [Future() for _ in batch]
+
+        def on_success(job_id):
+            # Fan the job outputs back to each file
+            for file, future in zip(batch, file_futures):
+                try:
+                    future.set_result(SpeechService.process_job(
+                        transcription_job,
+                        file["object_name"],
+                        output_location,
+                        file["file_id"],
+                        trg_type,
+                        submitted_at,
+                        cleanup=False
+                    ))
+                except Exception as e:
+                    future.set_exception(e)
+            SpeechService.cleanup_job(transcription_job)
+
+        def on_failure(job_id, error):
+            for future in file_futures:
+                future.set_exception(error)
+
+        # Poll the job in the background and post-process it when it finishes
+        job_tracker_service.submit(
+            job_id     = transcription_job.id,
+            get_state  = lambda: aiservicespeech_client.get_transcription_job(transcription_job.id).data.lifecycle_state,
+            on_success = on_success,
+            on_failure = on_failure
+        )
+        return file_futures
+
+    @staticmethod
+    def submit_job(
             object_name,
             prefix,
             language,
@@ -35,7 +207,7 @@ class SpeechService:
             trg_type
         ):
         """
-        Sends a document to the OCI Document Understanding service for processing.
+        Submits a single audio file to the OCI Speech service without waiting for it.
 
         Args:
             object_name (str) : The name of the object in the OCI bucket.
@@ -45,130 +217,168 @@ class SpeechService:
             trg_type (str)    : The type of target processing (e.g., 'SRT', 'TXT').
 
         Returns:
-            tuple: A success message and extracted data, or an error message.
+            concurrent.futures.Future: Resolves with a tuple (data, messages, elapsed seconds).
+        """
+        files = [{"object_name": object_name, "file_id": file_id, "size": 0}]
+        return SpeechService.submit_batch_job(files, prefix, language, trg_type)[0]
+
+    @staticmethod
+    def process_job(
+            transcription_job,
+            object_name,
+            output_location,
+            file_id,
+            trg_type,
+            submitted_at,
+            cleanup: bool = True
+        ):
+        """
+        Continuation of a succeeded transcription job for one of its files: moves the JSON/SRT
+        results next to the source object, builds the TXT transcription and updates the vector store.
+
+        Runs on a job tracker worker thread, so it returns its messages instead of
+        displaying them and raises its failures, which reject the file's future.
+
+        Args:
+            transcription_job (object) : The transcription job returned on creation.
+            object_name (str)          : The name of the source object in the OCI bucket.
+            output_location (object)   : The output location used by the job.
+            file_id (str)              : The ID of the file to associate with the vector store.
+            trg_type (str)             : The type of target processing (e.g., 'SRT', 'TXT').
+            submitted_at (float)       : Epoch time when the job was submitted.
+            cleanup (bool)             : If True, deletes the remaining job outputs afterwards.
+
+        Returns:
+            tuple: The extracted data, the list of messages produced and the elapsed seconds.
+        """
+        messages = []
+
+        # Construct paths for processed objects                
+        transcription_object_base = transcription_job.output_location.prefix[:-1]
+
+        transcription_object_json = f"{transcription_object_base}/{output_location.namespace_name}_{output_location.bucket_name}_{object_name}.json"
+        transcription_object_srt  = f"{transcription_object_base}/{output_location.namespace_name}_{output_location.bucket_name}_{object_name}.srt"
+        
+        # Extract base path and filename without extension
+        base_path, file_name = object_name.rsplit("/", 1)
+        file_name = file_name.rsplit(".", 1)[0]
+
+        # Move JSON file
+        object_name_json = f"{base_path}/{file_name}_trg.json"
+        if not bucket_service.move_object(transcription_object_json, object_name_json):
+            raise RuntimeError(f"The result '{transcription_object_json}' could not be moved.")
+        
+        # Move SRT file
+        object_name_srt = f"{base_path}/{file_name}_trg.srt"
+        if not bucket_service.move_object(transcription_object_srt, object_name_srt):
+            raise RuntimeError(f"The result '{transcription_object_srt}' could not be moved.")
+
+        # List and delete all objects in the processed folder
+        if cleanup:
+            SpeechService.cleanup_job(transcription_job)
+
+        # Build the new name for the processed file
+        object_name_trg_srt  = f"{object_name.rsplit('.', 1)[0]}_trg.srt"
+        object_name_trg_json = f"{object_name.rsplit('.', 1)[0]}_trg.json"
+        object_name_trg_txt  = f"{object_name.rsplit('.', 1)[0]}_trg.txt"
+
+        # Process
+        data_srt  = SpeechService.process_file(object_name_trg_srt, raise_errors=True)
+        data_json = SpeechService.process_file(object_name_trg_json, raise_errors=True)
+        data_txt  = SpeechService.process_transcriptions(data_json)
+
+        # Upload file to Bucket
+        if not bucket_service.upload_file(
+            object_name     = object_name_trg_txt,
+            put_object_body = data_txt
+        ):
+            raise RuntimeError(f"The transcription '{object_name_trg_txt}' could not be uploaded.")
+
+        data = None
+
+        if trg_type == "SRT":
+            data = data_srt
+        elif trg_type == "TXT":
+            data = data_txt
+        
+        # Process file extraction
+        file_trg_extraction = str(data)
+        messages.append(db_file_service.update_extraction(file_id, file_trg_extraction))
+        
+        # Process Vector Store
+        messages.append(db_doc_service.vector_store(file_id))
+
+        return data, messages, time.time() - submitted_at
+
+    @staticmethod
+    def cleanup_job(transcription_job):
+        """
+        Deletes every object left in the output folder of a transcription job.
+
+        Args:
+            transcription_job (object): The transcription job returned on creation.
+        """
+        transcription_object_base = transcription_job.output_location.prefix[:-1]
+        list_objects = bucket_service.list_objects(transcription_object_base)
+        for obj_name in list_objects:
+            bucket_service.delete_object(obj_name)
+
+    @staticmethod
+    def get_job_result(future):
+        """
+        Waits for a transcription submitted with `submit_job` or `submit_batch_job`
+        and displays its messages.
+
+        Args:
+            future (concurrent.futures.Future): The future of the file.
+
+        Returns:
+            tuple: A success message, extracted data and the elapsed time ('HH:MM:SS'), or None on error.
         """
         try:
-             # Map language to code
-            language = language_map.get(language)
+            data, messages, elapsed = future.result()
 
-            # Configure input and output locations
-            object_location = oci.ai_speech.models.ObjectLocation(
-                namespace_name = os.getenv('CON_ADB_BUK_NAMESPACENAME'),
-                bucket_name    = os.getenv('CON_ADB_BUK_NAME'),
-                object_names   = [object_name]
-            )
-            input_location = oci.ai_speech.models.ObjectListInlineInputLocation(
-                location_type    = "OBJECT_LIST_INLINE_INPUT_LOCATION",
-                object_locations = [object_location],
-            )
-            output_location = oci.ai_speech.models.OutputLocation(
-                namespace_name = os.getenv('CON_ADB_BUK_NAMESPACENAME'),
-                bucket_name    = os.getenv('CON_ADB_BUK_NAME'),
-                prefix         = prefix
-            )
-            normalization = oci.ai_speech.models.TranscriptionNormalization(
-                is_punctuation_enabled = True
-            )
-            diarization = oci.ai_speech.models.Diarization(
-                is_diarization_enabled = True,
-                number_of_speakers     = 2,
-            )
-            transcription_settings = oci.ai_speech.models.TranscriptionSettings(
-                diarization = diarization
-            )
-            model_details = oci.ai_speech.models.TranscriptionModelDetails(
-                language_code = language,
-                model_type    = "WHISPER_MEDIUM",
-                transcription_settings = transcription_settings,
-            )
-            
-            # Configure processor job details
-            transcription_job_details = oci.ai_speech.models.CreateTranscriptionJobDetails(
-                display_name    = str(uuid.uuid4()),
-                compartment_id  = os.getenv('CON_COMPARTMENT_ID'),
-                description     = "App",
-                model_details   = model_details,
-                input_location  = input_location,
-                additional_transcription_formats=["SRT"],
-                normalization   = normalization,
-                output_location = output_location
-            )
+            for msg in messages:
+                component.get_toast(msg, ":material/database:")
+
+            mg = f"[AI Speech] Module executed successfully."
+            return mg, data, utl_function_service.get_time_format(elapsed)
+
+        except Exception as e:
+            component.get_error(f"[Error] Creating Speech:\n{e}")
+
+    @staticmethod
+    def create_job(
+            object_name,
+            prefix,
+            language,
+            file_id,
+            trg_type
+        ):
+        """
+        Sends an audio file to the OCI Speech service and waits for the transcription.
+
+        Args:
+            object_name (str) : The name of the object in the OCI bucket.
+            prefix (str)      : The output prefix for processed files.
+            language (str)    : The language of the document (e.g., 'English', 'Spanish').
+            file_id (str)     : The ID of the file to associate with the vector store.
+            trg_type (str)    : The type of target processing (e.g., 'SRT', 'TXT').
 
-            # Create the processor job and wait for completion
-            aiservicespeech_client = oci.ai_speech.AIServiceSpeechClient(config)
-            response = aiservicespeech_client.create_transcription_job(
-                create_transcription_job_details=transcription_job_details
+        Returns:
+            tuple: A success message and extracted data, or an error message.
+        """
+        try:
+            future = SpeechService.submit_job(
+                object_name,
+                prefix,
+                language,
+                file_id,
+                trg_type
             )
-            transcription_job = response.data
-
-            if transcription_job:
-                
-                while True:
-                    get_transcription_job_response = aiservicespeech_client.get_transcription_job(
-                        transcription_job_id = transcription_job.id)
-                    
-                    if get_transcription_job_response.data.lifecycle_state == "SUCCEEDED":
-                        break
-                    time.sleep(5)
-                
-                # Construct paths for processed objects                
-                transcription_object_base = transcription_job.output_location.prefix[:-1]
-                #object_name = transcription_job.input_location.object_locations.object_names
-
-                transcription_object_json  = f"{transcription_object_base}/{output_location.namespace_name}_{output_location.bucket_name}_{object_name}.json"
-                transcription_object_srt = f"{transcription_object_base}/{output_location.namespace_name}_{output_location.bucket_name}_{object_name}.srt"
-                
-                # Extract base path and filename without extension
-                base_path, file_name = object_name.rsplit("/", 1)
-                file_name = file_name.rsplit(".", 1)[0]
-
-                # Move JSON file
-                object_name_json = f"{base_path}/{file_name}_trg.json"
-                bucket_service.move_object(transcription_object_json, object_name_json)
-                
-                # Move SRT file
-                object_name_srt = f"{base_path}/{file_name}_trg.srt"
-                bucket_service.move_object(transcription_object_srt, object_name_srt)
-
-                # List and delete all objects in the processed folder
-                list_objects = bucket_service.list_objects(transcription_object_base)
-                for obj_name in list_objects:
-                    bucket_service.delete_object(obj_name)
-
-                # Build the new name for the processed file
-                object_name_trg_srt  = f"{object_name.rsplit('.', 1)[0]}_trg.srt"
-                object_name_trg_json = f"{object_name.rsplit('.', 1)[0]}_trg.json"
-                object_name_trg_txt  = f"{object_name.rsplit('.', 1)[0]}_trg.txt"
-
-                # Process
-                data_srt  = SpeechService.process_file(object_name_trg_srt)
-                data_json = SpeechService.process_file(object_name_trg_json)
-                data_txt  = SpeechService.process_transcriptions(data_json)
-
-                # Upload file to Bucket
-                bucket_service.upload_file(
-                    object_name     = object_name_trg_txt,
-                    put_object_body = data_txt,
-                    msg             = True
-                )
-
-                data = None
-
-                if trg_type == "SRT":
-                    data = data_srt
-                elif trg_type == "TXT":
-                    data = data_txt
-                
-                # Process file extraction
-                file_trg_extraction = str(data)
-                msg = db_file_service.update_extraction(file_id, file_trg_extraction)
-                component.get_toast(msg, ":material/database:")
-                
-                # Process Vector Store
-                msg = db_doc_service.vector_store(file_id)
-                component.get_toast(msg, ":material/database:")
-                
-                mg = f"[AI Speech] Module executed successfully."
+            result = SpeechService.get_job_result(future)
+            if result:
+                mg, data, _ = result
                 return mg, data
 
         except Exception as e:
@@ -230,13 +440,14 @@ class SpeechService:
 
 
     @staticmethod
-    def process_file(object_name, msg: bool = False):
+    def process_file(object_name, msg: bool = False, raise_errors: bool = False):
         """
         Processes a SRT/TXT file from the OCI bucket and extracts its content.
 
         Args:
             object_name (str): Name of the SRT object in the bucket.
             msg (bool): If True, shows a toast message upon successful processing.
+            raise_errors (bool): If True, failures are raised instead of displayed (no Streamlit session, e.g. job continuations).
 
         Returns:
             dict: The parsed SRT content as a dictionary.
@@ -247,6 +458,8 @@ class SpeechService:
             
             # Retrieve the JSON object from the bucket
             object = bucket_service.get_object(object_name)
+            if object is None and raise_errors:
+                raise RuntimeError(f"The object '{object_name}' could not be retrieved.")
 
             if object:
                 # Decode bytes to string and parse SRT
@@ -256,6 +469,8 @@ class SpeechService:
             return data
 
         except Exception as e:
+            if raise_errors:
+                raise
             component.get_error(f"[Error] Processing SRT:\n{e}")
             return []
         
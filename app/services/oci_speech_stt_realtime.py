@@ -1,11 +1,16 @@
 import asyncio
 import os
+import time
+import threading
+from collections import deque
 import av
+import numpy as np
 from dotenv import load_dotenv
 from oci.config import from_file
 from oci_ai_speech_realtime import RealtimeSpeechClient, RealtimeSpeechClientListener
 from oci.ai_speech.models import RealtimeParameters
 from streamlit_webrtc import AudioProcessorBase
+from streamlit.runtime.scriptrunner import add_script_run_ctx
 import streamlit as st
 
 language_map = {
@@ -19,6 +24,21 @@ load_dotenv()
 SAMPLE_RATE = 16000
 CHANNELS = 1
 BUFFER_DURATION_MS = 96
+PACKET_SAMPLES = SAMPLE_RATE * BUFFER_DURATION_MS // 1000
+PENDING_MAX_PACKETS = 1000
+SILENCE_PACKET = bytes(PACKET_SAMPLES * 2)
+
+# Warm session: pre-connect before audio arrives and keep the connection alive while idle
+PRECONNECT = os.getenv("CON_SPEECH_STT_PRECONNECT", "True").lower() == "true"
+IDLE_BUDGET_SECONDS = float(os.getenv("CON_SPEECH_STT_IDLE_BUDGET_SECONDS", "120"))
+KEEPALIVE_INTERVAL_SECONDS = float(os.getenv("CON_SPEECH_STT_KEEPALIVE_SECONDS", "1"))
+
+# Reconnects after unexpected closes: exponential backoff, limited attempts without audio in between
+RECONNECT_MAX_ATTEMPTS = int(os.getenv("CON_SPEECH_STT_RECONNECT_MAX_ATTEMPTS", "5"))
+RECONNECT_BACKOFF_SECONDS = float(os.getenv("CON_SPEECH_STT_RECONNECT_BACKOFF_SECONDS", "1"))
+RECONNECT_BACKOFF_MAX_SECONDS = 30
+
+_oci_config = None
 
 def get_realtime_parameters(customizations, compartment_id, language_code):
     """Configure OCI Speech Realtime parameters"""
@@ -42,21 +62,125 @@ def get_realtime_parameters(customizations, compartment_id, language_code):
 
     return realtime_speech_parameters
 
+class AudioChannel:
+    """
+    Thread-safe audio channel between the WebRTC audio thread and the OCI worker event loop.
+
+    `put` can be called from any thread and wakes the event loop directly through
+    `loop.call_soon_threadsafe`, so the worker awaits packets instead of polling.
+    Packets put while no loop is attached are kept (bounded) until the next `attach`.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loop = None
+        self._queue = None
+        self._pending = deque(maxlen=PENDING_MAX_PACKETS)
+
+    def attach(self, loop):
+        """
+        Binds the channel to an event loop.
+
+        Args:
+            loop (asyncio.AbstractEventLoop): The loop of the OCI worker thread.
+
+        Returns:
+            asyncio.Queue: The queue fed by `put`, to be consumed on that loop.
+        """
+        with self._lock:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            while self._pending:
+                self._queue.put_nowait(self._pending.popleft())
+            return self._queue
+
+    def detach(self):
+        """Unbinds the channel from its event loop."""
+        with self._lock:
+            self._loop = None
+            self._queue = None
+
+    def put(self, data):
+        """
+        Sends an audio packet (or None to end the session) to the attached loop.
+
+        Args:
+            data (bytes | None): The audio packet.
+        """
+        with self._lock:
+            loop, audio_queue = self._loop, self._queue
+            if loop is None:
+                self._pending.append(data)
+                return
+        try:
+            loop.call_soon_threadsafe(audio_queue.put_nowait, data)
+        except RuntimeError:
+            # The loop was closed between the check and the call
+            pass
+
+    def clear(self):
+        """Drops the packets that are waiting for a loop."""
+        with self._lock:
+            self._pending.clear()
+
+class AudioPacketBuffer:
+    """
+    Aggregates resampled samples into fixed-size PCM packets.
+
+    Samples are copied into one preallocated packet; every time it is full its
+    bytes are emitted (the one copy a packet gets, since it may wait in the
+    AudioChannel queue) and writing starts over, without allocating per frame.
+    """
+    def __init__(self, packet_samples=PACKET_SAMPLES):
+        self._buffer = np.zeros(packet_samples, dtype=np.int16)
+        self._packet_samples = packet_samples
+        self._fill = 0
+
+    def write(self, samples):
+        """
+        Appends int16 mono samples to the current packet.
+
+        Args:
+            samples (np.ndarray): The resampled samples.
+
+        Returns:
+            list: The packets completed by this write, as bytes.
+        """
+        packets = []
+        offset = 0
+        total = len(samples)
+        while offset < total:
+            count = min(self._packet_samples - self._fill, total - offset)
+            self._buffer[self._fill:self._fill + count] = samples[offset:offset + count]
+            self._fill += count
+            offset += count
+
+            if self._fill == self._packet_samples:
+                packets.append(self._buffer.tobytes())
+                self._fill = 0
+        return packets
+
 class OCIAudioProcessor(AudioProcessorBase):
     """WebRTC Audio Processor for OCI Speech"""
     def __init__(self):
         self.audio_queue = None
-        self.resampler = av.AudioResampler(format="s16", layout="mono", rate=16000)
+        self.resampler = av.AudioResampler(format="s16", layout="mono", rate=SAMPLE_RATE)
+        self.packet_buffer = AudioPacketBuffer()
+        # Counters to compare WebRTC frames received with packets sent to OCI
+        self.frames_received = 0
+        self.packets_sent = 0
 
     def recv(self, frame: av.AudioFrame) -> av.AudioFrame:
         if self.audio_queue is None:
             return frame
         
         try:
+            self.frames_received += 1
             resampled_frames = self.resampler.resample(frame)
             for resampled_frame in resampled_frames:
-                data = resampled_frame.to_ndarray().tobytes()
-                self.audio_queue.put(data)
+                # Aggregate ~10-20 ms frames into fixed BUFFER_DURATION_MS packets
+                for packet in self.packet_buffer.write(resampled_frame.to_ndarray().reshape(-1)):
+                    self.audio_queue.put(packet)
+                    self.packets_sent += 1
         except Exception:
             pass
         
@@ -64,12 +188,31 @@ class OCIAudioProcessor(AudioProcessorBase):
 
 class MyListener(RealtimeSpeechClientListener):
     """OCI Speech Realtime Client Listener"""
-    def __init__(self, display_transcription_final, display_transcription_partial):
+    def __init__(self, display_transcription_final, display_transcription_partial, on_metric=None):
         super().__init__()
         self.display_transcription_final = display_transcription_final
         self.display_transcription_partial = display_transcription_partial
+        self.on_metric = on_metric
+        self.connect_started = None
+        self.audio_started = None
+        self.first_result_reported = False
     
+    def report_metric(self, name, started):
+        """Reports the milliseconds elapsed since `started` once per connection"""
+        if self.on_metric and started is not None:
+            self.on_metric(name, (time.perf_counter() - started) * 1000)
+
+    def mark_audio(self):
+        """Marks the first real audio packet sent on this connection"""
+        if self.audio_started is None:
+            self.audio_started = time.perf_counter()
+
     def on_result(self, result):
+        if not self.first_result_reported:
+            # First result (partial or final) after audio started flowing
+            self.report_metric("first_partial_ms", self.audio_started)
+            self.first_result_reported = True
+
         if result["transcriptions"][0]["isFinal"]:
             transcription = result['transcriptions'][0]['transcription']
             self.display_transcription_final(transcription)
@@ -86,8 +229,9 @@ class MyListener(RealtimeSpeechClientListener):
         pass
 
     def on_connect_message(self, connectmessage):
-        """Handle server connection message"""
-        pass
+        """Handle server connection message (websocket and auth handshake done)"""
+        self.report_metric("connect_ms", self.connect_started)
+        self.connect_started = None
 
     def on_network_event(self, event):
         """Handle network events"""
@@ -101,25 +245,56 @@ class MyListener(RealtimeSpeechClientListener):
         """Handle connection close"""
         pass
 
-async def start_realtime_session(display_transcription_final, display_transcription_partial, language, input_queue):
+def get_oci_config():
+    """Reads the OCI config file once per process"""
+    global _oci_config
+    if _oci_config is None:
+        _oci_config = from_file()
+    return _oci_config
+
+async def start_realtime_session(display_transcription_final, display_transcription_partial, language, input_queue, on_metric=None):
     """
     Manages OCI Speech Realtime session with auto-reconnect logic.
-    Waits for audio data before connecting to avoid idle timeouts.
+
+    With pre-connect enabled (CON_SPEECH_STT_PRECONNECT) the websocket and auth
+    handshake start right away instead of on the first audio packet, and after a
+    disconnect the session reconnects immediately. While no audio arrives the
+    connection is kept warm with silence packets, up to the idle budget
+    (CON_SPEECH_STT_IDLE_BUDGET_SECONDS); once it is spent the connection is closed
+    and the next one waits for audio data, to avoid idle timeouts. The budget
+    counts from the last audio packet, so reconnects do not renew it.
+
+    After a close the app did not ask for (server close or failed handshake) the
+    reconnect waits an exponential backoff (CON_SPEECH_STT_RECONNECT_BACKOFF_SECONDS)
+    and sends no keep-alive until audio flows again: without audio it is closed as
+    idle and the next one waits for audio. After CON_SPEECH_STT_RECONNECT_MAX_ATTEMPTS
+    such closes without audio in between the session fails with ConnectionError.
     """
     language = language_map.get(language)
     customizations = []
     compartment_id = os.getenv("CON_COMPARTMENT_ID")
     language_code = language
     service_endpoint = os.getenv("CON_SPEECH_SERVICE_STT_ENDPOINT")
-    config = from_file()
+    config = get_oci_config()
+    warm = PRECONNECT
+    idle_since = time.monotonic()
+    failures = 0
 
     while True:
-        first_packet = await input_queue.get()
-        
-        if first_packet is None:
-            break
+        if failures:
+            if failures > RECONNECT_MAX_ATTEMPTS:
+                raise ConnectionError(f"OCI Speech Realtime closed the connection {failures} times in a row.")
+            await asyncio.sleep(min(RECONNECT_BACKOFF_SECONDS * 2 ** (failures - 1), RECONNECT_BACKOFF_MAX_SECONDS))
 
-        listener = MyListener(display_transcription_final, display_transcription_partial)
+        initial_packets = []
+        if not warm:
+            first_packet = await input_queue.get()
+            
+            if first_packet is None:
+                break
+            initial_packets.append(first_packet)
+
+        listener = MyListener(display_transcription_final, display_transcription_partial, on_metric)
         realtime_speech_parameters = get_realtime_parameters(
             customizations=customizations,
             compartment_id=compartment_id,
@@ -135,30 +310,59 @@ async def start_realtime_session(display_transcription_final, display_transcript
         )
 
         st.session_state.speech_client = client
+        session_state = {"stopped": False, "idle": False}
 
-        async def send_audio_loop(client_ref, initial_packet):
+        async def send_audio_loop(client_ref):
+            nonlocal idle_since, failures
             try:
-                if not client_ref.close_flag:
-                    await client_ref.send_data(initial_packet)
+                for packet in initial_packets:
+                    if not client_ref.close_flag:
+                        listener.mark_audio()
+                        await client_ref.send_data(packet)
+                        idle_since = time.monotonic()
+                        failures = 0
                 
                 while not client_ref.close_flag:
-                    data = await input_queue.get()
+                    try:
+                        data = await asyncio.wait_for(input_queue.get(), timeout=KEEPALIVE_INTERVAL_SECONDS)
+                    except asyncio.TimeoutError:
+                        # No audio: keep the connection warm until the idle budget is spent
+                        # (no keep-alive after an unexpected close until audio flows again)
+                        if failures or time.monotonic() - idle_since >= IDLE_BUDGET_SECONDS:
+                            session_state["idle"] = True
+                            client_ref.close()
+                            break
+                        await client_ref.send_data(SILENCE_PACKET)
+                        continue
+
                     if data is None:
+                        session_state["stopped"] = True
                         client_ref.close()
                         break
+                    listener.mark_audio()
                     await client_ref.send_data(data)
+                    idle_since = time.monotonic()
+                    failures = 0
                     
             except asyncio.CancelledError:
                 client_ref.close()
             except Exception:
                 client_ref.close()
 
-        send_task = asyncio.create_task(send_audio_loop(client, first_packet))
+        send_task = asyncio.create_task(send_audio_loop(client))
 
         try:
+            listener.connect_started = time.perf_counter()
             await client.connect()
+            # Reconnect right away unless the connection was closed for being idle (after a backoff if unexpected)
+            warm = PRECONNECT and not session_state["idle"]
+            unexpected = not (session_state["stopped"] or session_state["idle"])
         except Exception:
-            pass
+            # Do not retry eagerly after a failed handshake; wait for audio instead
+            warm = False
+            unexpected = True
+        if unexpected:
+            failures += 1
 
         if not send_task.done():
             send_task.cancel()
@@ -167,6 +371,61 @@ async def start_realtime_session(display_transcription_final, display_transcript
             except:
                 pass
 
+        if session_state["stopped"]:
+            break
+
+def create_realtime_worker(audio_channel, result_queue, language):
+    """
+    Starts the OCI Speech realtime worker thread of a WebRTC session.
+
+    The worker runs its own event loop, consumes the audio of `audio_channel` and
+    puts ("final" | "partial" | "error", text) and ("metric", (name, ms)) tuples
+    into `result_queue`.
+
+    Args:
+        audio_channel (AudioChannel): The channel fed by `OCIAudioProcessor`.
+        result_queue (queue.Queue): The queue read by the Streamlit page.
+        language (str): The language of the session (e.g., 'Spanish').
+
+    Returns:
+        threading.Thread: The started worker thread.
+    """
+    def oci_worker():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        input_queue = audio_channel.attach(loop)
+
+        def on_final(text):
+            result_queue.put(("final", text))
+
+        def on_partial(text):
+            result_queue.put(("partial", text))
+
+        def on_metric(name, value):
+            result_queue.put(("metric", (name, value)))
+
+        try:
+            loop.run_until_complete(
+                start_realtime_session(on_final, on_partial, language, input_queue, on_metric)
+            )
+        except Exception as e:
+            print(f"OCI Worker Error: {e}")
+            result_queue.put(("error", str(e)))
+        finally:
+            audio_channel.detach()
+            # Run pending cleanup tasks
+            try:
+                pending = asyncio.all_tasks(loop)
+                loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            except Exception:
+                pass
+            loop.close()
+
+    thread = threading.Thread(target=oci_worker, daemon=True)
+    add_script_run_ctx(thread)
+    thread.start()
+    return thread
+
 def stop_realtime_session():
     """Stop the current realtime session"""
     client = st.session_state.get("speech_client")
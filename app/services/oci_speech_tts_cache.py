@@ -0,0 +1,167 @@
+import os
+import re
+import json
+import hashlib
+import threading
+import unicodedata
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# --- Cache Configuration ---
+CACHE_DIRECTORY = os.getenv('CON_SPEECH_TTS_CACHE_DIR', 'cache/tts')
+CACHE_MAX_BYTES = int(float(os.getenv('CON_SPEECH_TTS_CACHE_MAX_MB', '200')) * 1024 * 1024)
+CACHE_EVICT_TO  = 0.9  # An eviction frees space down to this fraction of CACHE_MAX_BYTES
+# ---------------------------
+
+
+class TTSCacheService:
+    """
+    Size-bounded, disk-backed LRU cache for synthesized speech.
+
+    Entries are files in a directory shared by every worker process, so a
+    clip synthesized by one session is reused by all of them. The access
+    time of an entry is its file modification time, refreshed on every hit,
+    and the least recently used files are evicted once the directory grows
+    beyond `CACHE_MAX_BYTES`.
+
+    The size is tracked in memory: the directory is scanned once per process
+    and then only when the tracked size goes over the limit, down to
+    `CACHE_EVICT_TO` of it. Writes of other workers are seen on that scan.
+    """
+    _instance = None
+    _lock     = threading.Lock()
+
+    def __new__(cls):
+        with cls._lock:
+            if cls._instance is None:
+                instance = super(TTSCacheService, cls).__new__(cls)
+                instance._stats_lock = threading.Lock()
+                instance._hits       = 0
+                instance._misses     = 0
+                instance._entries    = 0
+                instance._bytes      = 0
+                os.makedirs(CACHE_DIRECTORY, exist_ok=True)
+                instance.evict()
+                cls._instance = instance
+        return cls._instance
+
+    @staticmethod
+    def get_key(text, voice_id, language_code, sample_rate, output_format):
+        """
+        Builds the cache key of a synthesis request.
+
+        Args:
+            text (str)          : The text to synthesize, normalized before hashing.
+            voice_id (str)      : The TTS voice.
+            language_code (str) : The language of the voice.
+            sample_rate (int)   : The sample rate in Hz.
+            output_format (str) : The audio format (MP3, PCM...).
+
+        Returns:
+            str: A hex digest identifying the audio.
+        """
+        normalized = re.sub(r"\s+", " ", unicodedata.normalize("NFC", text or "")).strip()
+        payload    = json.dumps([normalized, voice_id, language_code, sample_rate, output_format], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _get_path(self, key):
+        return os.path.join(CACHE_DIRECTORY, f"{key}.bin")
+
+    def get(self, key):
+        """
+        Returns the cached audio of a key, or None on a miss.
+        """
+        path = self._get_path(key)
+        try:
+            with open(path, "rb") as file:
+                audio_bytes = file.read()
+            # Mark as recently used
+            os.utime(path, None)
+        except OSError:
+            audio_bytes = None
+
+        with self._stats_lock:
+            if audio_bytes:
+                self._hits += 1
+            else:
+                self._misses += 1
+        return audio_bytes or None
+
+    def put(self, key, audio_bytes):
+        """
+        Stores the audio of a key and, when the tracked size exceeds `CACHE_MAX_BYTES`,
+        evicts the least recently used entries.
+        The file is written under a temporary name and renamed, so concurrent readers
+        in other workers never see a partial clip.
+        """
+        if not audio_bytes:
+            return
+        path     = self._get_path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as file:
+                file.write(audio_bytes)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[Error] TTS cache write:\n{e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+
+        with self._stats_lock:
+            self._entries += 1
+            self._bytes   += len(audio_bytes)
+            full = self._bytes > CACHE_MAX_BYTES
+        if full:
+            self.evict(int(CACHE_MAX_BYTES * CACHE_EVICT_TO))
+
+    def evict(self, max_bytes=CACHE_MAX_BYTES):
+        """
+        Scans the directory and removes the least recently used entries until the cache
+        fits in `max_bytes`; the scanned size becomes the tracked size.
+        """
+        entries = []
+        for entry in os.scandir(CACHE_DIRECTORY):
+            if not entry.name.endswith(".bin"):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                # Evicted by another worker
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        count = len(entries)
+        for _, size, path in sorted(entries):
+            if total <= max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+            count -= 1
+
+        with self._stats_lock:
+            self._entries = count
+            self._bytes   = total
+
+    def get_stats(self):
+        """
+        Returns the hit-rate metrics of this process and the tracked cache size.
+
+        Returns:
+            dict: hits, misses, hit_rate (0-1), entries and bytes.
+        """
+        with self._stats_lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits"     : self._hits,
+                "misses"   : self._misses,
+                "hit_rate" : self._hits / lookups if lookups else 0.0,
+                "entries"  : self._entries,
+                "bytes"    : self._bytes
+            }
@@ -1,36 +1,59 @@
 import oci
 import os
+import re
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from oci.ai_speech.models import SynthesizeSpeechDetails, TtsOracleConfiguration, TtsOracleTts2NaturalModelDetails, TtsOracleSpeechSettings
 
+from .oci_speech_tts_cache import TTSCacheService
+
 # --- TTS Configuration ---
 # We can make these configurable via .env if needed later
 VOICE_ID = "Mateo"
+LANGUAGE_CODE = "es-ES"
 OUTPUT_FORMAT = TtsOracleSpeechSettings.OUTPUT_FORMAT_MP3
 SAMPLE_RATE = 24000
+# Streaming: sentences shorter than this are merged with the next one
+MIN_SEGMENT_CHARS = int(os.getenv('CON_SPEECH_TTS_MIN_SEGMENT_CHARS', '40'))
+TTS_WORKERS = int(os.getenv('CON_SPEECH_TTS_WORKERS', '4'))
 # -------------------------
 
+# Sentence boundary: closing punctuation followed by whitespace, or a line break
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?;:…])\s+|\n+")
+
+_speech_client = None
+_speech_client_lock = threading.Lock()
+_tts_executor = ThreadPoolExecutor(max_workers=TTS_WORKERS, thread_name_prefix="oci-tts")
+tts_cache = TTSCacheService()
+
 def get_speech_client():
     """
-    Creates and returns an OCI AI Speech Service client.
+    Returns the OCI AI Speech Service client, created once per process.
     It reuses the default OCI config file (~/.oci/config).
     """
-    config = oci.config.from_file()
-    # Use the TTS endpoint from environment variables
-    endpoint = os.getenv('CON_SPEECH_SERVICE_TTS_ENDPOINT')
-    
-    # We create a signer from the default config file
-    signer = oci.signer.Signer(
-        tenancy=config["tenancy"],
-        user=config["user"],
-        fingerprint=config["fingerprint"],
-        private_key_file_location=config["key_file"]
-    )
-    
-    return oci.ai_speech.AIServiceSpeechClient(config, signer=signer, service_endpoint=endpoint)
+    global _speech_client
+    with _speech_client_lock:
+        if _speech_client is None:
+            config = oci.config.from_file()
+            # Use the TTS endpoint from environment variables
+            endpoint = os.getenv('CON_SPEECH_SERVICE_TTS_ENDPOINT')
+            
+            # We create a signer from the default config file
+            signer = oci.signer.Signer(
+                tenancy=config["tenancy"],
+                user=config["user"],
+                fingerprint=config["fingerprint"],
+                private_key_file_location=config["key_file"]
+            )
+            
+            _speech_client = oci.ai_speech.AIServiceSpeechClient(config, signer=signer, service_endpoint=endpoint)
+        return _speech_client
 
 def text_to_speech(text_to_synthesize: str):
     """
     Synthesizes text into speech using OCI TTS and returns the audio as bytes.
+    Repeated texts are served from the shared disk cache.
 
     Args:
         text_to_synthesize: The text to be converted to speech.
@@ -38,6 +61,11 @@ def text_to_speech(text_to_synthesize: str):
     Returns:
         The audio data as bytes (in MP3 format), or None if an error occurs.
     """
+    cache_key = tts_cache.get_key(text_to_synthesize, VOICE_ID, LANGUAGE_CODE, SAMPLE_RATE, OUTPUT_FORMAT)
+    audio_bytes = tts_cache.get(cache_key)
+    if audio_bytes:
+        return audio_bytes
+
     try:
         client = get_speech_client()
         compartment_id = os.getenv('CON_COMPARTMENT_ID')
@@ -49,7 +77,7 @@ def text_to_speech(text_to_synthesize: str):
             text=text_to_synthesize,
             compartment_id=compartment_id,
             configuration=TtsOracleConfiguration(
-                model_details=TtsOracleTts2NaturalModelDetails(voice_id=VOICE_ID,language_code="es-ES"),
+                model_details=TtsOracleTts2NaturalModelDetails(voice_id=VOICE_ID,language_code=LANGUAGE_CODE),
                 speech_settings=TtsOracleSpeechSettings(
                     sample_rate_in_hz=SAMPLE_RATE,
                     output_format=OUTPUT_FORMAT
@@ -62,9 +90,110 @@ def text_to_speech(text_to_synthesize: str):
         if response.status == 200:
             # The response.data is a stream. We need to read it into memory.
             audio_bytes = b"".join(chunk for chunk in response.data.iter_content())
+            tts_cache.put(cache_key, audio_bytes)
             return audio_bytes
         else:
             return None
             
     except Exception as e:
         return None
+
+def split_sentences(text: str, min_chars: int = MIN_SEGMENT_CHARS):
+    """
+    Splits a text into speakable segments at sentence boundaries.
+    Sentences shorter than `min_chars` are merged with the next one to avoid tiny requests.
+
+    Args:
+        text: The text to split.
+        min_chars: The minimum length of a segment.
+
+    Returns:
+        A list of segments.
+    """
+    segments = []
+    current = ""
+    for sentence in SENTENCE_BOUNDARY.split(text or ""):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        current = f"{current} {sentence}".strip()
+        if len(current) >= min_chars:
+            segments.append(current)
+            current = ""
+    if current:
+        segments.append(current)
+    return segments
+
+def iter_segments(text_chunks, min_chars: int = MIN_SEGMENT_CHARS):
+    """
+    Cuts a stream of text chunks (e.g. LLM tokens) into speakable segments.
+    A segment is yielded as soon as its sentence is complete; the unfinished
+    tail is kept until more text arrives.
+
+    Args:
+        text_chunks: An iterable of text fragments.
+        min_chars: The minimum length of a segment.
+
+    Yields:
+        The segments, in order.
+    """
+    buffer = ""
+    for chunk in text_chunks:
+        buffer += chunk
+        boundaries = list(SENTENCE_BOUNDARY.finditer(buffer))
+        if not boundaries:
+            continue
+        head, buffer = buffer[:boundaries[-1].start()], buffer[boundaries[-1].end():]
+        segments = split_sentences(head, min_chars)
+        # A short last sentence waits to be merged with the next one
+        if segments and len(segments[-1]) < min_chars:
+            buffer = f"{segments.pop()} {buffer}"
+        yield from segments
+    yield from split_sentences(buffer, min_chars)
+
+def text_to_speech_pipeline(text_chunks):
+    """
+    Pipelines text generation and synthesis: the text chunks are consumed and
+    segmented on a background thread, each segment is synthesized on the TTS pool
+    as soon as it is complete, and the audio is yielded in order.
+
+    Args:
+        text_chunks: An iterable of text fragments (e.g. LLM tokens).
+
+    Yields:
+        Tuples (segment, audio_bytes). audio_bytes is None if the segment failed.
+        Errors raised by the text source are re-raised to the consumer.
+    """
+    pending = queue.Queue()
+
+    def produce():
+        try:
+            for segment in iter_segments(text_chunks):
+                pending.put((segment, _tts_executor.submit(text_to_speech, segment)))
+        except Exception as e:
+            pending.put(e)
+        finally:
+            pending.put(None)
+
+    threading.Thread(target=produce, name="oci-tts-pipeline", daemon=True).start()
+
+    while (item := pending.get()) is not None:
+        if isinstance(item, Exception):
+            raise item
+        segment, future = item
+        yield segment, future.result()
+
+def text_to_speech_stream(text_to_synthesize: str):
+    """
+    Synthesizes a text sentence by sentence, concurrently, and yields the audio in order.
+    The first segment can be played while the following ones are still being synthesized.
+
+    Args:
+        text_to_synthesize: The text to be converted to speech.
+
+    Yields:
+        The audio data of each segment as bytes (in MP3 format). Failed segments are skipped.
+    """
+    for _, audio_bytes in text_to_speech_pipeline([text_to_synthesize]):
+        if audio_bytes:
+            yield audio_bytes
@@ -1,5 +1,13 @@
 from .functions import FunctionService
+from .journal import JournalService
+from .profiling import DataProfileService
+from .quiz_sampler import QuizSamplerService
+from .quiz_store import QuizStoreService
 
 __all__ = [
-    "FunctionService"
+    "FunctionService",
+    "JournalService",
+    "DataProfileService",
+    "QuizSamplerService",
+    "QuizStoreService"
 ]
\ No newline at end of file
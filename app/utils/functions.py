@@ -5,8 +5,10 @@ import time
 import random
 import string
 import base64
+import threading
 import pandas as pd
 import streamlit as st
+from collections import OrderedDict
 from graphviz import Digraph
 from typing import List, Tuple
 from dotenv import load_dotenv
@@ -16,6 +18,11 @@ from langchain.schema import HumanMessage, AIMessage
 
 load_dotenv()
 
+# Memoized results of FunctionService.get_tables_json (LRU)
+TABLES_JSON_CACHE_SIZE = 32
+_tables_json_cache     = OrderedDict()
+_tables_json_lock      = threading.Lock()  # Streamlit runs every session in its own thread
+
 class FunctionService:
     """
     Class:
@@ -102,20 +109,52 @@ class FunctionService:
     
     @staticmethod
     def get_tables_json(df, group_by_columns, fields):
-        data = {}
+        """
+        Groups the rows of a DataFrame into {"key": [ {field: value, ...}, ... ]}, where the
+        key joins the group_by_columns with '.'. Built from column arrays (no iterrows) and
+        memoized by the content hash of the DataFrame, so reruns over the same metadata are free.
 
-        for _, row in df.iterrows():
-            # Construir la clave principal basada en las columnas de agrupación
-            group_key = ".".join(str(row[col]) for col in group_by_columns)
+        Args:
+            df (pd.DataFrame)      : The rows.
+            group_by_columns (list): Columns that form the group key.
+            fields (dict)          : Output field name -> DataFrame column.
 
-            if group_key not in data:
-                data[group_key] = []
+        Returns:
+            dict: The grouped records (shared with later calls on the same data; do not modify).
+        """
+        try:
+            cache_key = (
+                pd.util.hash_pandas_object(df, index=False).values.tobytes(),
+                tuple(df.columns),
+                tuple(group_by_columns),
+                tuple(fields.items())
+            )
+        except TypeError:
+            # Unhashable cells (lists, dicts...): compute without memoization
+            cache_key = None
 
-            # Crear el diccionario para los campos
-            item = {field_name: row[col_name] for field_name, col_name in fields.items()}
-            
-            data[group_key].append(item)
+        if cache_key is not None:
+            with _tables_json_lock:
+                if cache_key in _tables_json_cache:
+                    _tables_json_cache.move_to_end(cache_key)
+                    return _tables_json_cache[cache_key]
 
+        keys = df[group_by_columns[0]].astype(str)
+        for col in group_by_columns[1:]:
+            keys = keys + "." + df[col].astype(str)
+
+        names   = list(fields.keys())
+        records = (dict(zip(names, values)) for values in zip(*(df[col].tolist() for col in fields.values())))
+
+        data = {}
+        for key, item in zip(keys.tolist(), records):
+            data.setdefault(key, []).append(item)
+
+        if cache_key is not None:
+            with _tables_json_lock:
+                _tables_json_cache[cache_key] = data
+                if len(_tables_json_cache) > TABLES_JSON_CACHE_SIZE:
+                    _tables_json_cache.popitem(last=False)
         return data
     
     @staticmethod
@@ -136,13 +175,26 @@ class FunctionService:
             if "start_time" not in st.session_state:
                 return "Timer was not started. Use control = 1 to start the timer."
             
-            elapsed_time = int(time.time() - st.session_state.start_time)
-            hours = elapsed_time // 3600
-            minutes = (elapsed_time % 3600) // 60
-            seconds = elapsed_time % 60
-            return f"{hours:02}:{minutes:02}:{seconds:02}"
+            return FunctionService.get_time_format(time.time() - st.session_state.start_time)
         else:
             return "Invalid control value. Use 1 to start and 0 to stop."
+
+    @staticmethod
+    def get_time_format(elapsed_seconds):
+        """
+        Formats a number of seconds as 'HH:MM:SS'.
+
+        Args:
+            elapsed_seconds (float): The elapsed time in seconds.
+
+        Returns:
+            str: Elapsed time in 'HH:MM:SS' format.
+        """
+        elapsed_time = int(elapsed_seconds)
+        hours = elapsed_time // 3600
+        minutes = (elapsed_time % 3600) // 60
+        seconds = elapsed_time % 60
+        return f"{hours:02}:{minutes:02}:{seconds:02}"
     
     @staticmethod
     def get_name_from_path(path: str) -> str:
@@ -280,4 +332,53 @@ class FunctionService:
 
         return text
     
-    
\ No newline at end of file
+    
+
+
+if __name__ == "__main__":
+    # Benchmark: get_tables_json over 10k metadata rows (iterrows vs. column arrays vs. memoized)
+    import numpy as np
+
+    def get_tables_json_iterrows(df, group_by_columns, fields):
+        data = {}
+        for _, row in df.iterrows():
+            group_key = ".".join(str(row[col]) for col in group_by_columns)
+            data.setdefault(group_key, []).append({field_name: row[col_name] for field_name, col_name in fields.items()})
+        return data
+
+    rows = 10_000
+    rng  = np.random.default_rng(0)
+    df   = pd.DataFrame({
+        "OWNER"          : rng.choice(["SEL_AI_USER_ID_1", "SEL_AI_USER_ID_2"], rows),
+        "TABLE_NAME"     : [f"TABLE_{i // 25:04d}" for i in range(rows)],
+        "COLUMN_NAME"    : [f"COLUMN_{i % 25:02d}" for i in range(rows)],
+        "DATA_TYPE"      : rng.choice(["NUMBER", "VARCHAR2", "DATE"], rows),
+        "COMMENTS"       : rng.choice(["Identifier", "Amount in USD", None], rows),
+        "UI_DISPLAY"     : rng.choice(["Id", "Amount", None], rows),
+        "CLASSIFICATION" : rng.choice(["PII", None], rows)
+    })
+    group_by_columns = ["OWNER", "TABLE_NAME"]
+    fields = {
+        "column_name"    : "COLUMN_NAME",
+        "data_type"      : "DATA_TYPE",
+        "comments"       : "COMMENTS",
+        "ui_display"     : "UI_DISPLAY",
+        "classification" : "CLASSIFICATION"
+    }
+
+    def measure(function, repeat):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            result = function()
+        return result, (time.perf_counter() - started) * 1000 / repeat
+
+    expected, iterrows_ms = measure(lambda: get_tables_json_iterrows(df, group_by_columns, fields), 3)
+    _tables_json_cache.clear()
+    result, first_ms      = measure(lambda: FunctionService.get_tables_json(df, group_by_columns, fields), 1)
+    _, memoized_ms        = measure(lambda: FunctionService.get_tables_json(df.copy(), group_by_columns, fields), 10)
+    assert result == expected
+
+    print(f"{rows} rows")
+    print(f"  iterrows       : {iterrows_ms:8.1f} ms")
+    print(f"  column arrays  : {first_ms:8.1f} ms ({iterrows_ms / first_ms:.0f}x)")
+    print(f"  memoized (hash): {memoized_ms:8.1f} ms ({iterrows_ms / memoized_ms:.0f}x)")
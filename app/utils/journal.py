@@ -0,0 +1,194 @@
+import os
+import json
+import time
+import threading
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# --- Journal Configuration ---
+FSYNC_EVERY            = int(os.getenv('CON_JOURNAL_FSYNC_EVERY', '20'))
+FSYNC_INTERVAL_SECONDS = float(os.getenv('CON_JOURNAL_FSYNC_INTERVAL_SECONDS', '1'))
+# -----------------------------
+
+
+class JournalService:
+    """
+    Append-only JSON Lines journal.
+
+    Each record is written as one line and flushed to the OS right away, so a
+    crashed worker never loses it; the more expensive `fsync` is batched every
+    `fsync_every` records or `fsync_interval` seconds, whichever comes first.
+    Appending is O(1) regardless of how many records the journal holds.
+    """
+
+    def __init__(self, path, fsync_every=FSYNC_EVERY, fsync_interval=FSYNC_INTERVAL_SECONDS):
+        """
+        Args:
+            path (str | Path)      : The .jsonl file of the journal.
+            fsync_every (int)      : Records written between two fsync calls.
+            fsync_interval (float) : Maximum seconds a record stays without fsync.
+        """
+        self.path           = Path(path)
+        self.fsync_every    = fsync_every
+        self.fsync_interval = fsync_interval
+        self._lock          = threading.Lock()
+        self._file          = None
+        self._unsynced      = 0
+        self._last_sync     = time.monotonic()
+
+    def load(self, legacy_path=None):
+        """
+        Reads every record of the journal. A line that cannot be decoded (crash while writing) is skipped.
+
+        Args:
+            legacy_path (str | Path) : Optional JSON array file migrated into the journal when it does not exist yet;
+                                       once migrated it is renamed to `<name>.migrated`, so it is not read again.
+
+        Returns:
+            list: The records, in order.
+        """
+        if not self.path.exists() and legacy_path and Path(legacy_path).exists() and Path(legacy_path).stat().st_size > 0:
+            legacy_path = Path(legacy_path)
+            with open(legacy_path, "r", encoding="utf-8") as f:
+                records = json.load(f)
+            self.clear()
+            for record in records:
+                self.append(record)
+            self.sync()
+            legacy_path.replace(legacy_path.with_name(legacy_path.name + ".migrated"))
+            return records
+
+        records = []
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        records.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        continue
+        return records
+
+    def append(self, record):
+        """
+        Appends a record to the journal.
+
+        Args:
+            record (dict) : A JSON-serializable record.
+        """
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._repair()
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(line)
+            self._file.flush()
+            self._unsynced += 1
+            if self._unsynced >= self.fsync_every or time.monotonic() - self._last_sync >= self.fsync_interval:
+                self._sync()
+
+    def _repair(self):
+        """
+        Truncates a partial last line (crash while writing) back to the last newline,
+        so the next record does not get appended to it.
+        """
+        if not self.path.exists():
+            return
+        with open(self.path, "rb+") as f:
+            end = f.seek(0, os.SEEK_END)
+            pos = end
+            while pos > 0:
+                size = min(4096, pos)
+                f.seek(pos - size)
+                chunk = f.read(size)
+                newline = chunk.rfind(b"\n")
+                if newline >= 0:
+                    pos = pos - size + newline + 1
+                    break
+                pos -= size
+            if pos < end:
+                f.truncate(pos)
+
+    def sync(self):
+        """
+        Forces the pending records to disk.
+        """
+        with self._lock:
+            self._sync()
+
+    def _sync(self):
+        if self._file is not None and self._unsynced:
+            os.fsync(self._file.fileno())
+        self._unsynced  = 0
+        self._last_sync = time.monotonic()
+
+    def clear(self):
+        """
+        Empties the journal.
+        """
+        with self._lock:
+            self._close(sync=False)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            open(self.path, "w", encoding="utf-8").close()
+
+    def remove(self):
+        """
+        Closes the journal and deletes its file (its records are no longer needed).
+        """
+        with self._lock:
+            self._close(sync=False)
+            self.path.unlink(missing_ok=True)
+
+    def close(self):
+        """
+        Syncs and closes the journal. It is reopened on the next append.
+        """
+        with self._lock:
+            self._close()
+
+    def _close(self, sync=True):
+        if self._file is not None:
+            if sync:
+                self._sync()
+            self._file.close()
+            self._file = None
+            self._unsynced = 0
+
+
+if __name__ == "__main__":
+    # Benchmark: full JSON rewrite per utterance vs. journal append (2,000 utterances)
+    import tempfile
+
+    utterances = 2000
+    records    = [
+        {"id": i + 1, "transcription": f"Utterance number {i + 1}, " + "lorem ipsum dolor sit amet " * 4, "timestamp": "2026-01-01T00:00:00"}
+        for i in range(utterances)
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        json_path = Path(tmp_dir) / "transcription.json"
+        started   = time.perf_counter()
+        for i in range(1, utterances + 1):
+            with open(json_path, "w", encoding="utf-8") as f:
+                json.dump(records[:i], f, ensure_ascii=False)
+        rewrite_seconds = time.perf_counter() - started
+
+        journal = JournalService(Path(tmp_dir) / "transcription.jsonl")
+        started = time.perf_counter()
+        for record in records:
+            journal.append(record)
+        journal.close()
+        journal_seconds = time.perf_counter() - started
+
+        assert journal.load() == records
+
+    print(f"{utterances} utterances")
+    print(f"  json.dump rewrite : {rewrite_seconds * 1000:9.1f} ms")
+    print(f"  JSONL journal     : {journal_seconds * 1000:9.1f} ms (fsync every {FSYNC_EVERY} records / {FSYNC_INTERVAL_SECONDS}s)")
+    print(f"  speed-up          : {rewrite_seconds / journal_seconds:9.1f}x")
@@ -0,0 +1,149 @@
+import os
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# --- Profiling Configuration ---
+TOKEN_BUDGET    = int(os.getenv('CON_ANALYTICS_TOKEN_BUDGET', '2000'))
+CHARS_PER_TOKEN = 4
+TOP_K           = 5
+SAMPLE_ROWS     = 10
+# -------------------------------
+
+
+class DataProfileService:
+    """
+    Summarizes query results for LLM prompts under a token budget.
+
+    Small results are sent as rows; larger ones are replaced by a profile
+    computed with vectorized pandas/NumPy operations (describe, null ratios,
+    top-k categories and a small stratified sample), whose size does not
+    grow with the number of rows.
+    """
+
+    @staticmethod
+    def get_tokens(text):
+        """
+        Estimates the number of tokens of a text (~4 characters per token).
+        """
+        return len(text) // CHARS_PER_TOKEN + 1
+
+    @staticmethod
+    def get_stratified_sample(df, sample_rows=SAMPLE_ROWS, seed=0):
+        """
+        Returns a small sample stratified by the lowest-cardinality categorical column.
+
+        Args:
+            df (pd.DataFrame) : The data.
+            sample_rows (int) : Rows of the sample.
+            seed (int)        : Random seed, so the same data gives the same sample.
+
+        Returns:
+            pd.DataFrame: The sample.
+        """
+        if df.empty or sample_rows <= 0:
+            return df.head(0)
+
+        # Draw a bounded pool first, so large tables are never fully shuffled
+        pool       = df.sample(n=min(len(df), sample_rows * 100), random_state=seed)
+        categories = pool.select_dtypes(exclude="number").nunique()
+        categories = categories[(categories > 1) & (categories <= sample_rows)]
+        if categories.empty:
+            return pool.head(sample_rows)
+
+        column = categories.idxmin()
+        return pool.groupby(column, sort=False, dropna=False).head(max(1, sample_rows // categories[column])).head(sample_rows)
+
+    @staticmethod
+    def get_profile(df, top_k=TOP_K, sample_rows=SAMPLE_ROWS):
+        """
+        Builds a compact text profile of a DataFrame.
+
+        Args:
+            df (pd.DataFrame) : The data.
+            top_k (int)       : Most frequent values listed per categorical column.
+            sample_rows (int) : Rows of the stratified sample (0 to omit it).
+
+        Returns:
+            str: The profile.
+        """
+        lines   = [f"Rows: {len(df)}, Columns: {df.shape[1]}"]
+        numeric = df.select_dtypes(include="number")
+
+        null_ratio = df.isna().mean()
+        null_ratio = null_ratio[null_ratio > 0]
+        if not null_ratio.empty:
+            lines.append("Null ratio: " + ", ".join(f"{column}={ratio:.1%}" for column, ratio in null_ratio.items()))
+
+        if not numeric.empty:
+            summary = numeric.describe().T.round(4)
+            lines.append("Numeric summary:\n" + summary.to_csv())
+
+        for column in df.columns.difference(numeric.columns, sort=False):
+            counts = df[column].value_counts()
+            if counts.size == len(df):
+                # Identifiers, names... their top values say nothing
+                lines.append(f"{column}: all values distinct")
+                continue
+            top    = ", ".join(f"{value} ({count})" for value, count in counts.head(top_k).items())
+            lines.append(f"{column}: {counts.size} distinct; top: {top}")
+
+        sample = DataProfileService.get_stratified_sample(df, sample_rows)
+        if not sample.empty:
+            lines.append("Stratified sample:\n" + sample.to_csv(index=False))
+
+        return "\n".join(lines)
+
+    @staticmethod
+    def get_prompt_data(df, token_budget=TOKEN_BUDGET):
+        """
+        Chooses how a result is sent to the LLM: all rows when they fit in the
+        budget, otherwise the profile (reduced further if needed).
+
+        Args:
+            df (pd.DataFrame)  : The data.
+            token_budget (int) : Maximum tokens for the data.
+
+        Returns:
+            tuple: (text, mode) where mode is "rows" or "profile".
+        """
+        # Estimate the size of all rows from the first ones, without serializing everything
+        head   = df.head(100)
+        tokens = DataProfileService.get_tokens(head.to_csv(index=False)) * len(df) / max(len(head), 1)
+
+        if tokens <= token_budget:
+            text, mode = df.to_csv(index=False), "rows"
+        else:
+            mode = "profile"
+            text = DataProfileService.get_profile(df)
+            if DataProfileService.get_tokens(text) > token_budget:
+                text = DataProfileService.get_profile(df, top_k=3, sample_rows=0)
+            text = text[:token_budget * CHARS_PER_TOKEN]
+
+        print(f"[Analytics] Prompt data: {mode} ({len(df)} rows, ~{DataProfileService.get_tokens(text)} tokens, budget {token_budget})")
+        return text, mode
+
+
+if __name__ == "__main__":
+    # Benchmark: prompt size and profiling latency (titanic.csv and a synthetic 1M-row table)
+    import time
+
+    titanic = pd.read_csv(os.path.join(os.path.dirname(__file__), "..", "data", "knowledge_examples", "1_module", "titanic.csv"))
+    rng     = np.random.default_rng(0)
+    rows    = 1_000_000
+    synthetic = pd.DataFrame({
+        "REGION"   : rng.choice(["NORTH", "SOUTH", "EAST", "WEST"], rows),
+        "PRODUCT"  : rng.choice([f"P{i:03d}" for i in range(200)], rows),
+        "QUANTITY" : rng.integers(1, 100, rows),
+        "AMOUNT"   : rng.normal(500, 150, rows).round(2),
+        "DISCOUNT" : np.where(rng.random(rows) < 0.2, np.nan, rng.random(rows).round(3))
+    })
+
+    for name, df in [("titanic.csv", titanic), ("synthetic 1M rows", synthetic)]:
+        raw_tokens = DataProfileService.get_tokens(df.to_csv(index=False))
+        started    = time.perf_counter()
+        text, mode = DataProfileService.get_prompt_data(df)
+        elapsed    = (time.perf_counter() - started) * 1000
+        print(f"{name}: raw ~{raw_tokens} tokens -> {mode} ~{DataProfileService.get_tokens(text)} tokens in {elapsed:.0f} ms")
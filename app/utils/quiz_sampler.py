@@ -0,0 +1,256 @@
+import json
+import threading
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+
+# Parsed question banks of QuizSamplerService.get_bank (LRU, one per question set)
+QUIZ_BANK_CACHE_SIZE = 16
+_quiz_bank_cache     = OrderedDict()
+_quiz_bank_lock      = threading.Lock()  # Streamlit runs every session in its own thread
+
+class QuizSamplerService:
+    """
+    Stratified question sampling for a quiz start.
+
+    The questions of a file (QuizService.get_quiz_questions_cache) are turned once
+    into a bank of column arrays, with the options of each language parsed
+    once and the questions grouped by module. A quiz is then drawn in one
+    vectorized pass: module quotas, a random rank of every question inside
+    its module, the trim/fill to the requested size and one option
+    permutation per question shared by all languages. The same seed gives
+    the same quiz.
+    """
+
+    @staticmethod
+    def get_array(values):
+        """
+        Returns a 1-D object array of a list (lists as items are kept, not broadcast).
+        """
+        array = np.empty(len(values), dtype=object)
+        array[:] = values
+        return array
+
+    @staticmethod
+    def get_bank(df_questions):
+        """
+        Builds (or returns the memoized) bank of a questions DataFrame.
+
+        Args:
+            df_questions (pd.DataFrame) : Questions of a file (QUIZ_ID, MODULE_ID, MODULE_PERCENTAGE, OPTIONS_xx...).
+
+        Returns:
+            dict: columns (object arrays), options and option_counts per language (see get_options),
+                module_codes, module_percentages and module_counts.
+        """
+        # Reloading a file inserts new QUIZ_IDs; MODULE_PERCENTAGE may be updated in place
+        cache_key = (
+            df_questions["QUIZ_ID"].to_numpy(dtype=float).tobytes(),
+            df_questions["MODULE_PERCENTAGE"].to_numpy(dtype=float).tobytes(),
+            tuple(df_questions.columns)
+        )
+        with _quiz_bank_lock:
+            if cache_key in _quiz_bank_cache:
+                _quiz_bank_cache.move_to_end(cache_key)
+                return _quiz_bank_cache[cache_key]
+
+        columns = {col: QuizSamplerService.get_array(df_questions[col].tolist()) for col in df_questions.columns}
+
+        module_ids, module_codes, module_counts = np.unique(
+            df_questions["MODULE_ID"].to_numpy(), return_inverse=True, return_counts=True
+        )
+        module_percentages = (
+            pd.Series(df_questions["MODULE_PERCENTAGE"].to_numpy(dtype=float))
+            .fillna(0)
+            .groupby(module_codes)
+            .first()
+            .reindex(range(len(module_ids)), fill_value=0)
+            .to_numpy()
+        )
+
+        bank = {
+            "columns"            : columns,
+            "options"            : {},
+            "option_counts"      : {},
+            "module_codes"       : module_codes.ravel(),
+            "module_percentages" : module_percentages,
+            "module_counts"      : module_counts
+        }
+
+        with _quiz_bank_lock:
+            # Another session may have built the same bank meanwhile; keep the first one
+            bank = _quiz_bank_cache.setdefault(cache_key, bank)
+            _quiz_bank_cache.move_to_end(cache_key)
+            if len(_quiz_bank_cache) > QUIZ_BANK_CACHE_SIZE:
+                _quiz_bank_cache.popitem(last=False)
+        return bank
+
+    @staticmethod
+    def get_options(bank, lang):
+        """
+        Returns the parsed options of a language (parsed on first use and kept in the bank) and their counts.
+        """
+        if lang not in bank["options"]:
+            parsed = [json.loads(value) if isinstance(value, str) else value for value in bank["columns"][f"OPTIONS_{lang}"]]
+            bank["option_counts"][lang] = np.fromiter((len(value or []) for value in parsed), dtype=np.int64, count=len(parsed))
+            bank["options"][lang]       = QuizSamplerService.get_array(parsed)
+        return bank["options"][lang], bank["option_counts"][lang]
+
+    @staticmethod
+    def get_quotas(module_percentages, num_questions):
+        """
+        Questions per module: max(1, int(num_questions * percentage / 100)).
+        """
+        return np.maximum(1, np.floor(num_questions * module_percentages / 100).astype(np.int64))
+
+    @staticmethod
+    def sample(
+            df_questions,
+            num_questions,
+            languages,
+            seed=None
+        ):
+        """
+        Draws the questions of a quiz, distributed by module percentage.
+
+        Every module gets its quota (at least one question, or all of them if it
+        has fewer); if the quotas exceed num_questions a random subset is kept,
+        if they fall short the rest is drawn from the other questions. The
+        questions come in random order and the options of each one are
+        shuffled with the same order in every selected language.
+
+        Args:
+            df_questions (pd.DataFrame) : Questions of the file (QuizService.get_quiz_questions_cache).
+            num_questions (int)         : Questions of the quiz.
+            languages (list)            : Selected language codes (e.g. ["es", "en"]); the first one sets the option count.
+            seed (int, optional)        : Seed of the draw; the same seed and questions give the same quiz.
+
+        Returns:
+            list: One dict per question (the DataFrame columns), with OPTIONS_xx of the selected languages as shuffled lists.
+        """
+        bank = QuizSamplerService.get_bank(df_questions)
+        rng  = np.random.default_rng(seed)
+
+        # Stratified draw: rank the questions of each module by a random key and keep the first `quota`
+        codes  = bank["module_codes"]
+        quotas = QuizSamplerService.get_quotas(bank["module_percentages"], num_questions)
+        order  = np.lexsort((rng.random(len(codes)), codes))
+        starts = np.concatenate(([0], np.cumsum(bank["module_counts"])[:-1]))
+        ranks  = np.arange(len(order)) - starts[codes[order]]
+        chosen = order[ranks < quotas[codes[order]]]
+
+        # Adjust to the exact number of questions
+        if len(chosen) > num_questions:
+            chosen = rng.choice(chosen, num_questions, replace=False)
+        elif len(chosen) < num_questions:
+            available = np.setdiff1d(np.arange(len(codes)), chosen, assume_unique=True)
+            remaining = num_questions - len(chosen)
+            if len(available) >= remaining:
+                chosen = np.concatenate((chosen, rng.choice(available, remaining, replace=False)))
+        rng.shuffle(chosen)
+
+        # One option permutation per question: argsort of random keys, padding (missing options) last
+        langs   = [lang.upper() for lang in languages]
+        counts  = QuizSamplerService.get_options(bank, langs[0])[1][chosen]
+        keys    = rng.random((len(chosen), int(counts.max(initial=0))))
+        keys[np.arange(keys.shape[1]) >= counts[:, None]] = np.inf
+        permutations = np.argsort(keys, axis=1)
+
+        columns   = bank["columns"]
+        questions = [dict(zip(columns, values)) for values in zip(*(columns[col][chosen] for col in columns))]
+        for lang in langs:
+            options = QuizSamplerService.get_options(bank, lang)[0][chosen]
+            for question, options, permutation, count in zip(questions, options, permutations, counts):
+                question[f"OPTIONS_{lang}"] = [options[i] for i in permutation[:count]]
+        return questions
+
+
+if __name__ == "__main__":
+    # Benchmark: quiz start over a 5,000-question bank (iterrows/per-module sampling vs. vectorized draw)
+    import time
+    import random
+
+    def sample_iterrows(df_all_questions, df_modules, num_questions, selected_langs):
+        selected_questions = []
+        for _, module in df_modules.iterrows():
+            num_for_module = max(1, int(num_questions * module["MODULE_PERCENTAGE"] / 100))
+            module_questions = df_all_questions[df_all_questions["MODULE_ID"] == module["MODULE_ID"]]
+            if len(module_questions) >= num_for_module:
+                selected = module_questions.sample(n=num_for_module).to_dict("records")
+            else:
+                selected = module_questions.to_dict("records")
+            selected_questions.extend(selected)
+        if len(selected_questions) > num_questions:
+            selected_questions = random.sample(selected_questions, num_questions)
+        elif len(selected_questions) < num_questions:
+            all_ids = {q["QUIZ_ID"] for q in selected_questions}
+            available = df_all_questions[~df_all_questions["QUIZ_ID"].isin(all_ids)]
+            selected_questions.extend(available.sample(n=num_questions - len(selected_questions)).to_dict("records"))
+        random.shuffle(selected_questions)
+        for question in selected_questions:
+            all_lang_options = {lang.upper(): json.loads(question[f"OPTIONS_{lang.upper()}"]) for lang in selected_langs}
+            shuffle_indices = list(range(len(all_lang_options[selected_langs[0].upper()])))
+            random.shuffle(shuffle_indices)
+            for lang_upper, options in all_lang_options.items():
+                question[f"OPTIONS_{lang_upper}"] = [options[i] for i in shuffle_indices]
+        return selected_questions
+
+    rows, num_questions, langs = 5_000, 60, ["es", "en"]
+    rng         = np.random.default_rng(0)
+    percentages = {1: 12, 2: 18, 3: 25, 4: 15, 5: 20, 6: 10}
+    module_ids  = rng.choice(list(percentages), rows, p=[0.05, 0.15, 0.3, 0.2, 0.25, 0.05])
+    df = pd.DataFrame({
+        "QUIZ_ID"           : np.arange(1, rows + 1),
+        "QUESTION_ID"       : np.arange(1, rows + 1),
+        "MODULE_ID"         : module_ids,
+        "MODULE_NAME"       : [f"Module {m}" for m in module_ids],
+        "MODULE_PERCENTAGE" : [percentages[m] for m in module_ids],
+        **{f"QUESTION_{lang}" : [f"Question {i} ({lang})" for i in range(rows)] for lang in ("EN", "ES", "PT")},
+        **{
+            f"OPTIONS_{lang}" : [
+                json.dumps([{"text": f"Option {o} ({lang})", "isCorrect": o == 0} for o in range(4)])
+                for _ in range(rows)
+            ]
+            for lang in ("EN", "ES", "PT")
+        },
+        **{f"EXPLANATION_{lang}" : [f"Explanation {i} ({lang})" for i in range(rows)] for lang in ("EN", "ES", "PT")}
+    })
+    df_modules = (
+        df.groupby(["MODULE_ID", "MODULE_NAME", "MODULE_PERCENTAGE"]).size()
+        .reset_index(name="QUESTION_COUNT").sort_values("MODULE_ID")
+    )
+
+    def measure(function, repeat):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            result = function()
+        return result, (time.perf_counter() - started) * 1000 / repeat
+
+    _, iterrows_ms = measure(lambda: sample_iterrows(df, df_modules, num_questions, langs), 20)
+    _quiz_bank_cache.clear()
+    _, first_ms    = measure(lambda: QuizSamplerService.sample(df, num_questions, langs), 1)
+    _, cached_ms   = measure(lambda: QuizSamplerService.sample(df.copy(), num_questions, langs), 200)
+
+    # Same seed => same quiz (questions, order and options)
+    assert QuizSamplerService.sample(df, num_questions, langs, seed=7) == QuizSamplerService.sample(df, num_questions, langs, seed=7)
+
+    # Same distribution guarantees: exact size, no duplicates, module quotas, options aligned across languages
+    draws  = 2_000
+    quotas = {m: max(1, int(num_questions * p / 100)) for m, p in percentages.items()}
+    totals = dict.fromkeys(percentages, 0)
+    for seed in range(draws):
+        quiz = QuizSamplerService.sample(df, num_questions, langs, seed=seed)
+        assert len(quiz) == num_questions and len({q["QUIZ_ID"] for q in quiz}) == num_questions
+        for question in quiz:
+            totals[question["MODULE_ID"]] += 1
+            assert [o["text"][:8] for o in question["OPTIONS_ES"]] == [o["text"][:8] for o in question["OPTIONS_EN"]]
+    # The quotas fill 59 of 60 questions; the last one is drawn from the rest of the bank
+    counts   = {m: int((module_ids == m).sum()) for m in percentages}
+    rest     = num_questions - sum(quotas.values())
+    expected = {m: quotas[m] + rest * (counts[m] - quotas[m]) / (rows - sum(quotas.values())) for m in quotas}
+    assert all(abs(totals[m] / draws - expected[m]) < 0.1 for m in quotas), (totals, expected)
+
+    print(f"{rows} questions, {num_questions} per quiz, {len(percentages)} modules")
+    print(f"  iterrows + json per question : {iterrows_ms:7.2f} ms")
+    print(f"  vectorized (bank build)      : {first_ms:7.2f} ms")
+    print(f"  vectorized (cached bank)     : {cached_ms:7.2f} ms ({iterrows_ms / cached_ms:.0f}x)")
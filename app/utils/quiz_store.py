@@ -0,0 +1,115 @@
+import json
+import pandas as pd
+
+QUIZ_LANGUAGES        = ("EN", "ES", "PT")
+QUIZ_LANGUAGE_COLUMNS = ("QUESTION", "OPTIONS", "EXPLANATION")
+
+class QuizStoreService:
+    """
+    Columnar question store of a quiz file.
+
+    The questions of a file are decoded once per process (QuizService.get_quiz_store):
+    options as parsed lists, ids downcast, module columns as categories. Sessions
+    do not copy it; they get a projection with the columns of their languages,
+    which shares the text and options of the store.
+    """
+
+    @staticmethod
+    def get_store(df_questions):
+        """
+        Builds the store of a questions DataFrame (the columns of QuizService.get_quiz_questions).
+
+        Args:
+            df_questions (pd.DataFrame) : Questions of a file, with QUESTION_xx, OPTIONS_xx (JSON) and EXPLANATION_xx.
+
+        Returns:
+            pd.DataFrame: The same columns, compact; OPTIONS_xx hold lists of option dicts. Read-only.
+        """
+        store = pd.DataFrame(index=pd.RangeIndex(len(df_questions)))
+        for col in df_questions.columns:
+            values = df_questions[col].reset_index(drop=True)
+            if col in ("QUIZ_ID", "QUESTION_ID", "QUIZ_STATE"):
+                values = pd.to_numeric(values, downcast="integer")
+            elif col in ("MODULE_ID", "MODULE_NAME"):
+                values = values.astype("category")
+            elif col.startswith("OPTIONS_"):
+                values = pd.Series(
+                    [json.loads(value) if isinstance(value, str) else value for value in values],
+                    dtype=object
+                )
+            store[col] = values
+        return store
+
+    @staticmethod
+    def get_projection(store, languages):
+        """
+        Returns the columns of the store for some languages (no text is copied).
+
+        Args:
+            store (pd.DataFrame) : A store (get_store).
+            languages (list)     : Language codes (e.g. ["es", "en"]); an empty list keeps only the common columns.
+
+        Returns:
+            pd.DataFrame: The common columns plus QUESTION_xx, OPTIONS_xx and EXPLANATION_xx of the languages.
+        """
+        excluded = {lang for lang in QUIZ_LANGUAGES} - {lang.upper() for lang in languages}
+        columns  = [
+            col for col in store.columns
+            if not (col.split("_", 1)[0] in QUIZ_LANGUAGE_COLUMNS and col.rsplit("_", 1)[-1] in excluded)
+        ]
+        return store[columns]
+
+
+if __name__ == "__main__":
+    # Benchmark: per-session cost of the questions of a 5,000-question file.
+    # Before: every st.cache_data hit unpickles a full copy (all languages, JSON options).
+    # After: one shared store per process and a projection per session.
+    import time
+    import pickle
+    import numpy as np
+
+    rows  = 5_000
+    rng   = np.random.default_rng(0)
+    langs = ["es", "en"]
+    df = pd.DataFrame({
+        "QUIZ_ID"           : np.arange(1, rows + 1, dtype=np.int64),
+        "QUESTION_ID"       : np.arange(1, rows + 1, dtype=np.int64),
+        "MODULE_ID"         : rng.integers(1, 7, rows),
+        "MODULE_NAME"       : [f"Module {m}: Oracle Database Fundamentals" for m in rng.integers(1, 7, rows)],
+        "MODULE_PERCENTAGE" : rng.choice([10.0, 15.0, 20.0, 25.0], rows),
+        **{f"QUESTION_{lang}" : [f"Question {i} ({lang}): " + "x" * 160 for i in range(rows)] for lang in QUIZ_LANGUAGES},
+        **{
+            f"OPTIONS_{lang}" : [
+                json.dumps([{"text": f"Option {o} ({lang}) " + "y" * 60, "isCorrect": o == 0} for o in range(4)])
+                for _ in range(rows)
+            ]
+            for lang in QUIZ_LANGUAGES
+        },
+        **{f"EXPLANATION_{lang}" : [f"Explanation {i} ({lang}): " + "z" * 300 for i in range(rows)] for lang in QUIZ_LANGUAGES},
+        "QUIZ_STATE"        : np.ones(rows, dtype=np.int64),
+        "QUIZ_DATE"         : pd.Timestamp("2026-01-01")
+    })
+
+    def measure(function, repeat):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            result = function()
+        return result, (time.perf_counter() - started) * 1000 / repeat
+
+    def megabytes(frame, deep):
+        return frame.memory_usage(index=False, deep=deep).sum() / 2**20
+
+    pickled          = pickle.dumps(df)
+    copy, copy_ms    = measure(lambda: pickle.loads(pickled), 20)
+    store, store_ms  = measure(lambda: QuizStoreService.get_store(df), 1)
+    projection, projection_ms = measure(lambda: QuizStoreService.get_projection(store, langs), 200)
+
+    # The projection shares the store's objects (no text or options copied)
+    assert projection["OPTIONS_ES"].iloc[0] is store["OPTIONS_ES"].iloc[0]
+    assert projection["QUESTION_EN"].iloc[0] is store["QUESTION_EN"].iloc[0]
+    assert [c for c in projection.columns if c.endswith("_PT")] == []
+
+    print(f"{rows} questions, {len(df.columns)} columns, languages {langs}")
+    print(f"  cache_data copy per session : {copy_ms:7.2f} ms, {megabytes(copy, True):6.1f} MB")
+    print(f"  store build (once per file) : {store_ms:7.2f} ms, {megabytes(store, False):6.1f} MB arrays (text and options shared)")
+    print(f"  projection per session      : {projection_ms:7.2f} ms, {megabytes(projection, False):6.1f} MB")
@@ -113,6 +113,9 @@
                 || '  ))';
 
             EXECUTE IMMEDIATE l_insert_stmt;
+
+            /* Invalidate the cached Select AI responses of the profiles that include the table */
+            SP_SEL_AI_CACHE_INVALIDATE_TABLE(p_table_name);
             COMMIT;
         EXCEPTION
             WHEN OTHERS THEN
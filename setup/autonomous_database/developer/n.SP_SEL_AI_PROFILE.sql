@@ -66,6 +66,9 @@
                 "tool_params": {"profile_name": "' || p_profile_name || '"}}'
         );
 
+        /* 7) Invalidate cached Select AI responses (the object list may have changed) */
+        SP_SEL_AI_CACHE_INVALIDATE('SELECT_AI', p_profile_name);
+
     END;
     /
     --
\ No newline at end of file
@@ -55,6 +55,9 @@
                 "tool_params": {"profile_name": "' || p_profile_name || '"}}'
         );
 
+        /* 7) Invalidate cached Select AI RAG responses (the vector index was rebuilt) */
+        SP_SEL_AI_CACHE_INVALIDATE('SELECT_AI_RAG', p_profile_name);
+
     END;
     /
     --
\ No newline at end of file
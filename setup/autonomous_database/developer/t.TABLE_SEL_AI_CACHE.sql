@@ -0,0 +1,78 @@
+    CREATE TABLE sel_ai_cache_version (
+        cache_scope              VARCHAR2(30) NOT NULL,
+        profile_name             VARCHAR2(500) NOT NULL,
+        cache_version            NUMBER DEFAULT 1 NOT NULL,
+        cache_version_date       TIMESTAMP(6) DEFAULT SYSDATE NOT NULL,
+        CONSTRAINT pk_sel_ai_cache_version PRIMARY KEY (cache_scope, profile_name)
+        ENABLE
+    );
+    --
+
+    CREATE TABLE sel_ai_cache (
+        cache_key                VARCHAR2(64) NOT NULL,
+        cache_scope              VARCHAR2(30) NOT NULL,
+        cache_version            NUMBER NOT NULL,
+        profile_name             VARCHAR2(500) NOT NULL,
+        action                   VARCHAR2(30) NOT NULL,
+        response                 CLOB NULL,
+        cache_hits               NUMBER DEFAULT 0 NOT NULL,
+        cache_expires            TIMESTAMP(6) NOT NULL,
+        cache_date               TIMESTAMP(6) DEFAULT SYSDATE NOT NULL,
+        CONSTRAINT pk_sel_ai_cache_key PRIMARY KEY (cache_key)
+        ENABLE
+    );
+    --
+
+    CREATE INDEX idx_sel_ai_cache_expires ON sel_ai_cache (cache_expires);
+    --
+
+    CREATE OR REPLACE PROCEDURE SP_SEL_AI_CACHE_INVALIDATE (
+        p_cache_scope  IN VARCHAR2,   /* SELECT_AI or SELECT_AI_RAG */
+        p_profile_name IN VARCHAR2    /* Profile whose cached responses are invalidated */
+    )
+    AS
+    BEGIN
+        /* A profile without a row is at version 1: its first bump goes to 2 */
+        MERGE INTO sel_ai_cache_version v
+        USING (SELECT p_cache_scope AS cache_scope, UPPER(p_profile_name) AS profile_name FROM DUAL) s
+           ON (v.cache_scope = s.cache_scope AND v.profile_name = s.profile_name)
+        WHEN MATCHED THEN UPDATE SET
+            v.cache_version      = v.cache_version + 1,
+            v.cache_version_date = SYSDATE
+        WHEN NOT MATCHED THEN INSERT
+            (cache_scope, profile_name, cache_version)
+        VALUES
+            (s.cache_scope, s.profile_name, 2);
+    END;
+    /
+    --
+
+    CREATE OR REPLACE PROCEDURE SP_SEL_AI_CACHE_INVALIDATE_TABLE (
+        p_table_name IN VARCHAR2   /* Table name with schema (e.g., SEL_AI_USER_ID_1.EMPLOYEES) */
+    )
+    AS
+        l_credential VARCHAR2(4000) := 'c_r_e_d_e_n_t_i_a_l__n_a_m_e';
+    BEGIN
+        /* Only the Select AI profiles whose object list has the table: the users linked to its file */
+        FOR u IN (
+            SELECT DISTINCT fu.user_id
+            FROM files f
+            JOIN file_user fu ON fu.file_id = f.file_id
+            WHERE f.module_id = 1
+              AND UPPER(f.file_trg_obj_name) = UPPER(p_table_name)
+        ) LOOP
+            SP_SEL_AI_CACHE_INVALIDATE('SELECT_AI', l_credential || '_SQL_' || u.user_id);
+        END LOOP;
+    END;
+    /
+    --
+
+    /* Procedures created before this table reference it: recompile them */
+    ALTER PROCEDURE SP_SEL_AI_TBL_CSV COMPILE;
+    --
+
+    ALTER PROCEDURE SP_SEL_AI_PROFILE COMPILE;
+    --
+
+    ALTER PROCEDURE SP_SEL_AI_RAG_PROFILE COMPILE;
+    --
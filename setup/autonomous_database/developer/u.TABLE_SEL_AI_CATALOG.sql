@@ -0,0 +1,67 @@
+    CREATE TABLE sel_ai_catalog (
+        owner                    VARCHAR2(128) NOT NULL,
+        table_name               VARCHAR2(128) NOT NULL,
+        column_id                NUMBER NOT NULL,
+        column_name              VARCHAR2(128) NOT NULL,
+        data_type                VARCHAR2(128) NULL,
+        comments                 VARCHAR2(4000) NULL,
+        ui_display               VARCHAR2(4000) NULL,
+        classification           VARCHAR2(4000) NULL,
+        last_ddl_time            DATE NULL,
+        catalog_date             TIMESTAMP(6) DEFAULT SYSDATE NOT NULL,
+        CONSTRAINT pk_sel_ai_catalog PRIMARY KEY (owner, table_name, column_id)
+        ENABLE
+    );
+    --
+
+    CREATE OR REPLACE PROCEDURE SP_SEL_AI_CATALOG (
+        p_table_name IN VARCHAR2   /* Table name with schema (e.g., ORA26AI.EMPLOYEES) */
+    )
+    AS
+        l_owner VARCHAR2(128) := UPPER(SUBSTR(p_table_name, 1, INSTR(p_table_name, '.') - 1));
+        l_table VARCHAR2(128) := UPPER(SUBSTR(p_table_name, INSTR(p_table_name, '.') + 1));
+    BEGIN
+        /* Snapshot of one table: columns, comments and annotations (dictionary views filtered by owner and table) */
+        DELETE FROM sel_ai_catalog
+         WHERE owner = l_owner
+           AND table_name = l_table;
+
+        INSERT INTO sel_ai_catalog
+            (owner, table_name, column_id, column_name, data_type, comments, ui_display, classification, last_ddl_time)
+        SELECT
+            c.owner,
+            c.table_name,
+            c.column_id,
+            c.column_name,
+            c.data_type,
+            cc.comments,
+            ap.ui_display,
+            ap.classification,
+            o.last_ddl_time
+        FROM all_tab_columns c
+        JOIN all_objects o
+            ON o.owner = c.owner
+            AND o.object_name = c.table_name
+            AND o.object_type = 'TABLE'
+        LEFT JOIN all_col_comments cc
+            ON cc.owner = c.owner
+            AND cc.table_name = c.table_name
+            AND cc.column_name = c.column_name
+        LEFT JOIN (
+            SELECT
+                column_name,
+                MAX(CASE WHEN annotation_name = 'UI_DISPLAY' THEN annotation_value END)     AS ui_display,
+                MAX(CASE WHEN annotation_name = 'CLASSIFICATION' THEN annotation_value END) AS classification
+            FROM all_annotations_usage
+            WHERE annotation_owner = l_owner
+              AND object_name = l_table
+              AND object_type = 'TABLE'
+              AND column_name IS NOT NULL
+            GROUP BY column_name
+        ) ap
+            ON ap.column_name = c.column_name
+        WHERE c.owner = l_owner
+          AND c.table_name = l_table;
+    END;
+    /
+    --
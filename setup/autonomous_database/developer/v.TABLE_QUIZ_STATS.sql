@@ -0,0 +1,116 @@
+    CREATE TABLE quiz_stats (
+        user_id                  NUMBER NOT NULL,
+        evaluation_name          VARCHAR2(500) NOT NULL,
+        file_id                  NUMBER NOT NULL,
+        module_id                NUMBER NOT NULL,
+        module_name              VARCHAR2(250) NOT NULL,
+        answer_day               DATE NOT NULL,
+        total_answers            NUMBER DEFAULT 0 NOT NULL,
+        correct_answers          NUMBER DEFAULT 0 NOT NULL,
+        total_time_seconds       NUMBER DEFAULT 0 NOT NULL,
+        first_answer_date        TIMESTAMP(6) NOT NULL,
+        last_answer_date         TIMESTAMP(6) NOT NULL,
+        quiz_stats_date          TIMESTAMP(6) DEFAULT SYSDATE NOT NULL,
+        CONSTRAINT pk_quiz_stats PRIMARY KEY (user_id, evaluation_name, module_id, answer_day)
+        ENABLE
+    );
+    --
+
+    CREATE INDEX idx_quiz_stats_day ON quiz_stats (answer_day, file_id);
+    --
+
+    CREATE OR REPLACE PROCEDURE SP_QUIZ_STATS_REFRESH (
+        p_user_id         IN NUMBER,    /* Owner of the evaluation */
+        p_evaluation_name IN VARCHAR2   /* Evaluation whose summary rows are recomputed */
+    )
+    AS
+    BEGIN
+        /* Recompute the summary of one evaluation (per module and day) from its answers */
+        DELETE FROM quiz_stats
+         WHERE user_id = p_user_id
+           AND evaluation_name = p_evaluation_name;
+
+        INSERT INTO quiz_stats
+            (user_id, evaluation_name, file_id, module_id, module_name, answer_day,
+             total_answers, correct_answers, total_time_seconds, first_answer_date, last_answer_date)
+        SELECT
+            qa.user_id,
+            qa.evaluation_name,
+            q.file_id,
+            q.module_id,
+            MAX(q.module_name),
+            TRUNC(qa.quiz_answer_date),
+            COUNT(*),
+            SUM(qa.is_correct),
+            SUM(NVL(qa.answer_time_seconds, 0)),
+            MIN(qa.quiz_answer_date),
+            MAX(qa.quiz_answer_date)
+        FROM quiz_answers qa
+        JOIN quiz q ON qa.quiz_id = q.quiz_id
+        WHERE qa.user_id = p_user_id
+          AND qa.evaluation_name = p_evaluation_name
+          AND qa.quiz_answer_state <> 0
+        GROUP BY qa.user_id, qa.evaluation_name, q.file_id, q.module_id, TRUNC(qa.quiz_answer_date);
+    END;
+    /
+    --
+
+    CREATE OR REPLACE PROCEDURE SP_QUIZ_STATS_RECONCILE (
+        p_refreshed OUT NUMBER   /* Evaluations whose summary did not match their answers */
+    )
+    AS
+    BEGIN
+        p_refreshed := 0;
+
+        /* Evaluations whose answer and correct counts differ between QUIZ_ANSWERS and QUIZ_STATS */
+        FOR e IN (
+            SELECT NVL(a.user_id, s.user_id) AS user_id, NVL(a.evaluation_name, s.evaluation_name) AS evaluation_name
+            FROM (
+                SELECT user_id, evaluation_name, COUNT(*) AS total_answers, SUM(is_correct) AS correct_answers
+                FROM quiz_answers
+                WHERE quiz_answer_state <> 0
+                GROUP BY user_id, evaluation_name
+            ) a
+            FULL OUTER JOIN (
+                SELECT user_id, evaluation_name, SUM(total_answers) AS total_answers, SUM(correct_answers) AS correct_answers
+                FROM quiz_stats
+                GROUP BY user_id, evaluation_name
+            ) s
+                ON s.user_id = a.user_id
+                AND s.evaluation_name = a.evaluation_name
+            WHERE a.user_id IS NULL
+               OR s.user_id IS NULL
+               OR a.total_answers <> s.total_answers
+               OR a.correct_answers <> s.correct_answers
+        ) LOOP
+            SP_QUIZ_STATS_REFRESH(e.user_id, e.evaluation_name);
+            p_refreshed := p_refreshed + 1;
+        END LOOP;
+    END;
+    /
+    --
+
+    DECLARE
+        l_refreshed NUMBER;
+    BEGIN
+        /* Summary of the answers stored before this table existed */
+        SP_QUIZ_STATS_RECONCILE(l_refreshed);
+        COMMIT;
+    END;
+    /
+    --
+
+    BEGIN
+        /* Reconcile the summary once an hour (the report only reads QUIZ_STATS) */
+        DBMS_SCHEDULER.CREATE_JOB(
+            job_name        => 'JOB_QUIZ_STATS_RECONCILE',
+            job_type        => 'PLSQL_BLOCK',
+            job_action      => 'DECLARE l_refreshed NUMBER; BEGIN SP_QUIZ_STATS_RECONCILE(l_refreshed); COMMIT; END;',
+            start_date      => SYSTIMESTAMP,
+            repeat_interval => 'FREQ=HOURLY',
+            enabled         => TRUE,
+            comments        => 'Recomputes the QUIZ_STATS rows that do not match QUIZ_ANSWERS'
+        );
+    END;
+    /
+    --
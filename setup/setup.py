@@ -293,6 +293,15 @@ def main():
 
     exec('developer', 's.SP_VECTOR_STORE.sql',
         '[OK][S] CREATE PROCEDURE VECTOS STORRE.......................[ CREATE_VIEW ]')
+
+    exec('developer', 't.TABLE_SEL_AI_CACHE.sql',
+        '[OK][T] CREATE TABLE SEL_AI_CACHE...........................[ CREATE_TABLE ]')
+
+    exec('developer', 'u.TABLE_SEL_AI_CATALOG.sql',
+        '[OK][U] CREATE TABLE SEL_AI_CATALOG.........................[ CREATE_TABLE ]')
+
+    exec('developer', 'v.TABLE_QUIZ_STATS.sql',
+        '[OK][V] CREATE TABLE QUIZ_STATS.............................[ CREATE_TABLE ]')
     
 
     # Copiar .streamlit (Windows: C:\Users\<usuario>\.streamlit, mac: /Users/<usuario>/.streamlit)